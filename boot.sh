@@ -112,4 +112,8 @@ fi
 
 # Start the application
 echo "Starting Gunicorn server..."
-exec gunicorn -b :5000 --access-logfile - --error-logfile - src.gene_annotator_flask_shell_ctx:app
\ No newline at end of file
+# Threaded workers: requests waiting on the translator or Elasticsearch
+# release the GIL, so each worker keeps serving others meanwhile
+exec gunicorn -b :5000 --worker-class gthread \
+    --workers "${GUNICORN_WORKERS:-2}" --threads "${GUNICORN_THREADS:-16}" \
+    --access-logfile - --error-logfile - src.gene_annotator_flask_shell_ctx:app
\ No newline at end of file
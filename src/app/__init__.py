@@ -1,6 +1,8 @@
 import os
 import logging
-import rq
+import threading
+import requests
+from requests.adapters import HTTPAdapter
 from logging.handlers import SMTPHandler
 from flask import Flask, request, current_app
 from flask_sqlalchemy import SQLAlchemy
@@ -12,6 +14,7 @@ from flask_babel import Babel
 from redis import Redis
 from elasticsearch import Elasticsearch
 from src.config import Config
+from src.app.etl_watcher import EtlOutputWatcher
 
 from src.app.cli import init_frontend_logger
 
@@ -53,14 +56,50 @@ def create_app(config_class=Config):
 
     app.register_blueprint(cli_bp)
 
+    # Clients for external services share pooled connections between the
+    # worker's threads and time out instead of holding a thread indefinitely
     app.elasticsearch = (
-        Elasticsearch([app.config["ELASTICSEARCH_URL"]])
+        Elasticsearch(
+            [app.config["ELASTICSEARCH_URL"]],
+            request_timeout=app.config["ELASTICSEARCH_TIMEOUT"],
+            connections_per_node=app.config["HTTP_POOL_SIZE"],
+        )
         if app.config["ELASTICSEARCH_URL"]
         else None
     )
+    app.http = requests.Session()
+    app.http.mount("https://", HTTPAdapter(pool_maxsize=app.config["HTTP_POOL_SIZE"]))
 
     app.redis = Redis.from_url(app.config["REDIS_URL"])
-    app.task_queue = rq.Queue("gene-annotator-tasks", connection=app.redis)
+    from src.app.task_queues import create_task_queues
+
+    app.task_queues = create_task_queues(app.config, app.redis)
+    # The highest priority queue, for short jobs
+    app.task_queue = next(iter(app.task_queues.values()))
+    app.etl_watcher = EtlOutputWatcher(
+        app.config["ETL_OUTPUT_DIR"], app.config["ETL_WATCH_INTERVAL"]
+    )
+    from src.app.notifications import notification_stream_limit
+
+    # Each open notification stream holds a worker thread
+    app.notification_streams = threading.BoundedSemaphore(
+        notification_stream_limit(app.config)
+    )
+    from src.app.last_seen import LastSeenBuffer
+
+    app.last_seen_buffer = LastSeenBuffer(
+        app.config["LAST_SEEN_FLUSH_INTERVAL"], app.config["LAST_SEEN_RESOLUTION"]
+    )
+
+    from src.app.compression import compress_response
+
+    app.after_request(compress_response)
+
+    from src.app.token_cache import TokenCache
+
+    app.token_cache = TokenCache(
+        app.config["TOKEN_CACHE_SIZE"], app.config["TOKEN_CACHE_TTL"]
+    )
 
     from src.app.api import bp as api_bp
 
@@ -87,3 +126,4 @@ def create_app(config_class=Config):
 
 
 from src.app.models import researcher, gene, pipeline_run_service, pipeline_run
+from src.app import cache, timeline
@@ -2,4 +2,4 @@ from flask import Blueprint
 
 bp = Blueprint("api", __name__)
 
-from src.app.api import researchers, errors, tokens
+from src.app.api import researchers, errors, tokens, pipeline_runs, genes
@@ -0,0 +1,125 @@
+import json
+from collections import defaultdict
+from src.app.api import bp
+from src.app.api.errors import bad_request
+from src.app.api.auth import token_auth
+from src.app.models.gene import Gene, GeneAnnotation
+from src.app import db
+import sqlalchemy as sa
+from flask import request, current_app, stream_with_context, Response
+
+
+def _chunks(values, size):
+    for i in range(0, len(values), size):
+        yield values[i : i + size]
+
+
+def _clean_ids(values):
+    """Deduplicate a list of requested ids, keeping the caller's order"""
+    if not isinstance(values, list):
+        return None
+    ids = (str(v).strip() for v in values if v is not None)
+    return list(dict.fromkeys(i for i in ids if i))
+
+
+def _resolve_hgnc_ids(hgnc_ids, chunk_size):
+    """
+    Map HGNC ids to the gene_stable_ids carrying them in either table.
+    Returns:
+        dict: hgnc_id -> list of gene_stable_ids
+    """
+    resolved = defaultdict(list)
+    for chunk in _chunks(hgnc_ids, chunk_size):
+        query = sa.union(
+            sa.select(Gene.hgnc_id, Gene.gene_stable_id).where(Gene.hgnc_id.in_(chunk)),
+            sa.select(GeneAnnotation.hgnc_id, GeneAnnotation.gene_stable_id).where(
+                GeneAnnotation.hgnc_id.in_(chunk)
+            ),
+        )
+        for hgnc_id, gene_stable_id in db.session.execute(query):
+            if gene_stable_id not in resolved[hgnc_id]:
+                resolved[hgnc_id].append(gene_stable_id)
+    return resolved
+
+
+def _merged_records(stable_ids, chunk_size):
+    """
+    Yield one record per gene_stable_id found in either table: the gene rows
+    and annotation rows sharing that id. Each chunk costs two IN queries.
+    """
+    for chunk in _chunks(stable_ids, chunk_size):
+        genes = defaultdict(list)
+        for gene in db.session.scalars(
+            sa.select(Gene).where(Gene.gene_stable_id.in_(chunk)).order_by(Gene.id)
+        ):
+            genes[gene.gene_stable_id].append(gene.to_dict())
+        annotations = defaultdict(list)
+        for annotation in db.session.scalars(
+            sa.select(GeneAnnotation)
+            .where(GeneAnnotation.gene_stable_id.in_(chunk))
+            .order_by(GeneAnnotation.id)
+        ):
+            annotations[annotation.gene_stable_id].append(annotation.to_dict())
+        for stable_id in chunk:
+            if stable_id in genes or stable_id in annotations:
+                yield {
+                    "gene_stable_id": stable_id,
+                    "genes": genes.get(stable_id, []),
+                    "annotations": annotations.get(stable_id, []),
+                }
+
+
+@bp.route("/genes/lookup", methods=["POST"])
+@token_auth.login_required
+def lookup_genes():
+    """
+    Resolve a batch of gene identifiers against Gene and GeneAnnotation.
+    Expected JSON payload:
+        - gene_stable_ids (list, optional): Ensembl gene stable ids
+        - hgnc_ids (list, optional): HGNC ids, resolved to the gene_stable_ids
+          carrying them in either table
+    Returns:
+        Response: A streamed JSON document containing:
+            - items: One merged record per matched gene_stable_id, with its
+              gene rows under "genes" and annotation rows under "annotations"
+            - hgnc_ids: hgnc_id -> list of the gene_stable_ids it resolved to
+            - not_found: Requested ids that matched nothing
+    Raises:
+        BadRequest: If the body is not a JSON object, neither list is given,
+                    either is not a list, or more than GENE_LOOKUP_MAX_IDS
+                    ids are requested
+    Example:
+        POST /genes/lookup {"gene_stable_ids": ["ENSG00000139618"], "hgnc_ids": ["HGNC:1101"]}
+    """
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return bad_request("the request body must be a JSON object")
+    stable_ids = _clean_ids(data.get("gene_stable_ids", []))
+    hgnc_ids = _clean_ids(data.get("hgnc_ids", []))
+    if stable_ids is None or hgnc_ids is None:
+        return bad_request("gene_stable_ids and hgnc_ids must be lists")
+    if not stable_ids and not hgnc_ids:
+        return bad_request("must include gene_stable_ids or hgnc_ids")
+    max_ids = current_app.config["GENE_LOOKUP_MAX_IDS"]
+    if len(stable_ids) + len(hgnc_ids) > max_ids:
+        return bad_request(f"at most {max_ids} ids may be looked up per request")
+    chunk_size = current_app.config["GENE_LOOKUP_CHUNK_SIZE"]
+
+    resolved = _resolve_hgnc_ids(hgnc_ids, chunk_size)
+    lookup_ids = list(stable_ids)
+    for hgnc_id in hgnc_ids:
+        lookup_ids.extend(resolved.get(hgnc_id, []))
+    lookup_ids = list(dict.fromkeys(lookup_ids))
+
+    def generate():
+        found = set()
+        yield '{"items": ['
+        for i, record in enumerate(_merged_records(lookup_ids, chunk_size)):
+            found.add(record["gene_stable_id"])
+            yield ("," if i else "") + json.dumps(record)
+        not_found = [s for s in stable_ids if s not in found]
+        not_found += [h for h in hgnc_ids if h not in resolved]
+        yield '], "hgnc_ids": ' + json.dumps(dict(resolved))
+        yield ', "not_found": ' + json.dumps(not_found) + "}"
+
+    return Response(stream_with_context(generate()), mimetype="application/json")
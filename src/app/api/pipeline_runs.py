@@ -0,0 +1,85 @@
+from src.app.api import bp
+from src.app.api.auth import token_auth
+from src.app.conditional import conditional_get, data_validators
+from src.app.api.errors import bad_request
+from src.app.models.pipeline_run import PipelineRun
+from src.app.models.pipeline_run_service import (
+    stream_pipeline_results,
+    compare_pipeline_runs,
+    EXPORT_FORMATS,
+)
+from src.app import db
+from flask import abort, request, current_app, Response, stream_with_context
+
+
+@bp.route("/pipeline_runs/<int:id>/summary", methods=["GET"])
+@token_auth.login_required
+def get_pipeline_run_summary(id):
+    """
+    Retrieve the precomputed summary of a pipeline run.
+    Args:
+        id: The unique identifier of the pipeline run.
+    Returns:
+        dict: Result count, HGNC id coverage, distinct pid_suffix count,
+              TIGRFAM exclusions and per gene_type counts for the run.
+    Raises:
+        404: If the run does not exist or has no summary yet.
+    """
+    run = db.get_or_404(PipelineRun, id)
+    if run.summary is None:
+        abort(404)
+    return run.summary.to_dict()
+
+
+@bp.route("/pipeline_runs/<int:id>/results", methods=["GET"])
+@token_auth.login_required
+@conditional_get(lambda id: data_validators(f"pipeline_result:{id}", "pipeline_run"))
+def export_pipeline_run_results(id):
+    """
+    Stream all results of a pipeline run.
+    Args:
+        id: The unique identifier of the pipeline run.
+    Query Parameters:
+        format (str, optional): "csv" (default) or "ndjson".
+    Returns:
+        Response: The run's results ordered by gene_stable_id, streamed in
+                  EXPORT_BATCH_SIZE row batches.
+    Raises:
+        400: If the format is not supported.
+        404: If the run does not exist.
+    """
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return bad_request(f"format must be one of {', '.join(EXPORT_FORMATS)}")
+    run = db.get_or_404(PipelineRun, id)
+    return Response(
+        stream_with_context(
+            stream_pipeline_results(
+                run.id, fmt, current_app.config["EXPORT_BATCH_SIZE"]
+            )
+        ),
+        mimetype=EXPORT_FORMATS[fmt],
+    )
+
+
+@bp.route("/pipeline_runs/<int:id>/diff/<int:other_id>", methods=["GET"])
+@token_auth.login_required
+def diff_pipeline_runs(id, other_id):
+    """
+    Compare two pipeline runs gene by gene.
+    Args:
+        id: The run being compared from.
+        other_id: The run being compared to.
+    Query Parameters:
+        limit (int, optional): gene_stable_ids listed per category. Defaults
+                               to 100, max 10000.
+    Returns:
+        dict: For each of "added", "removed" and "changed", the number of
+              genes in that category and the first limit gene_stable_ids.
+    Raises:
+        404: If either run does not exist.
+    """
+    db.get_or_404(PipelineRun, id)
+    db.get_or_404(PipelineRun, other_id)
+    limit = min(request.args.get("limit", 100, type=int), 10000)
+    return compare_pipeline_runs(id, other_id, limit=limit)
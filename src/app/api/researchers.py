@@ -1,6 +1,7 @@
 from src.app.api import bp
 from src.app.api.errors import bad_request
 from src.app.api.auth import token_auth
+from src.app.conditional import conditional_get, data_validators
 from src.app.models.researcher import Researcher
 from src.app import db
 import sqlalchemy as sa
@@ -9,6 +10,7 @@ from flask import request, url_for, abort
 
 @bp.route("/researcher/<int:id>", methods=["GET"])
 @token_auth.login_required
+@conditional_get(lambda id: data_validators("researcher"))
 def get_researcher(id):
     """
     Retrieve a researcher by ID.
@@ -25,6 +27,7 @@ def get_researcher(id):
 
 @bp.route("/researchers", methods=["GET"])
 @token_auth.login_required
+@conditional_get(lambda: data_validators("researcher"))
 def get_researchers():
     """
     Retrieve a paginated collection of researchers.
@@ -34,6 +37,12 @@ def get_researchers():
         page (int, optional): Page number to retrieve. Defaults to 1.
         per_page (int, optional): Number of researchers per page. Defaults to 10.
                                  Maximum allowed is 100.
+        cursor (str, optional): Keyset cursor from a previous response. When
+                                present (an empty value requests the first page)
+                                the collection is keyset paginated and page is ignored.
+        fields (str, optional): Comma separated fields to return for each
+                                researcher, e.g. "id,researcher_name"; only
+                                their columns are queried.
     Returns:
         dict: A dictionary containing the paginated collection of researchers,
               including metadata such as total count, current page, and pagination links.
@@ -42,13 +51,24 @@ def get_researchers():
     """
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 10, type=int), 100)
+    cursor = request.args.get("cursor")
+    try:
+        fields = Researcher.parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return bad_request(str(e))
     return Researcher.to_collection_dict(
-        sa.select(Researcher), page, per_page, "src.api.get_researchers"
+        sa.select(Researcher),
+        page,
+        per_page,
+        "api.get_researchers",
+        cursor=cursor,
+        fields=fields,
     )
 
 
 @bp.route("/researchers/<int:id>/followers", methods=["GET"])
 @token_auth.login_required
+@conditional_get(lambda id: data_validators("researcher"))
 def get_followers(id):
     """
     Retrieve a paginated collection of followers for a specific researcher.
@@ -61,6 +81,8 @@ def get_followers(id):
     Query Parameters:
         page (int, optional): Page number to retrieve. Defaults to 1.
         per_page (int, optional): Number of items per page. Defaults to 10, max 100.
+        cursor (str, optional): Keyset cursor; switches to keyset pagination.
+        fields (str, optional): Comma separated fields to return per item.
     Raises:
         404: If the researcher with the given ID is not found.
     """
@@ -68,13 +90,25 @@ def get_followers(id):
     researcher = db.get_or_404(Researcher, id)
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 10, type=int), 100)
+    cursor = request.args.get("cursor")
+    try:
+        fields = Researcher.parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return bad_request(str(e))
     return Researcher.to_collection_dict(
-        researcher.followers.select(), page, per_page, "src.api.get_followers", id=id
+        researcher.followers.select(),
+        page,
+        per_page,
+        "api.get_followers",
+        cursor=cursor,
+        fields=fields,
+        id=id,
     )
 
 
 @bp.route("/researchers/<int:id>/following", methods=["GET"])
 @token_auth.login_required
+@conditional_get(lambda id: data_validators("researcher"))
 def get_following(id):
     """
     Retrieve a paginated collection of researchers that a specific researcher is following.
@@ -90,16 +124,95 @@ def get_following(id):
     Query Parameters:
         page (int, optional): Page number for pagination. Defaults to 1.
         per_page (int, optional): Number of items per page (max 100). Defaults to 10.
+        cursor (str, optional): Keyset cursor; switches to keyset pagination.
+        fields (str, optional): Comma separated fields to return per item.
     """
 
     researcher = db.get_or_404(Researcher, id)
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 10, type=int), 100)
+    cursor = request.args.get("cursor")
+    try:
+        fields = Researcher.parse_fields(request.args.get("fields"))
+    except ValueError as e:
+        return bad_request(str(e))
     return Researcher.to_collection_dict(
-        researcher.following.select(), page, per_page, "src.api.get_following", id=id
+        researcher.following.select(),
+        page,
+        per_page,
+        "api.get_following",
+        cursor=cursor,
+        fields=fields,
+        id=id,
     )
 
 
+@bp.route("/researchers/<int:id>/following_activity", methods=["GET"])
+@token_auth.login_required
+def get_following_activity(id):
+    """
+    Retrieve recent pipeline activity of the researchers a researcher follows.
+    Args:
+        id (int): The unique identifier of the researcher whose feed to retrieve.
+    Returns:
+        dict: A paginated collection dictionary containing:
+            - items: One entry per followed researcher with pipeline runs in the
+              last 3 months: id, researcher_name, total_runs and pipelines,
+              most active first
+            - pagination metadata (page, per_page, total_pages, total_items)
+            - navigation links for the collection
+    Query Parameters:
+        page (int, optional): Page number to retrieve. Defaults to 1.
+        per_page (int, optional): Number of items per page. Defaults to 10,
+            clamped to 1-100.
+    Raises:
+        404: If the researcher with the given id does not exist.
+    Note:
+        The feed is computed in one aggregate query and cached for
+        ACTIVITY_CACHE_TIMEOUT seconds, so pages are sliced from the cache.
+    """
+    researcher = db.get_or_404(Researcher, id)
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = max(min(request.args.get("per_page", 10, type=int), 100), 1)
+    activity = researcher.following_activity()
+    total_pages = -(-len(activity) // per_page)
+    start = (page - 1) * per_page
+    return {
+        "items": activity[start : start + per_page],
+        "_meta": {
+            "page": page,
+            "per_page": per_page,
+            "total_pages": total_pages,
+            "total_items": len(activity),
+        },
+        "_links": {
+            "self": url_for(
+                "api.get_following_activity", id=id, page=page, per_page=per_page
+            ),
+            "next": (
+                url_for(
+                    "api.get_following_activity",
+                    id=id,
+                    page=page + 1,
+                    per_page=per_page,
+                )
+                if page < total_pages
+                else None
+            ),
+            "prev": (
+                url_for(
+                    "api.get_following_activity",
+                    id=id,
+                    page=page - 1,
+                    per_page=per_page,
+                )
+                if page > 1
+                else None
+            ),
+        },
+    }
+
+
 @bp.route("/researchers", methods=["POST"])
 def create_researcher():
     """
@@ -141,7 +254,7 @@ def create_researcher():
     return (
         researcher.to_dict(),
         201,
-        {"Location": url_for("src.app.api.get_researcher", id=researcher.id)},
+        {"Location": url_for("api.get_researcher", id=researcher.id)},
     )
 
 
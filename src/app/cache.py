@@ -0,0 +1,387 @@
+"""
+Redis-backed caches shared by the web app and the RQ workers.
+
+Row counts for paginated views are expensive COUNT(*) queries over large
+tables that only change when data is loaded or inserted. They are cached in
+Redis under a logical name (e.g. "gene" or "pipeline_result:12") and dropped
+whenever a commit adds or deletes rows that contribute to that name. Models opt
+in by defining count_keys(), which returns the names an instance counts toward.
+
+The id of the most recent row of a table (e.g. the latest pipeline run) is
+cached the same way: models define latest_keys() to name the "latest" lookups
+that a newly inserted or deleted instance can change.
+
+Each count and latest id name also has a data version: a counter and modification time
+bumped whenever a commit inserts, updates or deletes rows counting toward it.
+Views use them to answer conditional requests without building the response
+(see src.app.conditional), and to key rendered HTML fragments, which are
+cached until the data they show changes.
+
+The progress of each researcher's running background tasks is kept in one
+Redis hash per researcher, so pages listing their tasks read it in one call.
+
+Redis is treated as an optimization: if it is unreachable every helper falls
+back to querying the database directly, and Redis is skipped for
+REDIS_RETRY_INTERVAL seconds so requests do not each pay for a failed connect.
+"""
+
+import json
+import time
+from hashlib import md5
+import sqlalchemy as sa
+from flask import current_app
+from markupsafe import Markup
+from redis.exceptions import RedisError
+from src.app import db
+
+COUNT_KEY_PREFIX = "row_count:"
+LATEST_ID_KEY_PREFIX = "latest_id:"
+VERSION_KEY_PREFIX = "data_version:"
+FRAGMENT_KEY_PREFIX = "fragment:"
+TASK_PROGRESS_KEY_PREFIX = "task_progress:"
+
+
+def get_redis():
+    """
+    Returns the app's Redis connection, or None while Redis is marked unreachable
+    """
+    if getattr(current_app, "redis_down_until", 0) > time.monotonic():
+        return None
+    return current_app.redis
+
+
+def mark_redis_down():
+    """
+    Skip Redis for REDIS_RETRY_INTERVAL seconds after a connection failure
+    """
+    current_app.redis_down_until = (
+        time.monotonic() + current_app.config["REDIS_RETRY_INTERVAL"]
+    )
+
+
+def _count_key(name):
+    return f"{COUNT_KEY_PREFIX}{name}"
+
+
+def _latest_id_key(name):
+    return f"{LATEST_ID_KEY_PREFIX}{name}"
+
+
+def _version_key(name):
+    return f"{VERSION_KEY_PREFIX}{name}"
+
+
+def _delete_keys(*keys):
+    redis = get_redis()
+    if not keys or redis is None:
+        return
+    try:
+        redis.delete(*keys)
+    except RedisError:
+        mark_redis_down()
+
+
+def cached_count(name, query):
+    """
+    Return the number of rows matched by query, cached under name
+
+    :params    name: logical name of the count, e.g. "gene" or "posts:3"
+    :params   query: a sa.select() whose rows are counted on a cache miss
+    :returns  count: the row count
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            value = redis.get(_count_key(name))
+            if value is not None:
+                return int(value)
+        except RedisError:
+            mark_redis_down()
+            redis = None
+    count = db.session.scalar(sa.select(sa.func.count()).select_from(query.subquery()))
+    if redis is not None:
+        try:
+            redis.set(
+                _count_key(name), count, ex=current_app.config["COUNT_CACHE_TIMEOUT"]
+            )
+        except RedisError:
+            mark_redis_down()
+    return count
+
+
+def invalidate_counts(*names):
+    """
+    Drop cached counts so the next read recomputes them. Used directly by bulk
+    loaders that bypass the ORM unit of work.
+
+    :params names: logical count names to invalidate
+    """
+    _delete_keys(*[_count_key(name) for name in names])
+    bump_data_versions(*names)
+
+
+def cached_latest_id(name, query):
+    """
+    Return the id selected by query, cached under name until a commit inserts
+    or deletes a row whose latest_keys() include name
+
+    :params    name: logical name of the lookup, e.g. "pipeline_run"
+    :params   query: a sa.select() of a single id, ordered so the wanted row comes first
+    :returns     id: the id, or None if query matches no rows
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            value = redis.get(_latest_id_key(name))
+            if value is not None:
+                # 0 caches "no rows"; ids start at 1
+                return int(value) or None
+        except RedisError:
+            mark_redis_down()
+            redis = None
+    latest_id = db.session.scalar(query.limit(1))
+    if redis is not None:
+        try:
+            redis.set(
+                _latest_id_key(name),
+                latest_id or 0,
+                ex=current_app.config["COUNT_CACHE_TIMEOUT"],
+            )
+        except RedisError:
+            mark_redis_down()
+    return latest_id
+
+
+def invalidate_latest_ids(*names):
+    """
+    Drop cached latest ids so the next read queries them again
+
+    :params names: logical lookup names to invalidate
+    """
+    _delete_keys(*[_latest_id_key(name) for name in names])
+
+
+def cached_json(key, loader, timeout):
+    """
+    Return the JSON-serializable value cached under key, calling loader() to
+    compute and cache it on a miss
+
+    :params     key: Redis key of the value
+    :params  loader: zero-argument callable producing the value
+    :params timeout: seconds the value stays cached
+    :returns  value: the cached or freshly loaded value
+    """
+    redis = get_redis()
+    if redis is not None:
+        try:
+            value = redis.get(key)
+            if value is not None:
+                return json.loads(value)
+        except RedisError:
+            mark_redis_down()
+            redis = None
+    value = loader()
+    if redis is not None:
+        try:
+            redis.set(key, json.dumps(value), ex=timeout)
+        except RedisError:
+            mark_redis_down()
+    return value
+
+
+def invalidate_json(*keys):
+    """
+    Drop values cached by cached_json()
+
+    :params keys: Redis keys of the values
+    """
+    _delete_keys(*keys)
+
+
+def data_version(name):
+    """
+    Return the current data version of name
+
+    :params    name: logical name of the data, e.g. "researcher"
+    :returns  tuple: (version, modification time as a POSIX timestamp), or
+                     None while Redis is unavailable
+    """
+    redis = get_redis()
+    if redis is None:
+        return None
+    try:
+        pipe = redis.pipeline()
+        # A version first read now counts as modified now
+        pipe.hsetnx(_version_key(name), "modified", time.time())
+        pipe.hmget(_version_key(name), "version", "modified")
+        unused_created, (version, modified) = pipe.execute()
+    except RedisError:
+        mark_redis_down()
+        return None
+    return int(version or 0), float(modified)
+
+
+def bump_data_versions(*names):
+    """
+    Record that the data under names changed. Used directly by writers that
+    bypass the ORM unit of work.
+
+    :params names: logical names of the changed data
+    """
+    redis = get_redis()
+    if not names or redis is None:
+        return
+    now = time.time()
+    try:
+        pipe = redis.pipeline()
+        for name in names:
+            pipe.hincrby(_version_key(name), "version", 1)
+            pipe.hset(_version_key(name), "modified", now)
+        pipe.execute()
+    except RedisError:
+        mark_redis_down()
+
+
+def mark_changed(session, *names):
+    """
+    Bump the data versions of names when session's transaction commits, for
+    changes the session cannot see, such as core UPDATE statements
+    """
+    session.info.setdefault("version_bumps", set()).update(names)
+
+
+def cached_fragment(name, data_names, render):
+    """
+    Return the HTML produced by render(), cached under name and the current
+    data versions of data_names, so a cached fragment is never served after
+    the data it shows has changed
+
+    :params       name: what the fragment shows, e.g. "explore_genes:en:<cursor>"
+    :params data_names: logical names of the data the fragment shows
+    :params     render: zero-argument callable rendering the fragment
+    :returns    Markup: the rendered HTML
+    """
+    versions = [data_version(data_name) for data_name in data_names]
+    redis = get_redis()
+    if redis is None or None in versions:
+        return Markup(render())
+    key = f"{FRAGMENT_KEY_PREFIX}{name}:{md5(repr(versions).encode()).hexdigest()}"
+    try:
+        html = redis.get(key)
+        if html is not None:
+            return Markup(html.decode("utf-8"))
+    except RedisError:
+        mark_redis_down()
+        return Markup(render())
+    html = render()
+    try:
+        redis.set(key, html, ex=current_app.config["FRAGMENT_CACHE_TIMEOUT"])
+    except RedisError:
+        mark_redis_down()
+    return Markup(html)
+
+
+def set_task_progress(researcher_id, task_id, progress):
+    """
+    Record the progress of a researcher's running task, or forget it once
+    the task is complete
+
+    :params researcher_id: id of the researcher who launched the task
+    :params       task_id: the task id
+    :params      progress: percent complete
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    key = f"{TASK_PROGRESS_KEY_PREFIX}{researcher_id}"
+    try:
+        if progress >= 100:
+            redis.hdel(key, task_id)
+            return
+        pipe = redis.pipeline(transaction=False)
+        pipe.hset(key, task_id, progress)
+        pipe.expire(key, current_app.config["TASK_PROGRESS_TTL"])
+        pipe.execute()
+    except RedisError:
+        mark_redis_down()
+
+
+def get_task_progress(researcher_id, task_ids):
+    """
+    Look up the recorded progress of several of a researcher's tasks in one
+    Redis call
+
+    :params researcher_id: id of the researcher who launched the tasks
+    :params      task_ids: the task ids
+    :returns         dict: task id -> percent complete, for recorded tasks
+    """
+    redis = get_redis()
+    if redis is None or not task_ids:
+        return {}
+    try:
+        values = redis.hmget(f"{TASK_PROGRESS_KEY_PREFIX}{researcher_id}", task_ids)
+    except RedisError:
+        mark_redis_down()
+        return {}
+    return {
+        task_id: int(value)
+        for task_id, value in zip(task_ids, values)
+        if value is not None
+    }
+
+
+def paginate_with_cached_count(query, count_name, page, per_page):
+    """
+    db.paginate() without its per-page COUNT(*); the total comes from the
+    count cache instead.
+
+    :params      query: the sa.select() to paginate
+    :params count_name: logical name of the count for this query
+    :params       page: page number
+    :params   per_page: items per page
+    :returns Pagination: the Flask-SQLAlchemy pagination object
+    """
+    resources = db.paginate(
+        query, page=page, per_page=per_page, error_out=False, count=False
+    )
+    resources.total = cached_count(count_name, query)
+    return resources
+
+
+def _collect_count_keys(session, flush_context):
+    """
+    Record the cached counts and latest ids touched by inserted or deleted
+    rows, and the data versions touched by any changed row. Runs after each
+    flush, while session.new, dirty and deleted still hold the pre-flush state.
+    """
+    keys = session.info.setdefault("count_invalidations", set())
+    versions = session.info.setdefault("version_bumps", set())
+    for obj in list(session.new) + list(session.deleted):
+        if hasattr(obj, "count_keys"):
+            keys.update(_count_key(name) for name in obj.count_keys())
+        if hasattr(obj, "latest_keys"):
+            keys.update(_latest_id_key(name) for name in obj.latest_keys())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if hasattr(obj, "count_keys"):
+            versions.update(obj.count_keys())
+        if hasattr(obj, "latest_keys"):
+            versions.update(obj.latest_keys())
+
+
+def _invalidate_committed_counts(session):
+    keys = session.info.pop("count_invalidations", None)
+    if keys:
+        _delete_keys(*keys)
+    versions = session.info.pop("version_bumps", None)
+    if versions:
+        bump_data_versions(*versions)
+
+
+def _discard_count_keys(session):
+    session.info.pop("count_invalidations", None)
+    session.info.pop("version_bumps", None)
+
+
+db.event.listen(db.session, "after_flush", _collect_count_keys)
+db.event.listen(db.session, "after_commit", _invalidate_committed_counts)
+db.event.listen(db.session, "after_rollback", _discard_count_keys)
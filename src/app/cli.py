@@ -273,3 +273,162 @@ def create_search_indices():
             print(f"Error indexing post {post.id}: {str(e)}")
 
     print(f"Successfully indexed {len(posts)} posts")
+
+
+@bp.cli.command("refresh-suggestions")
+def refresh_suggestions():
+    """Recompute the follow suggestions of every researcher"""
+    from src.app import db
+    from src.app.models.researcher import Researcher
+    from src.app.suggestions import refresh_follow_suggestions
+
+    researcher_ids = db.session.scalars(sa.select(Researcher.id)).all()
+    for researcher_id in researcher_ids:
+        refresh_follow_suggestions(researcher_id)
+    print(f"Refreshed follow suggestions for {len(researcher_ids)} researchers")
+
+
+@bp.cli.command("build-timelines")
+def build_timelines():
+    """Build the cached microblog timeline of every researcher"""
+    from src.app import db
+    from src.app.models.researcher import Researcher
+    from src.app.timeline import build_timeline
+
+    researchers = db.session.scalars(sa.select(Researcher)).all()
+    posts = sum(build_timeline(researcher) for researcher in researchers)
+    print(f"Built {len(researchers)} timelines with {posts} posts")
+
+
+@bp.cli.command("summarize-runs")
+def summarize_runs():
+    """
+    Compute summaries for pipeline runs loaded before summaries existed.
+
+    Gene type counts cover every gene the pipeline read, and exclusions are
+    counted by the pipeline, so both come from the files in the run's results
+    directory. Runs whose directory is gone only have their results in the
+    database: their gene type counts are left empty and the TIGRFAM exclusion
+    count unknown, rather than counted from the results, which would disagree
+    with the summaries of runs loaded since.
+    """
+    import pandas as pd
+    from src.app import db
+    from src.app.models.pipeline_run import (
+        PipelineRun,
+        PipelineResult,
+        PipelineRunSummary,
+    )
+    from src.app.models.pipeline_run_service import summarize_results_dir
+    from src.utils.pipeline_utils import summarize_results
+    from src.utils.references import (
+        count_col,
+        gene_type_col,
+        gene_type_count_out_file,
+        hgnc_id_col,
+        pid_suffix_col,
+    )
+
+    runs = db.session.scalars(
+        sa.select(PipelineRun).where(~PipelineRun.summary.has())
+    ).all()
+    for run in runs:
+        rows = db.session.execute(
+            sa.select(
+                PipelineResult.gene_type,
+                PipelineResult.hgnc_id,
+                PipelineResult.pid_suffix,
+            ).where(PipelineResult.run_id == run.id)
+        ).all()
+        frame = pd.DataFrame(rows, columns=[gene_type_col, hgnc_id_col, pid_suffix_col])
+        results_dir = Path(run.output_dir) / "results"
+        if (results_dir / gene_type_count_out_file).exists():
+            summary = summarize_results_dir(frame, results_dir)
+        else:
+            summary = summarize_results(
+                frame, pd.DataFrame(columns=[gene_type_col, count_col])
+            )
+        run.summary = PipelineRunSummary.from_summary(summary)
+        db.session.commit()
+        print(f"Summarized run {run.id} ({len(frame)} results)")
+    print(f"Summarized {len(runs)} runs")
+
+
+@bp.cli.command("hash-results")
+@click.option("--batch-size", default=1000, help="Rows updated per commit")
+def hash_results(batch_size):
+    """Fill in row hashes for pipeline results loaded before they existed"""
+    from src.app import db
+    from src.app.models.pipeline_run import (
+        PipelineResult,
+        ROW_HASH_COLUMNS,
+        compute_row_hash,
+    )
+
+    columns = [getattr(PipelineResult, name) for name in ROW_HASH_COLUMNS]
+    total = 0
+    while True:
+        rows = db.session.execute(
+            sa.select(PipelineResult.id, *columns)
+            .where(PipelineResult.row_hash.is_(None))
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+        db.session.execute(
+            sa.update(PipelineResult),
+            [
+                {"id": row.id, "row_hash": compute_row_hash(row._mapping)}
+                for row in rows
+            ],
+        )
+        db.session.commit()
+        total += len(rows)
+    print(f"Hashed {total} pipeline results")
+
+
+@bp.cli.command("repair-counters")
+def repair_researcher_counters():
+    """Recompute the follower, following, post and unread message counters"""
+    from src.app.counters import repair_counters
+
+    print(f"Repaired the counters of {repair_counters()} researchers")
+
+
+def _run_worker(redis_url, queue_names):
+    from redis import Redis
+    from rq import Worker
+    from src.app.task_queues import QUEUE_PREFIX
+
+    Worker(
+        [f"{QUEUE_PREFIX}{name}" for name in queue_names],
+        connection=Redis.from_url(redis_url),
+    ).work()
+
+
+@bp.cli.command("worker")
+@click.option(
+    "--queue",
+    "queues",
+    multiple=True,
+    help="Only start the workers of this queue; may be repeated",
+)
+def run_workers(queues):
+    """Start TASK_QUEUE_WORKERS RQ worker processes for each task queue"""
+    import multiprocessing
+    from flask import current_app
+    from src.app.task_queues import worker_queues
+
+    config = current_app.config
+    unknown = set(queues) - set(config["TASK_QUEUES"])
+    if unknown:
+        raise click.BadParameter(f"Unknown queues: {', '.join(sorted(unknown))}")
+    workers = [
+        multiprocessing.Process(target=_run_worker, args=(config["REDIS_URL"], names))
+        for names in worker_queues(config, queues)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"Started {len(workers)} workers")
+    for worker in workers:
+        worker.join()
@@ -0,0 +1,103 @@
+"""
+Response compression negotiated from Accept-Encoding.
+
+Results pages, API collections and exports are mostly repetitive text, so
+compressing them cuts transfer time for remote clients. compress_response()
+runs after every request and encodes the body with brotli (when the Brotli
+package is installed) or gzip, whichever the client prefers:
+
+- buffered responses under COMPRESSION_MIN_SIZE bytes are sent as they are
+- streamed responses, such as exports, are compressed chunk by chunk and
+  flushed after each chunk, so the client keeps receiving data as it is
+  produced
+- only COMPRESSION_MIMETYPES are compressed, and never twice
+"""
+
+import zlib
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def _gzip_compressor(level):
+    # wbits 31 writes a gzip header and trailer
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+def _brotli_compressor(level):
+    # Brotli qualities run from 0 to 11, gzip levels from 1 to 9
+    compressor = brotli.Compressor(quality=min(level, 11))
+    return (
+        lambda chunk: compressor.process(chunk) + compressor.flush(),
+        compressor.finish,
+    )
+
+
+def _choose_encoding():
+    encodings = ["br", "gzip"] if brotli is not None else ["gzip"]
+    return request.accept_encodings.best_match(encodings)
+
+
+def _compress_stream(chunks, compress, finish):
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def compress_response(response):
+    """
+    Compress a response for clients that accept gzip or brotli encoding
+
+    :params   response: the response of the current request
+    :returns  response: the response, compressed when worthwhile
+    """
+    config = current_app.config
+    if (
+        not config["COMPRESSION_ENABLED"]
+        or request.method == "HEAD"
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or response.direct_passthrough
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in config["COMPRESSION_MIMETYPES"]
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = _choose_encoding()
+    if encoding is None:
+        return response
+    size = response.calculate_content_length()
+    if not response.is_streamed and (size or 0) < config["COMPRESSION_MIN_SIZE"]:
+        return response
+
+    level = config["COMPRESSION_LEVEL"]
+    compress, finish = (
+        _brotli_compressor(level) if encoding == "br" else _gzip_compressor(level)
+    )
+    if response.is_streamed:
+        response.response = _compress_stream(response.response, compress, finish)
+        response.headers.pop("Content-Length", None)
+    else:
+        response.set_data(compress(response.get_data()) + finish())
+    response.headers["Content-Encoding"] = encoding
+    # The compressed body is a different representation of the same data
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,101 @@
+"""
+Conditional GET support.
+
+Views decorated with conditional_get() name the data their response depends
+on, and get an ETag and Last-Modified header derived from its data versions
+(see src.app.cache.data_version) rather than from the response body. A client
+revalidating with If-None-Match or If-Modified-Since gets a 304 Not Modified
+before the view queries, renders or serializes anything.
+
+While Redis is unavailable there are no data versions, and views respond in
+full without validators.
+"""
+
+from datetime import datetime, timezone
+from functools import wraps
+from hashlib import md5
+from flask import current_app, make_response, request, session
+from flask_babel import get_locale
+from flask_login import current_user
+from werkzeug.http import is_resource_modified
+from src.app.cache import data_version
+
+
+def data_validators(*names, parts=()):
+    """
+    Validators for a response determined by the request URL, parts and the
+    data under names
+
+    :params names: logical data names, e.g. "researcher" or "pipeline_result:3"
+    :params parts: other values the response depends on
+    :returns tuple: (ETag parts, last modified datetime), or None without Redis
+    """
+    versions = [data_version(name) for name in names]
+    if None in versions:
+        return None
+    last_modified = max(modified for unused_version, modified in versions)
+    return (
+        [request.full_path, *parts, *versions],
+        datetime.fromtimestamp(last_modified, timezone.utc),
+    )
+
+
+def page_validators(*names, parts=()):
+    """
+    data_validators() for an HTML page, which also depends on the locale and
+    on what base.html shows of the logged in researcher: their name, unread
+    message count and the progress of their running tasks. Pages with flashed
+    messages waiting to be shown are always rendered.
+    """
+    if session.get("_flashes"):
+        return None
+    if current_user.is_authenticated:
+        tasks = current_user.get_tasks_in_progress().all()
+        parts = (
+            current_user.id,
+            current_user.researcher_name,
+            current_user.unread_messages_count(),
+            sorted(current_user.get_tasks_progress(tasks).items()),
+            *parts,
+        )
+    return data_validators(*names, parts=(str(get_locale()), *parts))
+
+
+def conditional_get(validators):
+    """
+    Decorator answering GET requests with 304 Not Modified when the client's
+    copy is current
+
+    :params validators: called with the view's arguments; returns the result
+                        of data_validators() or page_validators(), or None to
+                        respond without validators
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(*args, **kwargs)
+            checked = validators(*args, **kwargs)
+            if checked is None:
+                return view(*args, **kwargs)
+            parts, last_modified = checked
+            etag = md5(repr(parts).encode("utf-8")).hexdigest()
+            if not is_resource_modified(
+                request.environ, etag=etag, last_modified=last_modified
+            ):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag)
+            response.last_modified = last_modified
+            # Authenticated responses: clients may keep them but must revalidate
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+
+        return wrapped
+
+    return decorator
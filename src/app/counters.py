@@ -0,0 +1,151 @@
+"""
+Denormalized social counters on the researcher table.
+
+Profiles, popups and API responses show each researcher's follower, following,
+post and unread message counts. Instead of a COUNT(*) subquery per count and
+render, the researcher table keeps them in counter columns that change in the
+same transaction as the rows they count:
+
+- Researcher.follow() and unfollow() adjust both researchers' follow counters
+- a flush that inserts or deletes posts adjusts their authors' post counters,
+  and one that inserts messages adjusts their recipients' unread counters
+- setting last_message_read_time resets the unread counter
+
+Counters are updated relatively (counter = counter + n), so concurrent
+transactions do not overwrite each other's changes. Rows changed outside the
+ORM are not counted; 'flask repair-counters' recomputes every counter in bulk.
+"""
+
+import sqlalchemy as sa
+from src.app import db
+from src.app.cache import mark_changed
+
+
+def _update_counters(connection, column, deltas):
+    from src.app.models.researcher import Researcher
+
+    table = Researcher.__table__
+    connection.execute(
+        table.update()
+        .where(table.c.id == sa.bindparam("researcher_id"))
+        .values({column: table.c[column] + sa.bindparam("delta")}),
+        [
+            {"researcher_id": researcher_id, "delta": n}
+            for researcher_id, n in deltas.items()
+        ],
+    )
+
+
+def _expire(session, column, researcher_ids):
+    from src.app.models.researcher import Researcher
+
+    for researcher_id in researcher_ids:
+        researcher = session.identity_map.get(
+            session.identity_key(Researcher, researcher_id)
+        )
+        if researcher is not None:
+            session.expire(researcher, [column])
+
+
+def adjust_counters(session, column, deltas):
+    """
+    Add deltas to a counter column with one UPDATE in the session's
+    transaction, and expire the column on loaded researchers so that they
+    read the new value
+
+    :params session: the session whose transaction the UPDATE joins
+    :params  column: name of the counter column, e.g. "following_counter"
+    :params  deltas: researcher id -> amount to add
+    """
+    deltas = {researcher_id: n for researcher_id, n in deltas.items() if n}
+    if deltas:
+        _update_counters(session.connection(), column, deltas)
+        _expire(session, column, deltas)
+        mark_changed(session, "researcher")
+
+
+def repair_counters():
+    """
+    Recompute every researcher's counters from the followers, post and message
+    tables with a single bulk UPDATE
+
+    :returns count: the number of researchers whose counters were wrong
+    """
+    from src.app.models.researcher import Researcher, Post, Message, followers
+
+    def count(table, *criteria):
+        return (
+            sa.select(sa.func.count())
+            .select_from(table)
+            .where(*criteria)
+            .scalar_subquery()
+        )
+
+    actual = {
+        "followers_counter": count(followers, followers.c.followed_id == Researcher.id),
+        "following_counter": count(followers, followers.c.follower_id == Researcher.id),
+        "posts_counter": count(Post, Post.researcher_id == Researcher.id),
+        "unread_messages_counter": count(
+            Message,
+            Message.recipient_id == Researcher.id,
+            sa.or_(
+                Researcher.last_message_read_time.is_(None),
+                Message.timestamp > Researcher.last_message_read_time,
+            ),
+        ),
+    }
+    result = db.session.execute(
+        sa.update(Researcher)
+        .where(
+            sa.or_(
+                *[
+                    getattr(Researcher, column) != value
+                    for column, value in actual.items()
+                ]
+            )
+        )
+        .values(actual)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount:
+        mark_changed(db.session, "researcher")
+    db.session.commit()
+    return result.rowcount
+
+
+def _count_flushed_rows(session, flush_context):
+    """
+    Adjust the counters of the authors and recipients of posts and messages
+    inserted or deleted by a flush. The counters are expired once the flush has
+    finished, since expiring them during it would be undone.
+    """
+    from src.app.models.researcher import Post, Message
+
+    deltas = {"posts_counter": {}, "unread_messages_counter": {}}
+    for obj in session.new:
+        if isinstance(obj, Post):
+            posts = deltas["posts_counter"]
+            posts[obj.researcher_id] = posts.get(obj.researcher_id, 0) + 1
+        elif isinstance(obj, Message):
+            unread = deltas["unread_messages_counter"]
+            unread[obj.recipient_id] = unread.get(obj.recipient_id, 0) + 1
+    for obj in session.deleted:
+        if isinstance(obj, Post):
+            posts = deltas["posts_counter"]
+            posts[obj.researcher_id] = posts.get(obj.researcher_id, 0) - 1
+    expire = session.info["expire_counters"] = []
+    for column, changes in deltas.items():
+        changes = {researcher_id: n for researcher_id, n in changes.items() if n}
+        if changes:
+            _update_counters(session.connection(), column, changes)
+            expire.append((column, list(changes)))
+            mark_changed(session, "researcher")
+
+
+def _expire_flushed_counters(session, flush_context):
+    for column, researcher_ids in session.info.pop("expire_counters", []):
+        _expire(session, column, researcher_ids)
+
+
+db.event.listen(db.session, "after_flush", _count_flushed_rows)
+db.event.listen(db.session, "after_flush_postexec", _expire_flushed_counters)
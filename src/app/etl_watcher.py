@@ -0,0 +1,100 @@
+"""
+Discovery of pipeline runs made with the command line ETL.
+
+The CLI writes each run to ETL_OUTPUT_DIR/output_<MMDDYYTHHMMSS>/results. Rather
+than globbing that directory on every request, a daemon thread polls its mtime,
+which changes whenever a run directory is created, and only then rescans it.
+Once the newest run has written its final results it is reported as pending,
+and the web app hands it to an RQ worker to import (see
+src.app.tasks.import_cli_results), so no request reads the filesystem or
+loads a CSV. Runs started from the web app, which load their own results,
+leave a marker file in their directory and are never reported.
+"""
+
+import threading
+from pathlib import Path
+from src.utils.pipeline_utils import _parse_timestamp
+from src.utils.references import final_results_file_name, ui_run_marker_file_name
+
+
+class EtlOutputWatcher:
+    """
+    Polls the ETL output directory for new CLI runs.
+
+    Attributes:
+        etl_dir: directory the CLI writes output_<timestamp> run directories to
+        interval: seconds between polls; 0 disables the background thread
+    """
+
+    def __init__(self, etl_dir, interval):
+        self.etl_dir = Path(etl_dir)
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._dir_mtime = None
+        self._newest_dir = None
+        self._reported_dir = None
+        self._pending_dir = None
+
+    def _newest_output_dir(self):
+        output_dirs = [d for d in self.etl_dir.glob("output_*") if d.is_dir()]
+        return max(output_dirs, key=_parse_timestamp, default=None)
+
+    def poll(self):
+        """
+        Check the ETL directory once. Rescans only when its mtime has changed,
+        and marks the newest run pending once its final results exist.
+        """
+        try:
+            mtime = self.etl_dir.stat().st_mtime
+        except OSError:
+            return
+        with self._lock:
+            if mtime != self._dir_mtime:
+                self._dir_mtime = mtime
+                self._newest_dir = self._newest_output_dir()
+            newest = self._newest_dir
+            if newest is None or newest == self._reported_dir:
+                return
+            if (newest / ui_run_marker_file_name).exists():
+                self._reported_dir = newest
+                return
+            if (newest / "results" / final_results_file_name).exists():
+                self._reported_dir = newest
+                self._pending_dir = newest
+
+    def claim_pending(self):
+        """
+        Return the newest CLI run directory discovered since the last call,
+        or None. Each discovered directory is returned once per process.
+        """
+        with self._lock:
+            pending, self._pending_dir = self._pending_dir, None
+            return pending
+
+    def release(self, output_dir):
+        """Report output_dir again on a later poll, e.g. after a failed enqueue"""
+        with self._lock:
+            if self._reported_dir == output_dir:
+                self._reported_dir = None
+
+    def ensure_started(self):
+        """Start the polling thread unless it is running or disabled"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name="etl-output-watcher", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.poll()
+            self._stop.wait(self.interval)
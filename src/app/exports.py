@@ -0,0 +1,183 @@
+"""
+Bulk exports written by background tasks.
+
+Exports read their rows in batches of EXPORT_BATCH_SIZE with yield_per, which
+streams them from a server-side cursor where the driver supports one, and
+write each batch to a file as it arrives, so memory stays flat however much
+data a researcher has.
+
+Table exports of genes, gene annotations and a run's pipeline results are
+written to EXPORT_DIR as CSV, or as Parquet with one row group per batch when
+the pyarrow package is installed. They run in the export_table RQ task, and
+the finished file is recorded as the task's artifact for download.
+"""
+
+import csv
+import json
+from datetime import datetime
+from pathlib import Path
+import sqlalchemy as sa
+from flask import current_app
+from src.app import db
+from src.app.models.researcher import Researcher, Post
+from src.app.models.gene import Gene, GeneAnnotation
+from src.app.models.pipeline_run import PipelineResult
+from src.app.models.pipeline_run_service import EXPORT_COLUMNS
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+TABLE_EXPORTS = {
+    "gene": Gene,
+    "gene_annotation": GeneAnnotation,
+    "pipeline_result": PipelineResult,
+}
+
+
+def _iter_post_batches(researcher_id, batch_size):
+    query = (
+        sa.select(Post.body, Post.timestamp)
+        .where(Post.researcher_id == researcher_id)
+        .order_by(Post.timestamp.asc(), Post.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.session.execute(query).partitions():
+        yield partition
+
+
+def write_posts_export(researcher_id, file, batch_size, progress=None):
+    """
+    Write a researcher's posts to file as a JSON document of the form
+    {"posts": [{"body": ..., "timestamp": ...}, ...]}, oldest first
+
+    :params researcher_id: id of the researcher whose posts are exported
+    :params          file: text file the export is written to
+    :params    batch_size: posts fetched from the database per round trip
+    :params      progress: called with the percent of posts written so far
+    :returns          int: the number of posts written
+    """
+    total = db.session.get(Researcher, researcher_id).posts_count()
+    written = 0
+    file.write('{"posts": [')
+    separator = "\n    "
+    for batch in _iter_post_batches(researcher_id, batch_size):
+        for body, timestamp in batch:
+            post = {"body": body, "timestamp": timestamp.isoformat() + "Z"}
+            file.write(separator + json.dumps(post))
+            separator = ",\n    "
+        written += len(batch)
+        if progress is not None and total:
+            progress(min(100 * written // total, 99))
+    file.write("\n]}\n")
+    return written
+
+
+def table_export_formats():
+    """Returns the formats tables can be exported in"""
+    return ["csv", "parquet"] if pyarrow is not None else ["csv"]
+
+
+def export_filename(table, fmt, task_id, run_id=None):
+    """Returns the name of the file a table export task writes"""
+    run = f"_run{run_id}" if run_id is not None else ""
+    return f"{table}{run}_{task_id}.{fmt}"
+
+
+def export_path(filename):
+    """Returns the path of an export file in EXPORT_DIR"""
+    return Path(current_app.config["EXPORT_DIR"]) / filename
+
+
+def _table_columns(table):
+    model = TABLE_EXPORTS[table]
+    if model is PipelineResult:
+        # The same columns as the streamed run download
+        return [getattr(PipelineResult, name) for name in EXPORT_COLUMNS]
+    return [getattr(model, column.key) for column in model.__table__.columns]
+
+
+def _arrow_type(column):
+    python_type = column.type.python_type
+    if python_type is bool:
+        return pyarrow.bool_()
+    if python_type is int:
+        return pyarrow.int64()
+    if python_type is float:
+        return pyarrow.float64()
+    if python_type is datetime:
+        return pyarrow.timestamp("us")
+    return pyarrow.string()
+
+
+def _write_csv(path, columns, batches):
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow([column.key for column in columns])
+        for batch in batches:
+            writer.writerows(batch)
+            yield len(batch)
+
+
+def _write_parquet(path, columns, batches):
+    schema = pyarrow.schema([(column.key, _arrow_type(column)) for column in columns])
+    with pyarrow.parquet.ParquetWriter(path, schema) as writer:
+        for batch in batches:
+            values = list(zip(*batch))
+            writer.write_table(
+                pyarrow.table(
+                    {
+                        field.name: pyarrow.array(column, type=field.type)
+                        for field, column in zip(schema, values)
+                    },
+                    schema=schema,
+                )
+            )
+            yield len(batch)
+
+
+def write_table_export(table, fmt, filename, batch_size, run_id=None, progress=None):
+    """
+    Write a table, or a run's pipeline results, to a file in EXPORT_DIR. The
+    rows are written to a partial file which only replaces filename once
+    complete, so a failed export never leaves a truncated file to download.
+
+    :params      table: a key of TABLE_EXPORTS
+    :params        fmt: one of table_export_formats()
+    :params   filename: name of the export file
+    :params batch_size: rows fetched from the database and written at a time
+    :params     run_id: id of the run whose results are exported, for
+                        "pipeline_result"
+    :params   progress: called with the percent of rows written so far
+    :returns       int: the number of rows written
+    """
+    if table not in TABLE_EXPORTS:
+        raise ValueError(f"Unsupported export table: {table}")
+    if fmt not in table_export_formats():
+        raise ValueError(f"Unsupported export format: {fmt}")
+    model = TABLE_EXPORTS[table]
+    columns = _table_columns(table)
+    query = sa.select(*columns).order_by(model.id)
+    if model is PipelineResult:
+        query = query.where(PipelineResult.run_id == run_id)
+    total = db.session.scalar(sa.select(sa.func.count()).select_from(query.subquery()))
+
+    path = export_path(filename)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".part")
+    batches = db.session.execute(
+        query.execution_options(yield_per=batch_size)
+    ).partitions()
+    writer = _write_parquet if fmt == "parquet" else _write_csv
+    written = 0
+    try:
+        for count in writer(partial, columns, batches):
+            written += count
+            if progress is not None and total:
+                progress(min(100 * written // total, 99))
+        partial.replace(path)
+    finally:
+        partial.unlink(missing_ok=True)
+    return written
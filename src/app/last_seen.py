@@ -0,0 +1,140 @@
+"""
+Write-coalesced researcher.last_seen updates.
+
+Recording the time of every authenticated request used to cost a write
+transaction per request. Instead, each request stores the timestamp in a Redis
+hash (or in process memory while Redis is unreachable), at most once per
+LAST_SEEN_RESOLUTION seconds per researcher, and the buffered timestamps are
+written to the researcher table in a single bulk UPDATE every
+LAST_SEEN_FLUSH_INTERVAL seconds. A Redis lock lets only one web process flush
+the shared hash per interval.
+
+The update runs in its own session, so the request that happens to flush
+neither commits its own work early nor has its objects expired. A flush that
+writes rows bumps the "researcher" data version once, so conditional requests
+for researchers see the new last_seen at most one flush interval late.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+import sqlalchemy as sa
+import sqlalchemy.orm as so
+from flask import current_app
+from redis.exceptions import RedisError
+from sqlalchemy.exc import SQLAlchemyError
+from src.app import db
+from src.app.cache import get_redis, mark_redis_down, bump_data_versions
+
+LAST_SEEN_KEY = "last_seen"
+FLUSH_LOCK_KEY = "last_seen:flush_lock"
+
+
+class LastSeenBuffer:
+    """
+    Buffers last seen timestamps and periodically flushes them to the database.
+
+    Attributes:
+        flush_interval: seconds between bulk updates of researcher.last_seen
+        resolution: seconds during which repeat requests by a researcher are not recorded again
+    """
+
+    def __init__(self, flush_interval, resolution):
+        self.flush_interval = flush_interval
+        self.resolution = resolution
+        self._lock = threading.Lock()
+        self._recorded = {}
+        self._pending = {}
+        self._next_flush = time.monotonic() + flush_interval
+
+    def record(self, researcher_id, when=None):
+        """
+        Note that a researcher was active. Does no I/O when the researcher was
+        already recorded in the last resolution seconds.
+
+        :params researcher_id: id of the active researcher
+        :params          when: time of the activity; defaults to now
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now - self._recorded.get(researcher_id, -self.resolution) < (
+                self.resolution
+            ):
+                return
+            self._recorded[researcher_id] = now
+        when = when or datetime.now(timezone.utc)
+        redis = get_redis()
+        if redis is not None:
+            try:
+                redis.hset(LAST_SEEN_KEY, researcher_id, when.timestamp())
+                return
+            except RedisError:
+                mark_redis_down()
+        with self._lock:
+            self._pending[researcher_id] = max(
+                when.timestamp(), self._pending.get(researcher_id, 0)
+            )
+
+    def flush_if_due(self):
+        """Flush the buffer if flush_interval has passed since the last flush"""
+        if time.monotonic() < self._next_flush:
+            return 0
+        return self.flush()
+
+    def _take_redis_buffer(self):
+        redis = get_redis()
+        if redis is None:
+            return {}
+        try:
+            if self.flush_interval > 0 and not redis.set(
+                FLUSH_LOCK_KEY, 1, nx=True, ex=self.flush_interval
+            ):
+                # Another process flushed the shared hash this interval
+                return {}
+            pipe = redis.pipeline()
+            pipe.hgetall(LAST_SEEN_KEY)
+            pipe.delete(LAST_SEEN_KEY)
+            buffered, unused_deleted = pipe.execute()
+        except RedisError:
+            mark_redis_down()
+            return {}
+        return {int(k): float(v) for k, v in buffered.items()}
+
+    def flush(self):
+        """
+        Write every buffered timestamp to researcher.last_seen in one bulk UPDATE
+
+        :returns count: the number of researchers updated
+        """
+        self._next_flush = time.monotonic() + self.flush_interval
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for researcher_id, seen in self._take_redis_buffer().items():
+            pending[researcher_id] = max(seen, pending.get(researcher_id, 0))
+        if not pending:
+            return 0
+
+        from src.app.models.researcher import Researcher
+
+        try:
+            with so.Session(db.engine) as session, session.begin():
+                session.execute(
+                    sa.update(Researcher),
+                    [
+                        {
+                            "id": researcher_id,
+                            "last_seen": datetime.fromtimestamp(seen, timezone.utc),
+                        }
+                        for researcher_id, seen in pending.items()
+                    ],
+                )
+        except SQLAlchemyError as e:
+            current_app.logger.error(f"Failed to flush last seen times: {e}")
+            with self._lock:
+                for researcher_id, seen in pending.items():
+                    self._pending[researcher_id] = max(
+                        seen, self._pending.get(researcher_id, 0)
+                    )
+            return 0
+        bump_data_versions("researcher")
+        return len(pending)
@@ -3,12 +3,25 @@ import traceback
 import os
 from pathlib import Path
 from datetime import datetime, timezone
-from flask import render_template, flash, redirect, url_for, request, g, current_app
+from flask import (
+    render_template,
+    flash,
+    redirect,
+    url_for,
+    request,
+    g,
+    current_app,
+    abort,
+    Response,
+    stream_with_context,
+    send_file,
+)
 from flask_login import current_user, login_required
 from flask_babel import _, get_locale
 import sqlalchemy as sa
 import pandas as pd
 from langdetect import detect, LangDetectException
+from redis.exceptions import RedisError
 from src.app import db
 from src.app.main.forms import (
     EditProfileForm,
@@ -18,16 +31,32 @@ from src.app.main.forms import (
     SearchForm,
     MessageForm,
 )
-from src.app.models.researcher import Researcher, Post, Message, Notification
+from src.app.conditional import conditional_get, page_validators
+from src.app.models.researcher import Researcher, Post, Message, Notification, Task
 from src.app.models.gene import Gene, GeneAnnotation
 from src.app.models.pipeline_run import PipelineRun, PipelineResult
 from src.app.models.pipeline_run_service import (
-    load_pipeline_results_into_db,
     process_pipeline_run,
+    stream_pipeline_results,
+    compare_pipeline_runs,
+    get_latest_pipeline_run,
+    EXPORT_FORMATS,
+)
+from src.app.cache import (
+    get_redis,
+    cached_count,
+    cached_fragment,
+    paginate_with_cached_count,
+    invalidate_json,
 )
+from src.app.pagination import keyset_paginate
+from src.app.notifications import notification_events
+from src.app.exports import TABLE_EXPORTS, table_export_formats, export_path
+from src.app.suggestions import get_follow_suggestions, follows_changed
+from src.app import timeline
 from src.app.translate import translate
 from src.app.main import bp
-from src.utils.pipeline_utils import GeneReader
+from src.utils.pipeline_utils import GeneReader, _parse_timestamp
 from src.utils.references import (
     GENE_ANNOTATOR_FRONTEND,
     gene_stable_id_col,
@@ -47,11 +76,11 @@ frontend_logger = logging.getLogger(GENE_ANNOTATOR_FRONTEND)
 def find_more_researchers():
     """Page for finding more researchers to follow"""
     page = request.args.get("page", 1, type=int)
-    researchers = db.paginate(
+    researchers = paginate_with_cached_count(
         sa.select(Researcher).order_by(Researcher.researcher_name),
+        "researcher",
         page=page,
         per_page=current_app.config.get("RESEARCHERS_PER_PAGE", 10),
-        error_out=False,
     )
 
     form = EmptyForm()  # For follow/unfollow actions
@@ -88,11 +117,8 @@ def microblog():
 
     # Set up page and pagination for posts
     page = request.args.get("page", 1, type=int)
-    posts = db.paginate(
-        current_user.following_posts(),
-        page=page,
-        per_page=current_app.config["POSTS_PER_PAGE"],
-        error_out=False,
+    posts = timeline.timeline_page(
+        current_user, page, current_app.config["POSTS_PER_PAGE"]
     )
 
     posts_next_url = (
@@ -102,18 +128,8 @@ def microblog():
         url_for("main.microblog", page=posts.prev_num) if posts.has_prev else None
     )
 
-    # Get list of researchers to suggest following
-    researchers_to_follow = (
-        db.session.execute(
-            sa.select(Researcher)
-            .where(Researcher.id != current_user.id)
-            .where(~Researcher.followers.of_type(Researcher).contains(current_user))
-            .order_by(sa.func.random())
-            .limit(5)
-        )
-        .scalars()
-        .all()
-    )
+    # Suggestions are ranked in the background and read from Redis
+    researchers_to_follow = get_follow_suggestions(current_user.id)
 
     form = EmptyForm()  # For follow/unfollow actions
 
@@ -199,6 +215,9 @@ def add_annotation():
 
 @bp.route("/pipeline_run/<int:run_id>")
 @login_required
+@conditional_get(
+    lambda run_id: page_validators(f"pipeline_result:{run_id}", "pipeline_run")
+)
 def pipeline_run_results(run_id):
     run = db.session.get(PipelineRun, run_id)
     if run is None:
@@ -211,153 +230,180 @@ def pipeline_run_results(run_id):
             run_id=run_id,
         )
 
-    page = request.args.get("page", 1, type=int)
+    cursor = request.args.get("cursor")
+    query = sa.select(PipelineResult).where(PipelineResult.run_id == run_id)
 
-    # Query PipelineResult directly
-    results = db.paginate(
-        sa.select(PipelineResult)
-        .where(PipelineResult.run_id == run_id)
-        .order_by(PipelineResult.gene_stable_id),
-        page=page,
-        per_page=current_app.config["GENES_PER_PAGE"],
-        error_out=False,
-    )
+    def render_results():
+        # Seek through the run's results on its (run_id, gene_stable_id, id) index
+        results = keyset_paginate(
+            query,
+            order_by=(PipelineResult.gene_stable_id, PipelineResult.id),
+            cursor=cursor,
+            per_page=current_app.config["GENES_PER_PAGE"],
+        )
+        return render_template(
+            "_pipeline_results_table.html",
+            results=results.items,
+            next_url=(
+                url_for(
+                    "main.pipeline_run_results",
+                    run_id=run_id,
+                    cursor=results.next_cursor,
+                )
+                if results.has_next
+                else None
+            ),
+            prev_url=(
+                url_for(
+                    "main.pipeline_run_results",
+                    run_id=run_id,
+                    cursor=results.prev_cursor,
+                )
+                if results.has_prev
+                else None
+            ),
+        )
 
+    # Only the results table is cached; the run details around it are live
+    results_table = cached_fragment(
+        f"pipeline_results:{run_id}:{get_locale()}:{cursor or ''}",
+        [f"pipeline_result:{run_id}"],
+        render_results,
+    )
     return render_template(
         "pipeline_results.html",
         run=run,
-        results=results.items,
-        next_url=(
-            url_for("main.pipeline_run_results", run_id=run_id, page=results.next_num)
-            if results.has_next
-            else None
-        ),
-        prev_url=(
-            url_for("main.pipeline_run_results", run_id=run_id, page=results.prev_num)
-            if results.has_prev
-            else None
-        ),
+        results_table=results_table,
+        total=cached_count(f"pipeline_result:{run_id}", query),
+        export_formats=table_export_formats(),
     )
 
 
-@bp.before_request
-def before_request():
-    if current_user.is_authenticated:
-        current_user.last_seen = datetime.now(timezone.utc)
-        db.session.commit()
-    g.locale = str(get_locale())
+@bp.route("/pipeline_run/<int:run_id>/compare")
+@login_required
+def compare_pipeline_run(run_id):
+    """Show the genes added, removed or changed in another run relative to this one"""
+    run = db.get_or_404(PipelineRun, run_id)
+    other_id = request.args.get("other", type=int)
+    if other_id is None or db.session.get(PipelineRun, other_id) is None:
+        flash(_("Please choose an existing pipeline run to compare with."))
+        return redirect(url_for("main.pipeline_run_results", run_id=run.id))
+    diff = compare_pipeline_runs(
+        run.id, other_id, limit=current_app.config["GENES_PER_PAGE"]
+    )
+    return render_template(
+        "compare_runs.html",
+        title=_("Compare Pipeline Runs"),
+        run=run,
+        other=db.session.get(PipelineRun, other_id),
+        diff=diff,
+    )
+
+
+@bp.route("/pipeline_run/<int:run_id>/export")
+@login_required
+def export_pipeline_run_results(run_id):
+    """Stream every result of a run as a CSV or NDJSON download"""
+    fmt = request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        abort(400)
+    run = db.get_or_404(PipelineRun, run_id)
+    return Response(
+        stream_with_context(
+            stream_pipeline_results(
+                run.id, fmt, current_app.config["EXPORT_BATCH_SIZE"]
+            )
+        ),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f"attachment; filename=pipeline_run_{run.id}.{fmt}"
+        },
+    )
 
 
 @bp.before_app_request
 def before_request():
+    # last_seen is buffered and written in periodic bulk updates, so
+    # recording activity does not cost a write transaction per request
     if current_user.is_authenticated:
-        current_user.last_seen = datetime.now(timezone.utc)
-        db.session.commit()
+        current_app.last_seen_buffer.record(current_user.id)
         g.search_form = SearchForm()
+    current_app.last_seen_buffer.flush_if_due()
     g.locale = str(get_locale())
 
 
-def get_latest_pipeline_run():
-    """Get the most recent pipeline run results"""
-    db_run = db.session.scalar(
-        sa.select(PipelineRun).order_by(PipelineRun.timestamp.desc())
-    )
-
-    frontend_logger.info(
-        _(
-            "Retrieved latest pipeline run from database: %(run_id)s",
-            run_id=db_run.id if db_run else "None",
-        ),
-    )
-
-    project_root = Path(__file__).resolve().parent.parent.parent
-    etl_dir = project_root / "src" / "etl"
-    output_dirs = [d for d in etl_dir.glob("output_*") if d.is_dir()]
-    if not output_dirs:
-        frontend_logger.info(
-            _("No CLI output directories found in %(dir)s"),
-            {"dir": str(etl_dir)},
+def queue_cli_import():
+    """
+    Hand the newest command line run found by the ETL watcher, if any, to an
+    RQ worker for import. Never touches the filesystem itself.
+    """
+    watcher = current_app.etl_watcher
+    watcher.ensure_started()
+    output_dir = watcher.claim_pending()
+    if output_dir is None:
+        return
+    # Only runs newer than the latest loaded one are imported
+    latest_run = get_latest_pipeline_run()
+    if latest_run is not None:
+        latest_timestamp = latest_run.timestamp
+        if latest_timestamp.tzinfo is None:
+            latest_timestamp = latest_timestamp.replace(tzinfo=timezone.utc)
+        cli_timestamp = _parse_timestamp(output_dir).replace(tzinfo=timezone.utc)
+        if cli_timestamp <= latest_timestamp:
+            return
+    if current_user.task_limit_reached("import_cli_results"):
+        # Picked up again on a later request
+        watcher.release(output_dir)
+        return
+    try:
+        current_user.launch_task(
+            "import_cli_results",
+            _("Importing command line pipeline results..."),
+            str(output_dir),
         )
-        return db_run
-
-    latest_dir = sorted(
-        output_dirs,
-        key=lambda d: datetime.strptime(d.name.replace("output_", ""), "%m%d%yT%H%M%S"),
-        reverse=True,
-    )[0]
+        db.session.commit()
+    except RedisError as e:
+        db.session.rollback()
+        watcher.release(output_dir)
+        frontend_logger.error(_("Failed to queue CLI results import: %(e)s", e=str(e)))
+        return
     frontend_logger.info(
-        _("Found latest CLI output directory: %(latest_dir)s"),
-        {"latest_dir": str(latest_dir)},
+        _("Queued import of CLI results from %(dir)s", dir=str(output_dir))
     )
-
-    # Parse CLI timestamp and ensure it's timezone-aware
-    cli_timestamp = datetime.strptime(
-        latest_dir.name.replace("output_", ""), "%m%d%yT%H%M%S"
-    ).replace(tzinfo=timezone.utc)
-
-    if not db_run:
-        db_timestamp = None
-    else:
-        if db_run.timestamp.tzinfo is None:
-            db_timestamp = db_run.timestamp.replace(tzinfo=timezone.utc)
-        else:
-            db_timestamp = db_run.timestamp
-    if not db_timestamp or cli_timestamp > db_timestamp:
-        frontend_logger.info(_("Found more recent CLI results, loading into database"))
-        results_file = latest_dir / "results" / "final_results.csv"
-        if results_file.exists():
-            try:
-                load_pipeline_results_into_db(results_file)
-                run = PipelineRun(
-                    timestamp=cli_timestamp,
-                    output_dir=str(latest_dir),
-                    pipeline_name=_("Gene Annotation Pipeline"),
-                    pipeline_type="CLI",
-                    researcher_id=current_user.id,
-                    status=_("completed"),
-                )
-                db.session.add(run)
-                db.session.commit()
-                frontend_logger.info(_("Successfully loaded CLI results into database"))
-                return run
-            except Exception as e:
-                frontend_logger.error(_("Failed to load CLI results: %(e)s", e=str(e)))
-    else:
-        frontend_logger.info(_("Using more recent run pulled from database."))
-    return db_run
+    flash(_("New command line pipeline results are being imported."))
 
 
-def get_pagination(model, page, order_by=None, per_page_config="GENES_PER_PAGE"):
-    """Generic pagination helper for database models
+def get_pagination(model, cursor, order_by=None, per_page_config="GENES_PER_PAGE"):
+    """Generic keyset pagination helper for database models
 
     Args:
         model: SQLAlchemy model class (Gene or GeneAnnotation)
-        page: Page number to retrieve
-        order_by: Optional column to order by (defaults to created_at desc)
+        cursor: Opaque cursor from a previous page, or None for the first page
+        order_by: Optional sequence of unique sort columns
+                  (defaults to gene_stable_id, id)
         per_page_config: Config key for items per page (defaults to GENES_PER_PAGE)
     """
-    query = sa.select(model)
     if order_by is None:
-        query = query.order_by(model.created_at.desc())
-    else:
-        query = query.order_by(order_by)
-
-    return db.paginate(
+        order_by = (model.gene_stable_id, model.id)
+    query = sa.select(model)
+    resources = keyset_paginate(
         query,
-        page=page,
+        order_by=order_by,
+        cursor=cursor,
         per_page=current_app.config[per_page_config],
-        error_out=False,
     )
+    resources.total = cached_count(model.__tablename__, query)
+    return resources
 
 
-def get_paginated_genes(page):
+def get_paginated_genes(cursor):
     """Get paginated genes"""
-    return get_pagination(Gene, page)
+    return get_pagination(Gene, cursor)
 
 
-def get_paginated_annotations(page):
+def get_paginated_annotations(cursor):
     """Get paginated annotations"""
-    return get_pagination(GeneAnnotation, page)
+    return get_pagination(GeneAnnotation, cursor)
 
 
 @bp.route("/", methods=["GET", "POST"])
@@ -365,6 +411,7 @@ def get_paginated_annotations(page):
 @login_required
 def index():
     """Home page with pipeline controls and datasets"""
+    queue_cli_import()
     latest_run = get_latest_pipeline_run()
     form = EmptyForm()
     return render_template(
@@ -377,6 +424,7 @@ def index():
 
 @bp.route("/explore/genes")
 @login_required
+@conditional_get(lambda: page_validators("gene"))
 def explore_genes():
     """Display paginated gene dataset for exploration.
 
@@ -386,7 +434,8 @@ def explore_genes():
     stable IDs, types, and HGNC identifiers.
 
     URL Parameters:
-        page (int, optional): The page number to display (defaults to 1)
+        cursor (str, optional): Opaque keyset cursor for the page to display
+                                (defaults to the first page)
 
     Returns:
         Rendered HTML template with:
@@ -396,33 +445,46 @@ def explore_genes():
 
     Requires authentication via @login_required decorator.
     """
-    # Check if we need to load gene data
-    gene_count = db.session.scalar(sa.func.count(Gene.id))
-    if gene_count == 0:
-        # No genes in database - load initial data
-        frontend_logger.info(_("No genes found in database."))
+    cursor = request.args.get("cursor")
+    title = _("Explore Genes Dataset")
+
+    def render_genes():
+        genes = get_paginated_genes(cursor)
+        if genes.total == 0:
+            # No genes in database - load initial data
+            frontend_logger.info(_("No genes found in database."))
+        return render_template(
+            "_explore_genes.html",
+            title=title,
+            genes=genes.items,
+            total=genes.total,
+            next_url=(
+                url_for("main.explore_genes", cursor=genes.next_cursor)
+                if genes.has_next
+                else None
+            ),
+            prev_url=(
+                url_for("main.explore_genes", cursor=genes.prev_cursor)
+                if genes.has_prev
+                else None
+            ),
+        )
 
-    page = request.args.get("page", 1, type=int)
-    genes = get_paginated_genes(page)
+    # The page is rendered once per cursor and locale until genes change
+    content = cached_fragment(
+        f"explore_genes:{get_locale()}:{cursor or ''}", ["gene"], render_genes
+    )
     return render_template(
         "explore_genes.html",
-        title=_("Explore Genes Dataset"),
-        genes=genes.items,
-        next_url=(
-            url_for("main.explore_genes", page=genes.next_num)
-            if genes.has_next
-            else None
-        ),
-        prev_url=(
-            url_for("main.explore_genes", page=genes.prev_num)
-            if genes.has_prev
-            else None
-        ),
+        title=title,
+        content=content,
+        export_formats=table_export_formats(),
     )
 
 
 @bp.route("/explore/annotations")
 @login_required
+@conditional_get(lambda: page_validators("gene_annotation"))
 def explore_annotations():
     """Display paginated gene annotations dataset for exploration.
 
@@ -432,7 +494,8 @@ def explore_annotations():
     including Panther, TIGRFam, and Wikigene.
 
     URL Parameters:
-        page (int, optional): The page number to display (defaults to 1)
+        cursor (str, optional): Opaque keyset cursor for the page to display
+                                (defaults to the first page)
 
     Returns:
         Rendered HTML template with:
@@ -442,28 +505,41 @@ def explore_annotations():
 
     Requires authentication via @login_required decorator.
     """
-    # Check if we need to load annotation data
-    annotation_count = db.session.scalar(sa.func.count(GeneAnnotation.id))
+    cursor = request.args.get("cursor")
+    title = _("Explore Gene Annotations Dataset")
+
+    def render_annotations():
+        annotations = get_paginated_annotations(cursor)
+        if annotations.total == 0:
+            # No annotations in database - load initial data
+            frontend_logger.info(_("No annotations found in database"))
+        return render_template(
+            "_explore_annotations.html",
+            title=title,
+            annotations=annotations.items,
+            total=annotations.total,
+            next_url=(
+                url_for("main.explore_annotations", cursor=annotations.next_cursor)
+                if annotations.has_next
+                else None
+            ),
+            prev_url=(
+                url_for("main.explore_annotations", cursor=annotations.prev_cursor)
+                if annotations.has_prev
+                else None
+            ),
+        )
 
-    if annotation_count == 0:
-        # No annotations in database - load initial data
-        frontend_logger.info(_("No annotations found in database"))
-    page = request.args.get("page", 1, type=int)
-    annotations = get_paginated_annotations(page)
+    content = cached_fragment(
+        f"explore_annotations:{get_locale()}:{cursor or ''}",
+        ["gene_annotation"],
+        render_annotations,
+    )
     return render_template(
         "explore_annotations.html",
-        title=_("Explore Gene Annotations Dataset"),
-        annotations=annotations.items,
-        next_url=(
-            url_for("main.explore_annotations", page=annotations.next_num)
-            if annotations.has_next
-            else None
-        ),
-        prev_url=(
-            url_for("main.explore_annotations", page=annotations.prev_num)
-            if annotations.has_prev
-            else None
-        ),
+        title=title,
+        content=content,
+        export_formats=table_export_formats(),
     )
 
 
@@ -582,12 +658,14 @@ def diagnose():
             "parent_dir_writable": os.access(str(data_path.parent), os.W_OK),
         }
 
-        # Database checks
+        # Database checks, served from the count cache
         results["database"] = {
-            "gene_count": db.session.scalar(sa.func.count(Gene.id)),
-            "annotation_count": db.session.scalar(sa.func.count(GeneAnnotation.id)),
-            "researcher_count": db.session.scalar(sa.func.count(Researcher.id)),
-            "post_count": db.session.scalar(sa.func.count(Post.id)),
+            "gene_count": cached_count("gene", sa.select(Gene)),
+            "annotation_count": cached_count(
+                "gene_annotation", sa.select(GeneAnnotation)
+            ),
+            "researcher_count": cached_count("researcher", sa.select(Researcher)),
+            "post_count": cached_count("post", sa.select(Post)),
         }
 
     except Exception as e:
@@ -631,11 +709,11 @@ def researcher(researcher_name):
     )
     page = request.args.get("page", 1, type=int)
     posts_query = researcher.posts.select().order_by(Post.timestamp.desc())
-    posts = db.paginate(
+    posts = paginate_with_cached_count(
         posts_query,
+        f"posts:{researcher.id}",
         page=page,
         per_page=current_app.config["POSTS_PER_PAGE"],
-        error_out=False,
     )
     posts_next_url = (
         url_for(
@@ -660,11 +738,11 @@ def researcher(researcher_name):
         .where(PipelineRun.researcher_id == researcher.id)
         .order_by(PipelineRun.timestamp.desc())
     )
-    runs = db.paginate(
+    runs = paginate_with_cached_count(
         runs_query,
+        f"runs:{researcher.id}",
         page=page,
         per_page=current_app.config["RUNS_PER_PAGE"],
-        error_out=False,
     )
     next_url = (
         url_for(
@@ -752,6 +830,9 @@ def follow(researcher_name):
             return redirect(url_for("main.researcher", researcher_name=researcher_name))
         current_user.follow(researcher)
         db.session.commit()
+        follows_changed(current_user.id, researcher.id)
+        timeline.followed(current_user.id, researcher.id)
+        invalidate_json(current_user.following_activity_key())
         flash(
             _(
                 "You are following %(researcher_name)s!",
@@ -800,6 +881,9 @@ def unfollow(researcher_name):
             return redirect(url_for("main.researcher", researcher_name=researcher_name))
         current_user.unfollow(researcher)
         db.session.commit()
+        follows_changed(current_user.id)
+        timeline.unfollowed(current_user.id, researcher.id)
+        invalidate_json(current_user.following_activity_key())
         flash(
             _(
                 "You are not following %(researcher_name)s",
@@ -850,6 +934,8 @@ def send_message(recipient):
     if form.validate_on_submit():
         msg = Message(author=current_user, recipient=researcher, body=form.message.data)
         db.session.add(msg)
+        # Flush so the recipient's unread counter includes this message
+        db.session.flush()
         researcher.add_notification(
             "unread_message_count", researcher.unread_messages_count()
         )
@@ -869,8 +955,11 @@ def messages():
     db.session.commit()
     page = request.args.get("page", 1, type=int)
     query = current_user.messages_received.select().order_by(Message.timestamp.desc())
-    messages = db.paginate(
-        query, page=page, per_page=current_app.config["POSTS_PER_PAGE"], error_out=False
+    messages = paginate_with_cached_count(
+        query,
+        f"messages:{current_user.id}",
+        page=page,
+        per_page=current_app.config["POSTS_PER_PAGE"],
     )
     next_url = (
         url_for("main.messages", page=messages.next_num) if messages.has_next else None
@@ -907,6 +996,48 @@ def notifications():
     ]
 
 
+@bp.route("/notifications/stream")
+@login_required
+def notification_stream():
+    """
+    Stream the researcher's notifications as server-sent events. Like
+    /notifications, the 'since' option or the Last-Event-ID header gives the
+    timestamp of the last notification the client has. Without Redis, or
+    when this process already serves notification_stream_limit() streams, responds
+    with 204 No Content, which tells the browser to stop reconnecting and fall
+    back to polling /notifications.
+    :returns response: the event stream
+    """
+    redis = get_redis()
+    if redis is None:
+        return "", 204
+    streams = current_app.notification_streams
+    if not streams.acquire(blocking=False):
+        return "", 204
+    since = request.headers.get("Last-Event-ID", type=float) or request.args.get(
+        "since", 0.0, type=float
+    )
+    researcher_id = current_user.id
+    # Streams are long-lived; give back the database connection loading the
+    # researcher took rather than hold it for the life of the stream
+    db.session.close()
+    events = notification_events(
+        redis,
+        researcher_id,
+        since,
+        current_app.config["NOTIFICATION_HEARTBEAT"],
+        current_app.config["NOTIFICATION_STREAM_DURATION"],
+    )
+    response = Response(
+        stream_with_context(events),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+    # Called by the WSGI server once the stream ends or the client goes away
+    response.call_on_close(streams.release)
+    return response
+
+
 @bp.route("/search")
 @login_required
 def search():
@@ -950,9 +1081,55 @@ def researcher_popup(researcher_name):
 def export_posts():
     if current_user.get_task_in_progress("export_posts"):
         flash(_("An export task is currently in progress"))
+    elif current_user.task_limit_reached("export_posts"):
+        flash(_("Please wait for your running exports to finish."))
     else:
         current_user.launch_task("export_posts", _("Exporting posts..."))
-        db.session.commmit()
+        db.session.commit()
     return redirect(
         url_for("main.researcher", researcher_name=current_user.researcher_name)
     )
+
+
+@bp.route("/export/<table>")
+@login_required
+def export_table(table):
+    """
+    Start a background export of the gene or gene_annotation table, or of a
+    run's pipeline results when the run_id option is given. The file can be
+    downloaded from the researcher's profile page once the export finishes.
+    """
+    fmt = request.args.get("format", "csv")
+    run_id = request.args.get("run_id", type=int)
+    if (
+        table not in TABLE_EXPORTS
+        or fmt not in table_export_formats()
+        or (table == "pipeline_result") != (run_id is not None)
+    ):
+        abort(400)
+    if run_id is not None:
+        db.get_or_404(PipelineRun, run_id)
+    if current_user.task_limit_reached("export_table"):
+        flash(_("Please wait for your running exports to finish."))
+    else:
+        current_user.launch_task(
+            "export_table", _("Exporting %(table)s...", table=table), table, fmt, run_id
+        )
+        db.session.commit()
+        flash(_("Your export will be listed on your profile page when it is ready."))
+    return redirect(
+        url_for("main.researcher", researcher_name=current_user.researcher_name)
+    )
+
+
+@bp.route("/exports/<task_id>")
+@login_required
+def download_export(task_id):
+    """Download the file of one of the researcher's finished exports"""
+    task = db.session.get(Task, task_id)
+    if task is None or task.researcher_id != current_user.id or not task.artifact:
+        abort(404)
+    path = export_path(task.artifact)
+    if not path.is_file():
+        abort(404)
+    return send_file(path, as_attachment=True, download_name=task.artifact)
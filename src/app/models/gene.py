@@ -14,7 +14,7 @@ class Gene(db.Model):
     gene_type: so.Mapped[str] = so.mapped_column(sa.String(50), nullable=True)
     gene_name: so.Mapped[str] = so.mapped_column(sa.String(100), nullable=True)
     hgnc_name: so.Mapped[str] = so.mapped_column(sa.String(100), nullable=True)
-    hgnc_id: so.Mapped[str] = so.mapped_column(sa.String(50), nullable=True)
+    hgnc_id: so.Mapped[str] = so.mapped_column(sa.String(50), nullable=True, index=True)
 
     # Optionally store the “hgnc_id_exists” flag in the DB:
     hgnc_id_exists: so.Mapped[bool] = so.mapped_column(default=False)
@@ -25,6 +25,19 @@ class Gene(db.Model):
         default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    def count_keys(self):
+        return ["gene"]
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "gene_stable_id": self.gene_stable_id,
+            "gene_type": self.gene_type,
+            "gene_name": self.gene_name,
+            "hgnc_name": self.hgnc_name,
+            "hgnc_id": self.hgnc_id,
+        }
+
     def __repr__(self):
         return f"<Gene {self.gene_stable_id}>"
 
@@ -36,7 +49,7 @@ class GeneAnnotation(db.Model):
 
     # Columns that map to the TSV
     gene_stable_id: so.Mapped[str] = so.mapped_column(sa.String(50), index=True)
-    hgnc_id: so.Mapped[str] = so.mapped_column(sa.String(50), nullable=True)
+    hgnc_id: so.Mapped[str] = so.mapped_column(sa.String(50), nullable=True, index=True)
     panther_id: so.Mapped[str] = so.mapped_column(sa.String(100), nullable=True)
     tigrfam_id: so.Mapped[str] = so.mapped_column(sa.String(100), nullable=True)
     wikigene_name: so.Mapped[str] = so.mapped_column(sa.String(100), nullable=True)
@@ -50,5 +63,20 @@ class GeneAnnotation(db.Model):
         default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    def count_keys(self):
+        return ["gene_annotation"]
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "gene_stable_id": self.gene_stable_id,
+            "hgnc_id": self.hgnc_id,
+            "panther_id": self.panther_id,
+            "tigrfam_id": self.tigrfam_id,
+            "wikigene_name": self.wikigene_name,
+            "gene_description": self.gene_description,
+            "pid_suffix": self.pid_suffix,
+        }
+
     def __repr__(self):
         return f"<GeneAnnotation {self.id}>"
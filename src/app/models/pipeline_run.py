@@ -1,3 +1,5 @@
+import hashlib
+import json
 from datetime import datetime, timezone
 from typing import Optional
 import sqlalchemy as sa
@@ -37,6 +39,15 @@ class PipelineRun(db.Model):
     results: so.Mapped[list["PipelineResult"]] = so.relationship(
         "PipelineResult", back_populates="run", cascade="all, delete-orphan"
     )
+    summary: so.Mapped[Optional["PipelineRunSummary"]] = so.relationship(
+        "PipelineRunSummary", back_populates="run", cascade="all, delete-orphan"
+    )
+
+    def count_keys(self):
+        return [f"runs:{self.researcher_id}"]
+
+    def latest_keys(self):
+        return ["pipeline_run"]
 
     @property
     def formatted_timestamp(self):
@@ -46,6 +57,40 @@ class PipelineRun(db.Model):
         return f"<PipelineRun {self.timestamp} {self.output_dir}>"
 
 
+# Columns whose values make up PipelineResult.row_hash
+ROW_HASH_COLUMNS = (
+    "gene_type",
+    "gene_name",
+    "hgnc_name",
+    "hgnc_id",
+    "panther_id",
+    "tigrfam_id",
+    "wikigene_name",
+    "gene_description",
+    "pid_suffix",
+)
+
+
+def compute_row_hash(values):
+    """
+    Hash a result row's values so rows can be compared across runs with a
+    single indexed equality test. None and "" hash the same, since results
+    loaded from CSV store missing values as "".
+
+    :params   values: mapping of column name to value for ROW_HASH_COLUMNS
+    :returns    hash: 32 character hex digest
+    """
+    joined = "\x1f".join(
+        "" if values.get(name) is None else str(values.get(name))
+        for name in ROW_HASH_COLUMNS
+    )
+    return hashlib.md5(joined.encode("utf-8")).hexdigest()
+
+
+def _row_hash_default(context):
+    return compute_row_hash(context.get_current_parameters())
+
+
 class PipelineResult(db.Model):
     """Model representing results from a pipeline run"""
 
@@ -65,7 +110,91 @@ class PipelineResult(db.Model):
     wikigene_name: so.Mapped[Optional[str]] = so.mapped_column(sa.String(256))
     gene_description: so.Mapped[Optional[str]] = so.mapped_column(sa.String(1024))
     pid_suffix: so.Mapped[Optional[str]] = so.mapped_column(sa.String(64))
+    # Filled in on insert; nullable only for rows loaded before it existed
+    row_hash: so.Mapped[Optional[str]] = so.mapped_column(
+        sa.String(32), default=_row_hash_default
+    )
 
     run: so.Mapped["PipelineRun"] = so.relationship(
         "PipelineRun", back_populates="results"
     )
+
+    def count_keys(self):
+        return [f"pipeline_result:{self.run_id}"]
+
+
+class PipelineRunSummary(db.Model):
+    """
+    Aggregate statistics for a pipeline run, computed once when the run is
+    loaded so that result pages, the API and dashboards never scan the run's
+    PipelineResult rows.
+    """
+
+    __tablename__ = "pipeline_run_summary"
+    id: so.Mapped[int] = so.mapped_column(primary_key=True)
+    run_id: so.Mapped[int] = so.mapped_column(
+        sa.ForeignKey("pipeline_run.id"), index=True, unique=True
+    )
+    result_count: so.Mapped[int] = so.mapped_column(default=0)
+    hgnc_id_count: so.Mapped[int] = so.mapped_column(default=0)
+    pid_suffix_count: so.Mapped[int] = so.mapped_column(default=0)
+    excluded_tigrfam_count: so.Mapped[Optional[int]]
+    gene_type_counts_json: so.Mapped[str] = so.mapped_column(sa.Text, default="{}")
+    computed_at: so.Mapped[datetime] = so.mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
+
+    run: so.Mapped["PipelineRun"] = so.relationship(
+        "PipelineRun", back_populates="summary"
+    )
+
+    @classmethod
+    def from_summary(cls, summary):
+        """
+        Build a summary row from the dict produced by summarize_results
+        """
+        return cls(
+            result_count=summary["result_count"],
+            hgnc_id_count=summary["hgnc_id_count"],
+            pid_suffix_count=summary["pid_suffix_count"],
+            excluded_tigrfam_count=summary["excluded_tigrfam_count"],
+            gene_type_counts_json=json.dumps(summary["gene_type_counts"]),
+        )
+
+    @property
+    def gene_type_counts(self):
+        return json.loads(self.gene_type_counts_json or "{}")
+
+    @property
+    def hgnc_coverage(self):
+        """Fraction of result rows that carry an HGNC id"""
+        return self.hgnc_id_count / self.result_count if self.result_count else 0.0
+
+    def to_dict(self):
+        return {
+            "run_id": self.run_id,
+            "result_count": self.result_count,
+            "hgnc_id_count": self.hgnc_id_count,
+            "hgnc_coverage": self.hgnc_coverage,
+            "pid_suffix_count": self.pid_suffix_count,
+            "excluded_tigrfam_count": self.excluded_tigrfam_count,
+            "gene_type_counts": self.gene_type_counts,
+            "computed_at": self.computed_at.replace(tzinfo=timezone.utc).isoformat(),
+        }
+
+
+# Serves per-run keyset pagination ordered by (gene_stable_id, id)
+sa.Index(
+    "ix_pipeline_result_run_gene_stable_id",
+    PipelineResult.run_id,
+    PipelineResult.gene_stable_id,
+    PipelineResult.id,
+)
+
+# Serves run comparison: gene lookups and row matches within a run
+sa.Index(
+    "ix_pipeline_result_run_gene_row_hash",
+    PipelineResult.run_id,
+    PipelineResult.gene_stable_id,
+    PipelineResult.row_hash,
+)
@@ -1,3 +1,6 @@
+import csv
+import io
+import json
 from datetime import datetime, timezone
 import pandas as pd
 import typer
@@ -6,18 +9,28 @@ from flask_babel import _
 from flask import render_template, flash, redirect, url_for, request
 from flask_login import current_user
 import sqlalchemy as sa
+import sqlalchemy.orm as so
 from pathlib import Path
 from src.app import db
-from src.app.models.pipeline_run import PipelineRun, PipelineResult
+from src.app.cache import cached_latest_id
+from src.app.models.pipeline_run import (
+    PipelineRun,
+    PipelineResult,
+    PipelineRunSummary,
+    ROW_HASH_COLUMNS,
+)
 from src.app.models.gene import Gene, GeneAnnotation
 from src.utils.pipeline_utils import (
     pipeline_logger,
     _parse_timestamp,
     GeneReader,
     validate_outputdir,
+    summarize_results,
 )
 from src.utils.references import (
     final_results_file_name,
+    gene_type_count_out_file,
+    excluded_tigrfam_file_name,
     gene_stable_id_col,
     gene_type_col,
     hgnc_id_col,
@@ -25,13 +38,211 @@ from src.utils.references import (
     panther_id_col,
     tigrfam_id_col,
     pid_suffix_col,
+    ui_run_marker_file_name,
+)
+
+
+EXPORT_COLUMNS = (
+    "gene_stable_id",
+    "gene_type",
+    "gene_name",
+    "hgnc_name",
+    "hgnc_id",
+    "panther_id",
+    "tigrfam_id",
+    "wikigene_name",
+    "gene_description",
+    "pid_suffix",
 )
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _iter_result_batches(run_id: int, batch_size: int):
+    """
+    Yield a run's results as lists of plain rows, batch_size rows at a time.
+    yield_per streams the rows from a server-side cursor where the driver
+    supports one, so memory stays flat however large the run is.
+    """
+    columns = [getattr(PipelineResult, name) for name in EXPORT_COLUMNS]
+    query = (
+        sa.select(*columns)
+        .where(PipelineResult.run_id == run_id)
+        .order_by(PipelineResult.gene_stable_id, PipelineResult.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.session.execute(query).partitions():
+        yield partition
+
+
+def stream_pipeline_results(run_id: int, fmt: str = "csv", batch_size: int = 1000):
+    """
+    Generate a pipeline run's results as CSV or NDJSON text chunks, one chunk
+    per database batch, for use as a streamed response body.
+
+    :params     run_id: id of the PipelineRun to export
+    :params        fmt: "csv" or "ndjson"
+    :params batch_size: rows fetched from the database per round trip
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+        for batch in _iter_result_batches(run_id, batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue()
+    else:
+        for batch in _iter_result_batches(run_id, batch_size):
+            yield "".join(
+                json.dumps(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in batch
+            )
+
 
+DIFF_CATEGORIES = ("added", "removed", "changed")
 
-def load_pipeline_results_into_db(final_csv_path: Path) -> None:
+
+def _genes_only_in(run_id: int, other_run_id: int):
+    """Distinct gene_stable_ids present in run_id and absent from other_run_id"""
+    mine, theirs = so.aliased(PipelineResult), so.aliased(PipelineResult)
+    return (
+        sa.select(mine.gene_stable_id)
+        .where(mine.run_id == run_id)
+        .where(
+            ~sa.exists().where(
+                theirs.run_id == other_run_id,
+                theirs.gene_stable_id == mine.gene_stable_id,
+            )
+        )
+        .distinct()
+    )
+
+
+def _same_values(mine, theirs):
+    """
+    Condition matching two result rows with the same values: by row_hash, or
+    column by column when either row was loaded before row_hash existed
+    """
+    columns_match = sa.and_(
+        *(
+            sa.func.coalesce(getattr(theirs, name), "")
+            == sa.func.coalesce(getattr(mine, name), "")
+            for name in ROW_HASH_COLUMNS
+        )
+    )
+    return sa.or_(
+        theirs.row_hash == mine.row_hash,
+        sa.and_(
+            sa.or_(theirs.row_hash.is_(None), mine.row_hash.is_(None)), columns_match
+        ),
+    )
+
+
+def _genes_with_unmatched_rows(run_id: int, other_run_id: int):
+    """
+    Distinct gene_stable_ids present in both runs where some row of run_id has
+    no row with the same values for that gene in other_run_id
+    """
+    mine, theirs = so.aliased(PipelineResult), so.aliased(PipelineResult)
+    same_gene = [
+        theirs.run_id == other_run_id,
+        theirs.gene_stable_id == mine.gene_stable_id,
+    ]
+    return (
+        sa.select(mine.gene_stable_id)
+        .where(mine.run_id == run_id)
+        .where(sa.exists().where(*same_gene))
+        .where(~sa.exists().where(*same_gene, _same_values(mine, theirs)))
+        .distinct()
+    )
+
+
+def pipeline_run_diff_queries(base_run_id: int, other_run_id: int) -> dict:
+    """
+    Build the set queries that compare two runs gene by gene. Every query is
+    an anti- or semi-join on (run_id, gene_stable_id, row_hash), answered from
+    the ix_pipeline_result_run_gene_row_hash index, so no rows are loaded
+    into Python to compute the difference. Rows without a row_hash, loaded
+    before it existed, are compared column by column until `flask
+    hash-results` fills them in.
+
+    :params  base_run_id: the run being compared from
+    :params other_run_id: the run being compared to
+    :returns        dict: "added", "removed" and "changed" selects of gene_stable_id
+    """
+    changed = sa.union(
+        _genes_with_unmatched_rows(other_run_id, base_run_id),
+        _genes_with_unmatched_rows(base_run_id, other_run_id),
+    )
+    return {
+        "added": _genes_only_in(other_run_id, base_run_id),
+        "removed": _genes_only_in(base_run_id, other_run_id),
+        "changed": sa.select(changed.subquery().c.gene_stable_id),
+    }
+
+
+def compare_pipeline_runs(base_run_id: int, other_run_id: int, limit: int = 100):
+    """
+    Compare two pipeline runs.
+
+    :params  base_run_id: the run being compared from
+    :params other_run_id: the run being compared to
+    :params        limit: maximum gene_stable_ids listed per category
+    :returns        dict: for each category, its count and the first limit
+                          gene_stable_ids in order
+    """
+    diff = {"base_run_id": base_run_id, "other_run_id": other_run_id}
+    for category, query in pipeline_run_diff_queries(base_run_id, other_run_id).items():
+        subquery = query.subquery()
+        diff[category] = {
+            "count": db.session.scalar(
+                sa.select(sa.func.count()).select_from(subquery)
+            ),
+            "gene_stable_ids": list(
+                db.session.scalars(
+                    sa.select(subquery.c.gene_stable_id)
+                    .order_by(subquery.c.gene_stable_id)
+                    .limit(limit)
+                )
+            ),
+        }
+    return diff
+
+
+def summarize_results_dir(final_results: pd.DataFrame, results_dir: Path) -> dict:
+    """
+    Summarize a run from the files a CLI run leaves in its results directory.
+    gene_type_count.csv and excluded_tigrfam_ids.csv are used when present.
+    """
+    gene_type_counts = None
+    excluded_tigrfam_count = None
+    if (results_dir / gene_type_count_out_file).exists():
+        gene_type_counts = pd.read_csv(results_dir / gene_type_count_out_file)
+    if (results_dir / excluded_tigrfam_file_name).exists():
+        excluded_tigrfam_count = len(
+            pd.read_csv(results_dir / excluded_tigrfam_file_name)
+        )
+    return summarize_results(final_results, gene_type_counts, excluded_tigrfam_count)
+
+
+def load_pipeline_results_into_db(
+    final_csv_path: Path,
+    summary: dict = None,
+    researcher_id: int = None,
+    pipeline_type: str = "UI",
+) -> None:
     """
     Load final results CSV produced by the pipeline into the database
     Returns the created PipelineRun object
+
+    :params final_csv_path: path to final_results.csv
+    :params        summary: run summary from GeneReader.summarize(); computed
+                            from the results directory when not given
+    :params  researcher_id: owner of the run; defaults to the logged in researcher
+    :params  pipeline_type: "UI" for runs started from the web app, "CLI" for imports
     """
     # Get the output directory containing the results
     output_dir = final_csv_path.parent.parent
@@ -46,8 +257,8 @@ def load_pipeline_results_into_db(final_csv_path: Path) -> None:
             final_csv_path.parent.parent
         ),  # The output directory containing results
         pipeline_name=_("Gene Annotation Pipeline"),
-        pipeline_type="UI",
-        researcher_id=current_user.id,
+        pipeline_type=pipeline_type,
+        researcher_id=researcher_id if researcher_id is not None else current_user.id,
         status="complete",
     )
 
@@ -57,6 +268,9 @@ def load_pipeline_results_into_db(final_csv_path: Path) -> None:
 
     df = pd.read_csv(final_csv_path)
     df = df.fillna("")
+    if summary is None:
+        summary = summarize_results_dir(df, final_csv_path.parent)
+    run.summary = PipelineRunSummary.from_summary(summary)
 
     # Create PipelineResult records linked to this run
     for unused_index, row in df.iterrows():
@@ -84,6 +298,8 @@ def process_pipeline_run(output_dir: Path = None) -> None:
     if output_dir is None:
         mock_ctx = MagicMock(spec=typer.Context)
         output_dir = validate_outputdir(mock_ctx, None)
+        # Keeps the ETL watcher from importing this run as a CLI run
+        (output_dir.parent / ui_run_marker_file_name).touch()
         gene_reader = GeneReader()
     else:
         gene_reader = GeneReader(input_dir=output_dir)
@@ -103,8 +319,44 @@ def process_pipeline_run(output_dir: Path = None) -> None:
         results_dir.mkdir(exist_ok=True)
         gene_reader.write_gene_and_annotations_final(results_dir)
         results_file = results_dir / final_results_file_name
-        run = load_pipeline_results_into_db(results_file)
+        run = load_pipeline_results_into_db(results_file, gene_reader.summarize())
         return run
     except Exception as e:
         pipeline_logger.error(f"Pipeline error: {e}")
         raise
+
+
+def get_latest_pipeline_run():
+    """
+    Return the most recent PipelineRun, or None. The id is cached and dropped
+    whenever a run is added or deleted, so this costs one primary key lookup.
+    """
+    run_id = cached_latest_id(
+        "pipeline_run",
+        sa.select(PipelineRun.id).order_by(
+            PipelineRun.timestamp.desc(), PipelineRun.id.desc()
+        ),
+    )
+    return db.session.get(PipelineRun, run_id) if run_id is not None else None
+
+
+def import_cli_output(output_dir: Path, researcher_id: int):
+    """
+    Load the results of a command line run into the database unless that
+    output directory was loaded already. Safe to call more than once for the
+    same directory, as several web processes may each discover it.
+
+    :params    output_dir: the output_<timestamp> directory written by the CLI
+    :params researcher_id: researcher the imported run is attributed to
+    :returns          run: the new or previously loaded PipelineRun
+    """
+    run = db.session.scalar(
+        sa.select(PipelineRun).where(PipelineRun.output_dir == str(output_dir))
+    )
+    if run is not None:
+        return run
+    return load_pipeline_results_into_db(
+        output_dir / "results" / final_results_file_name,
+        researcher_id=researcher_id,
+        pipeline_type="CLI",
+    )
@@ -17,6 +17,11 @@ import sqlalchemy.orm as so
 from src.app import db, login
 from src.app.models.pipeline_run import PipelineRun
 from src.app.models.searchable import SearchableMixin, PaginatedAPIMixin
+from src.app.cache import cached_json, get_task_progress, set_task_progress
+from src.app.counters import adjust_counters
+from src.app.notifications import publish_notification
+from src.app.task_queues import enqueue_task, task_queue_name, queue_task_names
+from src.app.token_cache import invalidate_on_commit
 
 followers = sa.Table(
     "followers",
@@ -55,6 +60,16 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
         - Many-to-many with Researcher (self-referential for following/followers)
     """
 
+    __api_fields__ = {
+        "id": "id",
+        "researcher_name": "researcher_name",
+        "last_seen": "last_seen",
+        "about_me": "about_me",
+        "post_count": "posts_counter",
+        "follower_count": "followers_counter",
+        "following_count": "following_counter",
+    }
+
     id: so.Mapped[int] = so.mapped_column(primary_key=True)
     researcher_name: so.Mapped[str] = so.mapped_column(
         sa.String(64), index=True, unique=True
@@ -89,6 +104,14 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
 
     token_expiration: so.Mapped[Optional[datetime]]
 
+    # Denormalized counts, maintained by src.app.counters
+    followers_counter: so.Mapped[int] = so.mapped_column(default=0, server_default="0")
+    following_counter: so.Mapped[int] = so.mapped_column(default=0, server_default="0")
+    posts_counter: so.Mapped[int] = so.mapped_column(default=0, server_default="0")
+    unread_messages_counter: so.Mapped[int] = so.mapped_column(
+        default=0, server_default="0"
+    )
+
     def set_password(self, password: str) -> None:
         self.password_hash = generate_password_hash(password)
 
@@ -109,26 +132,26 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
     def follow(self, researcher):
         if not self.is_following(researcher):
             self.following.add(researcher)
+            self._adjust_follow_counters(researcher, 1)
 
     def unfollow(self, researcher):
         if self.is_following(researcher):
             self.following.remove(researcher)
+            self._adjust_follow_counters(researcher, -1)
+
+    def _adjust_follow_counters(self, researcher, delta):
+        adjust_counters(db.session, "following_counter", {self.id: delta})
+        adjust_counters(db.session, "followers_counter", {researcher.id: delta})
 
     def is_following(self, researcher):
         query = self.following.select().where(Researcher.id == researcher.id)
         return db.session.scalar(query) is not None
 
     def followers_count(self):
-        query = sa.select(sa.func.count()).select_from(
-            self.followers.select().subquery()
-        )
-        return db.session.scalar(query)
+        return self.followers_counter or 0
 
     def following_count(self):
-        query = sa.select(sa.func.count()).select_from(
-            self.following.select().subquery()
-        )
-        return db.session.scalar(query)
+        return self.following_counter or 0
 
     def check_password(self, password: str) -> bool:
         return check_password_hash(self.password_hash, password)
@@ -144,6 +167,8 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
         """
         Helper method to add researcher's notification to database and ensure
         that if a notification with same name already exists, it is removed first.
+        The notification is published to the researcher's notification stream
+        when the session commits.
 
         :params name: the name for this notification
         :params data: the notification data
@@ -151,13 +176,16 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
 
         """
         db.session.execute(self.notifications.delete().where(Notification.name == name))
-        n = Notification(name=name, payload_json=json.dumps(data), researcher=self)
+        n = Notification(
+            name=name, payload_json=json.dumps(data), timestamp=time(), researcher=self
+        )
         db.session.add(n)
+        publish_notification(db.session, self.id, name, data, n.timestamp)
         return n
 
     def launch_task(self, name, description, *args, **kwargs):
         """
-        Submits tasks to the RQ queue and adds it to the database. Note that this
+        Submits tasks to their RQ queue and adds it to the database. Note that this
         function adds new task object to the database session but it does not issue
         a commit. It is best to operate on the database session in the higher level
         functions, as that allows you to combine several updates made by lower level
@@ -168,13 +196,14 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
             description: helpful description of the task that can be presented to researchers
             *args and **kwargs: positional and keyword args that can be passed to the task
         """
-        rq_job = current_app.task_queue.enqueue(
-            f"src.app.tasks.{name}", self.id, *args, **kwargs
-        )
+        rq_job = enqueue_task(name, self.id, *args, **kwargs)
         task = Task(
             id=rq_job.get_id(), name=name, description=description, researcher=self
         )
         db.session.add(task)
+        # Recorded before the worker can report, so that queued tasks are
+        # read from the progress hash rather than fetched from RQ one by one
+        set_task_progress(self.id, task.id, 0)
         return task
 
     def get_tasks_in_progress(self):
@@ -184,6 +213,40 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
         query = self.tasks.select().where(Task.complete == False)
         return db.session.scalars(query)
 
+    def task_limit_reached(self, name):
+        """
+        Whether the researcher already has as many unfinished tasks on the
+        queue of task name as TASK_RESEARCHER_LIMITS allows
+
+        Attributes:
+            name: task name
+        """
+        queue_name = task_queue_name(name)
+        limit = current_app.config["TASK_RESEARCHER_LIMITS"].get(queue_name)
+        if limit is None:
+            return False
+        query = self.tasks.select().where(
+            Task.complete == False, queue_task_names(queue_name, Task.name)
+        )
+        unfinished = db.session.scalar(
+            sa.select(sa.func.count()).select_from(query.subquery())
+        )
+        return unfinished >= limit
+
+    def get_tasks_progress(self, tasks):
+        """
+        Get the progress of several tasks with a single Redis lookup
+
+        Attributes:
+            tasks: the researcher's tasks
+        Returns:
+            dict: task id -> progress percentage
+        """
+        recorded = get_task_progress(
+            self.id, [task.id for task in tasks if not task.complete]
+        )
+        return {task.id: task.get_progress(recorded) for task in tasks}
+
     def get_task_in_progress(self, name):
         """
         Get completed tasks by name
@@ -192,6 +255,17 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
             name: task name
         """
         query = self.tasks.select().where(Task.name == name, Task.complete == False)
+        return db.session.scalar(query)
+
+    def get_exports(self):
+        """
+        Get completed export tasks whose files can be downloaded, newest first
+        """
+        query = (
+            self.tasks.select()
+            .where(Task.complete == True, Task.artifact.is_not(None))
+            .order_by(Task.timestamp.desc())
+        )
         return db.session.scalars(query)
 
     @staticmethod
@@ -204,6 +278,9 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
             return
         return db.session.get(Researcher, id)
 
+    def count_keys(self):
+        return ["researcher"]
+
     def __repr__(self) -> str:
         return f"<User {self.researcher_name}>"
 
@@ -214,36 +291,68 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
     def following_pipeline_runs(self):
         """
         Returns a list of (researcher_id, researcher_name, total pipeline runs, names of pipelines that were run)
-        for each researcher that self is following, for pipelines run in the last 3 months.
+        for each researcher that self is following, for pipelines run in the last 3 months,
+        most active first.
+
+        A single GROUP BY over (researcher, pipeline_name) yields both the totals and the
+        pipeline names, so the cost does not grow with one query per followed researcher.
         """
         three_months_ago = datetime.now(timezone.utc) - relativedelta(months=3)
-        base_query = (
+        query = (
             sa.select(
                 Researcher.id,
                 Researcher.researcher_name,
-                sa.func.count(PipelineRun.id).label("total_runs"),
+                PipelineRun.pipeline_name,
+                sa.func.count(PipelineRun.id),
             )
-            .join(followers, followers.c.follower_id == Researcher.id)
+            .join(followers, followers.c.followed_id == Researcher.id)
             .join(PipelineRun, PipelineRun.researcher_id == Researcher.id)
             .where(followers.c.follower_id == self.id)
             .where(PipelineRun.timestamp >= three_months_ago)
-            .group_by(Researcher.id, Researcher.researcher_name)
-            .order_by(sa.desc("total_runs"))
+            .group_by(
+                Researcher.id, Researcher.researcher_name, PipelineRun.pipeline_name
+            )
+            .order_by(Researcher.id, PipelineRun.pipeline_name)
         )
 
-        results = []
-        for researcher_id, researcher_name, total_runs in db.session.execute(
-            base_query
-        ).all():
-            pipeline_names_query = (
-                sa.select(sa.func.group_concat(sa.distinct(PipelineRun.pipeline_name)))
-                .where(PipelineRun.researcher_id == researcher_id)
-                .where(PipelineRun.timestamp >= three_months_ago)
+        activity = {}
+        for researcher_id, researcher_name, pipeline_name, runs in db.session.execute(
+            query
+        ):
+            entry = activity.setdefault(
+                researcher_id, [researcher_id, researcher_name, 0, []]
             )
-            pipeline_names = db.session.scalar(pipeline_names_query)
-            pipeline_names = pipeline_names.split(",") if pipeline_names else []
-            results.append((researcher_id, researcher_name, total_runs, pipeline_names))
-        return results
+            entry[2] += runs
+            entry[3].append(pipeline_name)
+        return sorted(
+            (tuple(entry) for entry in activity.values()),
+            key=lambda entry: (-entry[2], entry[1]),
+        )
+
+    def following_activity(self):
+        """
+        following_pipeline_runs() as dictionaries, cached for
+        ACTIVITY_CACHE_TIMEOUT seconds and dropped when self follows or
+        unfollows someone
+        """
+        return cached_json(
+            self.following_activity_key(),
+            lambda: [
+                {
+                    "id": researcher_id,
+                    "researcher_name": researcher_name,
+                    "total_runs": total_runs,
+                    "pipelines": pipelines,
+                }
+                for researcher_id, researcher_name, total_runs, pipelines in (
+                    self.following_pipeline_runs()
+                )
+            ],
+            current_app.config["ACTIVITY_CACHE_TIMEOUT"],
+        )
+
+    def following_activity_key(self):
+        return f"following_activity:{self.id}"
 
     def following_posts(self):
         Author = so.aliased(Researcher)
@@ -263,17 +372,10 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
         )
 
     def unread_messages_count(self):
-        last_read_time = self.last_message_read_time or datetime(1900, 1, 1)
-        query = sa.select(Message).where(
-            Message.recipient == self, Message.timestamp > last_read_time
-        )
-        return db.session.scalar(
-            sa.select(sa.func.count()).select_from(query.subquery())
-        )
+        return self.unread_messages_counter or 0
 
     def posts_count(self):
-        query = sa.select(sa.func.count()).select_from(self.posts.select().subquery())
-        return db.session.scalar(query)
+        return self.posts_counter or 0
 
     def to_dict(self, include_email=False):
         """
@@ -322,9 +424,9 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
             "follower_count": self.followers_count(),
             "following_count": self.following_count(),
             "_links": {
-                "self": url_for("src.api.get_researcher", id=self.id),
-                "followers": url_for("src.api.get_followers", id=self.id),
-                "following": url_for("src.api.get_following", id=self.id),
+                "self": url_for("api.get_researcher", id=self.id),
+                "followers": url_for("api.get_followers", id=self.id),
+                "following": url_for("api.get_following", id=self.id),
                 "avatar": self.avatar(128),
             },
         }
@@ -400,13 +502,17 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
             tzinfo=timezone.utc
         ) > now + timedelta(seconds=60):
             return self.token
+        if self.token:
+            invalidate_on_commit(db.session, self.token)
         self.token = secrets.token_hex(16)
         self.token_expiration = now + timedelta(seconds=expires_in)
         db.session.add(self)
         return self.token
 
     def revoke_token(self):
-        self.token_expiration == datetime.now(timezone.utc) - timedelta(seconds=1)
+        self.token_expiration = datetime.now(timezone.utc) - timedelta(seconds=1)
+        if self.token:
+            invalidate_on_commit(db.session, self.token)
 
     @staticmethod
     def check_token(token):
@@ -421,16 +527,29 @@ class Researcher(PaginatedAPIMixin, UserMixin, db.Model):
             The token is considered invalid if:
             - No researcher is found with the given token
             - The token has expired (token_expiration < current UTC time)
+            Only the token -> (researcher id, expiry) lookup is cached in
+            current_app.token_cache; the Researcher itself is still loaded by
+            primary key, from the identity map or with one SELECT by id.
         """
 
-        researcher = db.session.scalar(
-            sa.select(Researcher).where(Researcher.token == token)
-        )
-        if researcher is None or researcher.token_expiration.replace(
-            tzinfo=timezone.utc
-        ) < datetime.now(timezone.utc):
+        cached = current_app.token_cache.get(token)
+        if cached is None:
+            row = db.session.execute(
+                sa.select(Researcher.id, Researcher.token_expiration).where(
+                    Researcher.token == token
+                )
+            ).first()
+            if row is None:
+                return None
+            cached = (
+                row.id,
+                row.token_expiration.replace(tzinfo=timezone.utc).timestamp(),
+            )
+            current_app.token_cache.put(token, *cached)
+        researcher_id, expires_at = cached
+        if expires_at < time():
             return None
-        return researcher
+        return db.session.get(Researcher, researcher_id)
 
 
 class Post(SearchableMixin, db.Model):
@@ -449,6 +568,9 @@ class Post(SearchableMixin, db.Model):
     author: so.Mapped[Researcher] = so.relationship(back_populates="posts")
     __searchable__ = ["body"]
 
+    def count_keys(self):
+        return ["post", f"posts:{self.researcher_id}"]
+
     def __repr__(self):
         return "<Post {}>".format(self.body)
 
@@ -472,6 +594,9 @@ class Message(db.Model):
         foreign_keys="Message.recipient_id", back_populates="messages_received"
     )
 
+    def count_keys(self):
+        return [f"messages:{self.recipient_id}"]
+
     def __repr__(self):
         return "<Message {}>".format(self.body)
 
@@ -500,6 +625,8 @@ class Task(db.Model):
         description: a description of this task
         researcher_id: the id of the researcher who started this task
         complete: a boolean that shows task status
+        timestamp: when the task was launched
+        artifact: name of the file an export task produced, if any
 
     """
 
@@ -508,6 +635,10 @@ class Task(db.Model):
     description: so.Mapped[Optional[str]] = so.mapped_column(sa.String(128))
     researcher_id: so.Mapped[int] = so.mapped_column(sa.ForeignKey(Researcher.id))
     complete: so.Mapped[bool] = so.mapped_column(default=False)
+    timestamp: so.Mapped[Optional[datetime]] = so.mapped_column(
+        default=lambda: datetime.now(timezone.utc)
+    )
+    artifact: so.Mapped[Optional[str]] = so.mapped_column(sa.String(255))
 
     researcher: so.Mapped[Researcher] = so.relationship(back_populates="tasks")
 
@@ -522,18 +653,36 @@ class Task(db.Model):
             return None
         return rq_job
 
-    def get_progress(self):
+    def get_progress(self, recorded=None):
         """
-        Returns the progress percentage for the task. If the job id does not
-        exist in the RQ queue, that means the job already finished and the data
-        has expired, and was removed from the queue, so the percentage in this
-        case is 100. On the other hand, if the job exists but there is no information
-        associated with it, then we assume the job is scheduled to run.
+        Returns the progress percentage for the task. Completed tasks are at
+        100, and running tasks report their progress to the researcher's
+        progress hash in Redis. A task missing from it falls back to its RQ
+        job: if the job id does not exist in the RQ queue, that means the job
+        already finished and the data has expired, and was removed from the
+        queue, so the percentage in this case is 100. On the other hand, if the
+        job exists but there is no information associated with it, then we
+        assume the job is scheduled to run.
+
+        Attributes:
+            recorded: progress already looked up with get_task_progress(), to
+                share one Redis call between several tasks
         """
+        if self.complete:
+            return 100
+        if recorded is None:
+            recorded = get_task_progress(self.researcher_id, [self.id])
+        if self.id in recorded:
+            return recorded[self.id]
         job = self.get_rq_job()
         return job.meta.get("progress", 0) if job is not None else 100
 
 
+@sa.event.listens_for(Researcher.last_message_read_time, "set")
+def _reset_unread_messages_counter(target, value, oldvalue, initiator):
+    target.unread_messages_counter = 0
+
+
 @login.user_loader
 def load_user(id: int) -> Researcher:
     return db.session.get(Researcher, int(id))
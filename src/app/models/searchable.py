@@ -1,6 +1,9 @@
 import sqlalchemy as sa
+import sqlalchemy.orm as so
+from datetime import datetime, timezone
 from flask import url_for
 from src.app import db, search
+from src.app.pagination import keyset_paginate
 
 
 class SearchableMixin(object):
@@ -148,14 +151,69 @@ class PaginatedAPIMixin(object):
     Methods:
         to_collection_dict: Converts a database query into a paginated dictionary
                            response with items, metadata, and navigation links.
+        parse_fields: Validates a fields= request argument.
+
+    Models may define __api_fields__, a mapping of the field names clients can
+    request with fields= to the columns holding them. Sparse collections only
+    select those columns and skip to_dict().
     """
 
-    @staticmethod
-    def to_collection_dict(query, page, per_page, endpoint, **kwargs):
+    __api_fields__ = {}
+
+    @classmethod
+    def parse_fields(cls, value):
+        """
+        Parse a comma separated fields= argument
+
+        :params value: the argument, or None
+        :returns list: the requested field names, or None for full items
+        :raises ValueError: if a field is not in __api_fields__
+        """
+        if not value:
+            return None
+        fields = [field.strip() for field in value.split(",") if field.strip()]
+        unknown = [field for field in fields if field not in cls.__api_fields__]
+        if unknown:
+            raise ValueError(
+                f"unknown fields: {', '.join(unknown)}; "
+                f"available: {', '.join(cls.__api_fields__)}"
+            )
+        return fields
+
+    def to_fields_dict(self, fields):
+        data = {}
+        for field in fields:
+            value = getattr(self, self.__api_fields__[field])
+            if isinstance(value, datetime):
+                value = value.replace(tzinfo=timezone.utc).isoformat()
+            data[field] = value
+        return data
+
+    @classmethod
+    def to_collection_dict(
+        cls, query, page, per_page, endpoint, cursor=None, fields=None, **kwargs
+    ):
+        """
+        Paginate a query into a collection payload. When a cursor is passed
+        (an empty string requests the first page) the collection is keyset
+        paginated on the primary key, which skips the OFFSET scan and the
+        COUNT(*) query; otherwise classic page/offset pagination is used.
+        When fields are passed (see parse_fields) only their columns are
+        loaded and each item holds just those fields.
+        """
+        if fields is not None:
+            query = query.options(
+                so.load_only(*[getattr(cls, cls.__api_fields__[f]) for f in fields])
+            )
+            kwargs["fields"] = ",".join(fields)
+        if cursor is not None:
+            return cls._to_cursor_collection_dict(
+                query, cursor, per_page, endpoint, item_fields=fields, **kwargs
+            )
         resources = db.paginate(query, page=page, per_page=per_page, error_out=False)
 
         data = {
-            "items": [item.to_dict() for item in resources.items],
+            "items": cls._serialize_page(resources.items, fields),
             "_meta": {
                 "page": page,
                 "per_page": per_page,
@@ -177,3 +235,48 @@ class PaginatedAPIMixin(object):
             },
         }
         return data
+
+    @classmethod
+    def _serialize_page(cls, items, fields):
+        if fields is None:
+            return [item.to_dict() for item in items]
+        return [item.to_fields_dict(fields) for item in items]
+
+    @classmethod
+    def _to_cursor_collection_dict(
+        cls, query, cursor, per_page, endpoint, item_fields=None, **kwargs
+    ):
+        resources = keyset_paginate(
+            query, order_by=(cls.id,), cursor=cursor, per_page=per_page
+        )
+        return {
+            "items": cls._serialize_page(resources.items, item_fields),
+            "_meta": {
+                "per_page": per_page,
+                "next_cursor": resources.next_cursor,
+                "prev_cursor": resources.prev_cursor,
+            },
+            "_links": {
+                "self": url_for(endpoint, cursor=cursor, per_page=per_page, **kwargs),
+                "next": (
+                    url_for(
+                        endpoint,
+                        cursor=resources.next_cursor,
+                        per_page=per_page,
+                        **kwargs,
+                    )
+                    if resources.has_next
+                    else None
+                ),
+                "prev": (
+                    url_for(
+                        endpoint,
+                        cursor=resources.prev_cursor,
+                        per_page=per_page,
+                        **kwargs,
+                    )
+                    if resources.has_prev
+                    else None
+                ),
+            },
+        }
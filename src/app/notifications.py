@@ -0,0 +1,132 @@
+"""
+Live notifications over Redis pub/sub.
+
+Researcher.add_notification() still stores each notification in the database,
+and once the session commits also publishes it on the researcher's Redis
+channel and keeps it as the latest notification of its name. The
+/notifications/stream view relays the channel to the browser as server-sent
+events, so task progress and unread message counts arrive as they happen
+without the database being read.
+
+A stream starts with the latest notification of each name newer than the
+client's last event, then relays new ones, sending a comment every
+NOTIFICATION_HEARTBEAT seconds to keep proxies from closing the connection.
+Streams end after NOTIFICATION_STREAM_DURATION seconds, freeing their worker
+thread, and browsers reconnect by themselves. A web process serves at most
+notification_stream_limit() streams at once, so open tabs cannot take every
+thread from ordinary requests. While Redis is unavailable, or beyond that
+limit, clients fall back to polling /notifications.
+"""
+
+import json
+import time
+from redis.exceptions import RedisError
+from src.app import db
+from src.app.cache import get_redis, mark_redis_down
+
+CHANNEL_PREFIX = "notifications:"
+LATEST_KEY_PREFIX = "notifications_latest:"
+# Milliseconds browsers wait before reconnecting to a stream
+RECONNECT_DELAY = 5000
+
+
+def _channel(researcher_id):
+    return f"{CHANNEL_PREFIX}{researcher_id}"
+
+
+def _latest_key(researcher_id):
+    return f"{LATEST_KEY_PREFIX}{researcher_id}"
+
+
+def publish_notification(session, researcher_id, name, data, timestamp):
+    """
+    Publish a notification once session commits
+
+    :params      session: the session the notification was added in
+    :params researcher_id: id of the researcher notified
+    :params         name: the notification name
+    :params         data: the notification data
+    :params    timestamp: the notification's POSIX timestamp
+    """
+    payload = json.dumps({"name": name, "data": data, "timestamp": timestamp})
+    session.info.setdefault("notifications", []).append((researcher_id, name, payload))
+
+
+def _publish_committed(session):
+    notifications = session.info.pop("notifications", None)
+    if not notifications:
+        return
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        pipe = redis.pipeline(transaction=False)
+        for researcher_id, name, payload in notifications:
+            pipe.hset(_latest_key(researcher_id), name, payload)
+            pipe.publish(_channel(researcher_id), payload)
+        pipe.execute()
+    except RedisError:
+        mark_redis_down()
+
+
+def _discard_notifications(session):
+    session.info.pop("notifications", None)
+
+
+def _event(payload):
+    timestamp = json.loads(payload)["timestamp"]
+    return f"id: {timestamp}\ndata: {payload}\n\n"
+
+
+def notification_stream_limit(config):
+    """
+    Number of notification streams one web process may serve at once: a
+    quarter of its GUNICORN_THREADS, and no more than NOTIFICATION_MAX_STREAMS
+
+    :params config: the app config
+    :returns   int: the stream limit, 0 when there are too few threads to spare
+    """
+    return min(config["NOTIFICATION_MAX_STREAMS"], config["GUNICORN_THREADS"] // 4)
+
+
+def notification_events(redis, researcher_id, since, heartbeat, duration):
+    """
+    Generate the server-sent events of a researcher's notification stream
+
+    :params         redis: the Redis connection
+    :params researcher_id: id of the researcher notified
+    :params         since: POSIX timestamp of the last notification the client has
+    :params     heartbeat: seconds between keep-alive comments
+    :params      duration: seconds before the stream ends
+    :returns    generator: the events, as text
+    """
+    pubsub = redis.pubsub(ignore_subscribe_messages=True)
+    try:
+        # Subscribe before reading the latest notifications, so none are missed
+        pubsub.subscribe(_channel(researcher_id))
+        yield f"retry: {RECONNECT_DELAY}\n\n"
+        latest = sorted(
+            (
+                json.loads(payload)
+                for payload in redis.hvals(_latest_key(researcher_id))
+            ),
+            key=lambda notification: notification["timestamp"],
+        )
+        for notification in latest:
+            if notification["timestamp"] > since:
+                yield _event(json.dumps(notification))
+        ends_at = time.monotonic() + duration
+        while (remaining := ends_at - time.monotonic()) > 0:
+            message = pubsub.get_message(timeout=min(heartbeat, remaining))
+            if message is None:
+                yield ": keep-alive\n\n"
+            elif message["type"] == "message":
+                yield _event(message["data"].decode())
+    except RedisError:
+        mark_redis_down()
+    finally:
+        pubsub.close()
+
+
+db.event.listen(db.session, "after_commit", _publish_committed)
+db.event.listen(db.session, "after_rollback", _discard_notifications)
@@ -0,0 +1,140 @@
+"""
+Keyset (seek) pagination helpers.
+
+Offset pagination with db.paginate() issues an OFFSET query plus a COUNT(*) for
+every page, so deep pages over large tables get progressively slower. Keyset
+pagination instead remembers the sort key of the last (or first) row on the
+current page and asks the database for the rows strictly after (or before) it,
+which an index on the sort columns can answer in constant time at any depth.
+
+The sort key is handed to clients as an opaque, url-safe cursor string.
+"""
+
+import base64
+import binascii
+import json
+import sqlalchemy as sa
+from src.app import db
+
+NEXT = "n"
+PREV = "p"
+
+
+def encode_cursor(values, direction=NEXT):
+    """
+    Encode the sort key values of a row into an opaque cursor
+
+    :params     values: the sort key values, in order_by order
+    :params  direction: NEXT to seek after the row, PREV to seek before it
+    :returns    cursor: url-safe cursor string
+    """
+    raw = json.dumps({"k": list(values), "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor. Missing or malformed cursors
+    decode to the first page.
+
+    :params    cursor: the cursor string, or None
+    :returns    tuple: (sort key values or None, direction)
+    """
+    if not cursor:
+        return None, NEXT
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        values, direction = data["k"], data.get("d", NEXT)
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        return None, NEXT
+    if not isinstance(values, list) or direction not in (NEXT, PREV):
+        return None, NEXT
+    # Only scalars can be bound as sort key values
+    if not all(v is None or isinstance(v, (str, int, float)) for v in values):
+        return None, NEXT
+    return values, direction
+
+
+def _seek_condition(columns, values, direction):
+    """
+    Build the expanded row-value comparison (a > x) OR (a = x AND b > y) ...
+    which, unlike tuple comparison, every supported backend can satisfy from a
+    composite index on the key columns.
+    """
+    clauses = []
+    for i, column in enumerate(columns):
+        compare = column > values[i] if direction == NEXT else column < values[i]
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(sa.and_(*equal, compare))
+    return sa.or_(*clauses)
+
+
+class KeysetPage:
+    """
+    One page of keyset-paginated results.
+
+    Attributes:
+        items: the model instances on this page
+        next_cursor: cursor for the following page, or None on the last page
+        prev_cursor: cursor for the preceding page, or None on the first page
+    """
+
+    def __init__(self, items, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+
+def keyset_paginate(query, order_by, cursor=None, per_page=50):
+    """
+    Paginate a select() by seeking on its sort key rather than by OFFSET.
+
+    The order_by columns must identify a row uniquely (end with the primary
+    key) and should be backed by an index for the latency to stay flat.
+
+    :params     query: a sa.select() of a single entity, without ordering
+    :params  order_by: sequence of ascending sort columns, e.g. (Gene.gene_stable_id, Gene.id)
+    :params    cursor: a cursor from a previous KeysetPage, or None for the first page
+    :params  per_page: number of items per page
+    :returns KeysetPage: the requested page
+    """
+    columns = list(order_by)
+    values, direction = decode_cursor(cursor)
+    if values is not None and len(values) != len(columns):
+        values, direction = None, NEXT
+    if values is not None:
+        query = query.where(_seek_condition(columns, values, direction))
+    if direction == NEXT:
+        query = query.order_by(*[c.asc() for c in columns])
+    else:
+        query = query.order_by(*[c.desc() for c in columns])
+
+    rows = db.session.scalars(query.limit(per_page + 1)).all()
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == PREV:
+        rows.reverse()
+
+    def key_of(item):
+        return [getattr(item, c.key) for c in columns]
+
+    if direction == NEXT:
+        has_next, has_prev = has_more, values is not None
+    else:
+        has_next, has_prev = True, has_more
+    return KeysetPage(
+        rows,
+        next_cursor=(
+            encode_cursor(key_of(rows[-1]), NEXT) if rows and has_next else None
+        ),
+        prev_cursor=encode_cursor(key_of(rows[0]), PREV) if rows and has_prev else None,
+    )
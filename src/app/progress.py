@@ -0,0 +1,71 @@
+"""
+Throttled progress reporting for RQ tasks.
+
+Each reported progress value is saved in the researcher's task progress hash
+in Redis, where Task.get_progress() reads it, and sent to the researcher as a
+task_progress notification, which costs a database transaction.
+ProgressReporter merges the updates a task makes, reporting a new value only
+once TASK_PROGRESS_INTERVAL seconds have passed and progress has moved by
+TASK_PROGRESS_STEP percent since the last report. The first update and the
+final 100% are always reported.
+"""
+
+import time
+from flask import current_app
+from src.app import db
+from src.app.cache import set_task_progress
+from src.app.models.researcher import Task
+
+
+class ProgressReporter:
+    """
+    Reports the progress of the current RQ job.
+
+    Attributes:
+        job: the RQ job, or None outside a worker, when nothing is reported
+        min_interval: minimum seconds between reports
+        min_step: minimum change in percent between reports
+    """
+
+    def __init__(self, job, min_interval=None, min_step=None):
+        config = current_app.config
+        self.job = job
+        self.min_interval = (
+            config["TASK_PROGRESS_INTERVAL"] if min_interval is None else min_interval
+        )
+        self.min_step = config["TASK_PROGRESS_STEP"] if min_step is None else min_step
+        self.reported = None
+        self.reported_at = 0.0
+
+    def update(self, progress):
+        """
+        Record the job's progress, reporting it when due
+
+        :params progress: percent complete, from 0 to 100
+        """
+        progress = min(max(progress, 0), 100)
+        if self.reported is not None and progress < 100:
+            if progress - self.reported < self.min_step:
+                return
+            if time.monotonic() - self.reported_at < self.min_interval:
+                return
+        self._report(progress)
+
+    def finish(self):
+        """Report the job complete"""
+        self.update(100)
+
+    def _report(self, progress):
+        if self.job is None or progress == self.reported:
+            return
+        task = db.session.get(Task, self.job.get_id())
+        task.researcher.add_notification(
+            "task_progress", {"task_id": task.id, "progress": progress}
+        )
+        if progress >= 100:
+            task.complete = True
+        db.session.commit()
+        # Completed tasks are read from the database from here on
+        set_task_progress(task.researcher_id, task.id, progress)
+        self.reported = progress
+        self.reported_at = time.monotonic()
@@ -1,3 +1,4 @@
+from elasticsearch import ApiError, TransportError
 from flask import current_app
 
 
@@ -19,11 +20,16 @@ def remove_from_index(index, model):
 def query_index(index, query, page, per_page):
     if not current_app.elasticsearch:
         return [], 0
-    search = current_app.elasticsearch.search(
-        index=index,
-        query={"multi_match": {"query": query, "fields": ["*"]}},
-        from_=(page - 1) * per_page,
-        size=per_page,
-    )
+    try:
+        search = current_app.elasticsearch.search(
+            index=index,
+            query={"multi_match": {"query": query, "fields": ["*"]}},
+            from_=(page - 1) * per_page,
+            size=per_page,
+        )
+    except (ApiError, TransportError) as e:
+        # Includes timeouts: report no matches rather than failing the page
+        current_app.logger.warning(f"Search on {index} failed: {e}")
+        return [], 0
     ids = [int(hit["_id"]) for hit in search["hits"]["hits"]]
     return ids, search["hits"]["total"]["value"]
@@ -0,0 +1,173 @@
+"""
+Precomputed "researchers to follow" suggestions.
+
+Candidates are ranked by how many of the people a researcher follows already
+follow them (friends of friends), topped up with the most followed and then
+the newest researchers for new accounts. Rankings are computed with one aggregate query over the
+followers table, which its (follower_id, followed_id) primary key serves, and
+stored per researcher in a Redis sorted set, so showing suggestions costs a
+ZREVRANGE and a primary key lookup. Sets are refreshed in the background by
+the refresh_follow_suggestions RQ task when the researcher's follows change,
+and expire after FOLLOW_SUGGESTIONS_TTL seconds as a backstop.
+"""
+
+import sqlalchemy as sa
+from flask import current_app
+from redis.exceptions import RedisError
+from src.app import db
+from src.app.cache import get_redis, mark_redis_down
+from src.app.task_queues import enqueue_task
+
+SUGGESTIONS_KEY_PREFIX = "follow_suggestions:"
+
+
+def _suggestions_key(researcher_id):
+    return f"{SUGGESTIONS_KEY_PREFIX}{researcher_id}"
+
+
+def compute_follow_suggestions(researcher_id, limit):
+    """
+    Rank researchers to suggest to researcher_id
+
+    :params researcher_id: the researcher receiving suggestions
+    :params         limit: maximum number of suggestions
+    :returns         list: (researcher id, score) pairs, best first. Friends of
+                           friends score their mutual follow count; popular
+                           and new researchers used to fill the list score 0.
+    """
+    from src.app.models.researcher import Researcher, followers
+
+    mine = followers.alias("mine")
+    theirs = followers.alias("theirs")
+    already_following = sa.select(followers.c.followed_id).where(
+        followers.c.follower_id == researcher_id
+    )
+    mutual = sa.func.count().label("mutual")
+    friends_of_friends = db.session.execute(
+        sa.select(theirs.c.followed_id, mutual)
+        .select_from(mine.join(theirs, theirs.c.follower_id == mine.c.followed_id))
+        .where(mine.c.follower_id == researcher_id)
+        .where(theirs.c.followed_id != researcher_id)
+        .where(theirs.c.followed_id.not_in(already_following))
+        .group_by(theirs.c.followed_id)
+        .order_by(mutual.desc(), theirs.c.followed_id)
+        .limit(limit)
+    ).all()
+    ranked = [(candidate, count) for candidate, count in friends_of_friends]
+    if len(ranked) < limit:
+        exclude = [researcher_id] + [candidate for candidate, unused in ranked]
+        popular = db.session.scalars(
+            sa.select(followers.c.followed_id)
+            .where(followers.c.followed_id.not_in(exclude))
+            .where(followers.c.followed_id.not_in(already_following))
+            .group_by(followers.c.followed_id)
+            .order_by(sa.func.count().desc(), followers.c.followed_id)
+            .limit(limit - len(ranked))
+        ).all()
+        ranked += [(candidate, 0) for candidate in popular]
+    if len(ranked) < limit:
+        # Too few follows to rank on: suggest the newest researchers
+        exclude = [researcher_id] + [candidate for candidate, unused in ranked]
+        newest = db.session.scalars(
+            sa.select(Researcher.id)
+            .where(Researcher.id.not_in(exclude))
+            .where(Researcher.id.not_in(already_following))
+            .order_by(Researcher.id.desc())
+            .limit(limit - len(ranked))
+        ).all()
+        ranked += [(candidate, 0) for candidate in newest]
+    return ranked
+
+
+def refresh_follow_suggestions(researcher_id):
+    """
+    Recompute and store the suggestions for researcher_id
+
+    :returns list: the stored (researcher id, score) pairs
+    """
+    ranked = compute_follow_suggestions(
+        researcher_id, current_app.config["FOLLOW_SUGGESTIONS_STORED"]
+    )
+    redis = get_redis()
+    if redis is None:
+        return ranked
+    key = _suggestions_key(researcher_id)
+    try:
+        pipe = redis.pipeline()
+        pipe.delete(key)
+        if ranked:
+            # Scores add a fraction that shrinks down the list so that
+            # ZREVRANGE returns candidates in ranked order, ties included
+            pipe.zadd(
+                key,
+                {
+                    candidate: score + 1 - (i + 1) / (len(ranked) + 1)
+                    for i, (candidate, score) in enumerate(ranked)
+                },
+            )
+        else:
+            # An empty marker so researchers with no candidates are not recomputed
+            pipe.zadd(key, {0: 0})
+        pipe.expire(key, current_app.config["FOLLOW_SUGGESTIONS_TTL"])
+        pipe.execute()
+    except RedisError:
+        mark_redis_down()
+    return ranked
+
+
+def get_follow_suggestions(researcher_id, count=5):
+    """
+    Return up to count Researchers to suggest to researcher_id. Reads the
+    stored ranking; computes it in the request only on a cache miss or
+    while Redis is unavailable.
+
+    :returns list: Researcher objects, best first
+    """
+    from src.app.models.researcher import Researcher
+
+    candidate_ids = None
+    redis = get_redis()
+    if redis is not None:
+        try:
+            if redis.exists(_suggestions_key(researcher_id)):
+                candidate_ids = [
+                    int(candidate)
+                    for candidate in redis.zrevrange(
+                        _suggestions_key(researcher_id), 0, count
+                    )
+                ]
+        except RedisError:
+            mark_redis_down()
+    if candidate_ids is None:
+        candidate_ids = [
+            candidate for candidate, unused in refresh_follow_suggestions(researcher_id)
+        ]
+    candidate_ids = [c for c in candidate_ids if c != 0][:count]
+    if not candidate_ids:
+        return []
+    researchers = {
+        r.id: r
+        for r in db.session.scalars(
+            sa.select(Researcher).where(Researcher.id.in_(candidate_ids))
+        )
+    }
+    return [researchers[c] for c in candidate_ids if c in researchers]
+
+
+def follows_changed(researcher_id, followed_id=None):
+    """
+    Drop a newly followed researcher from researcher_id's suggestions at once
+    and queue a background refresh of the rest.
+
+    :params researcher_id: the researcher who followed or unfollowed someone
+    :params   followed_id: the researcher who was followed, if any
+    """
+    redis = get_redis()
+    if redis is None:
+        return
+    try:
+        if followed_id is not None:
+            redis.zrem(_suggestions_key(researcher_id), followed_id)
+        enqueue_task("refresh_follow_suggestions", researcher_id)
+    except RedisError:
+        mark_redis_down()
@@ -0,0 +1,90 @@
+"""
+Prioritized RQ queues for background tasks.
+
+Tasks are enqueued on one of TASK_QUEUES, listed highest priority first, by
+the queue TASK_ROUTES gives their name; unrouted tasks go to the first queue.
+Each queue has its own job timeout (TASK_QUEUE_TIMEOUTS), and a limit on the
+unfinished tasks one researcher may have on it (TASK_RESEARCHER_LIMITS).
+
+`flask worker` starts TASK_QUEUE_WORKERS worker processes per queue. A worker
+takes jobs from the first queue before its own, so short interactive jobs
+are never stuck behind a long pipeline import or bulk export. No more than a
+lower priority queue's workers ever run its jobs at once; jobs on the first
+queue may run on every worker.
+"""
+
+import rq
+from flask import current_app
+
+QUEUE_PREFIX = "gene-annotator-"
+
+
+def create_task_queues(config, connection):
+    """
+    Create the RQ queues named in config
+
+    :params     config: the app config
+    :params connection: the Redis connection
+    :returns      dict: queue name -> rq.Queue, highest priority first
+    """
+    return {
+        name: rq.Queue(
+            f"{QUEUE_PREFIX}{name}",
+            connection=connection,
+            default_timeout=config["TASK_QUEUE_TIMEOUTS"][name],
+        )
+        for name in config["TASK_QUEUES"]
+    }
+
+
+def task_queue_name(task_name):
+    """Returns the name of the queue task_name runs on"""
+    config = current_app.config
+    return config["TASK_ROUTES"].get(task_name, config["TASK_QUEUES"][0])
+
+
+def enqueue_task(task_name, *args, **kwargs):
+    """
+    Enqueue the function task_name of src.app.tasks on its queue
+
+    :returns rq.job.Job: the enqueued job
+    """
+    queue = current_app.task_queues[task_queue_name(task_name)]
+    return queue.enqueue(f"src.app.tasks.{task_name}", *args, **kwargs)
+
+
+def queue_task_names(queue_name, column):
+    """
+    Condition on a task name column selecting the tasks that run on a queue
+
+    :params queue_name: the queue name
+    :params     column: the column holding task names, e.g. Task.name
+    """
+    config = current_app.config
+    if queue_name == config["TASK_QUEUES"][0]:
+        elsewhere = [
+            task for task, queue in config["TASK_ROUTES"].items() if queue != queue_name
+        ]
+        return column.not_in(elsewhere)
+    return column.in_(
+        [task for task, queue in config["TASK_ROUTES"].items() if queue == queue_name]
+    )
+
+
+def worker_queues(config, only=()):
+    """
+    Plan the worker processes started by `flask worker`
+
+    :params config: the app config
+    :params   only: names of the queues to start workers for; all when empty
+    :returns  list: for each worker, the names of the queues it listens to, in
+                    the order it takes jobs from them
+    """
+    first = config["TASK_QUEUES"][0]
+    workers = []
+    for name in config["TASK_QUEUES"]:
+        if only and name not in only:
+            continue
+        queues = [first, name] if name != first else [first]
+        workers.extend([queues] * config["TASK_QUEUE_WORKERS"][name])
+    return workers
@@ -7,56 +7,41 @@ The application is created in this module because this is the only module the RQ
 to import; separate from the app initialized in gene_annotator_flask_shell_ctx
 """
 
-import time
-import json
 import sys
-import sqlalchemy as sa
+import tempfile
+from pathlib import Path
 from rq import get_current_job
 from flask import render_template
 from src.app import create_app, db
-from src.app.models.researcher import Researcher, Task, Post
+from src.app.models.researcher import Researcher, Task
 from src.app.email_service import send_email
+from src.app.exports import write_posts_export, write_table_export, export_filename
+from src.app.models.pipeline_run_service import import_cli_output
+from src.app.progress import ProgressReporter
+from src.app import suggestions
 
 app = create_app()
 app.app_context().push()
 
 
-def _set_task_progress(progress):
-    job = get_current_job()
-    if job:
-        job.meta["progress"] = progress
-        job.save_meta()
-        task = db.session.get(Task, job.get_id())
-        task.researcher.add_notification(
-            "task_progress", {"task_id": job.get_id(), "progress": progress}
-        )
-        if progress >= 100:
-            task.complete = True
-        db.session.commit()
-
-
 def export_posts(researcher_id):
     """
-    This function to run in a separate process controlled by RQ
+    This function to run in a separate process controlled by RQ. The posts are
+    written to a temporary file batch by batch and emailed as one attachment.
     """
 
+    progress = ProgressReporter(get_current_job())
     try:
         researcher = db.session.get(Researcher, researcher_id)
-        _set_task_progress(0)
-        data = []
-        i = 0
-        total_posts = db.session.scalar(
-            sa.select(sa.func.count()).select_from(researcher.posts.select().subquery())
-        )
-        for post in db.session.scalars(
-            researcher.posts.select().order_by(Post.timestamp.asc())
-        ):
-            data.append(
-                {"body": post.body, "timestamp": post.timestamp.isoformat() + "Z"}
+        progress.update(0)
+        with tempfile.TemporaryFile("w+", encoding="utf-8") as export:
+            write_posts_export(
+                researcher_id,
+                export,
+                app.config["EXPORT_BATCH_SIZE"],
+                progress=progress.update,
             )
-            time.sleep(5)
-            i += 1
-            _set_task_progress(100 * i)
+            export.seek(0)
             send_email(
                 "[Gene Annotator] Your blog posts",
                 sender=app.config["ADMINS"][0],
@@ -67,17 +52,67 @@ def export_posts(researcher_id):
                 html_body=render_template(
                     "email/export_posts.html", researcher=researcher
                 ),
-                attachments=[
-                    (
-                        "posts.json",
-                        "application/json",
-                        json.dumps({"posts": data}, indent=4),
-                    )
-                ],
+                attachments=[("posts.json", "application/json", export.read())],
                 sync=True,
             )
     except Exception:
-        _set_task_progress(100)
+        db.session.rollback()
+        app.logger.error("Unhandled exception", exc_info=sys.exc_info())
+    finally:
+        progress.finish()
+
+
+def export_table(researcher_id, table, fmt, run_id=None):
+    """
+    Export a table, or a run's pipeline results, to a file in EXPORT_DIR and
+    record it as the task's artifact for the researcher to download
+    """
+
+    job = get_current_job()
+    progress = ProgressReporter(job)
+    try:
+        progress.update(0)
+        filename = export_filename(table, fmt, job.get_id(), run_id)
+        write_table_export(
+            table,
+            fmt,
+            filename,
+            app.config["EXPORT_BATCH_SIZE"],
+            run_id=run_id,
+            progress=progress.update,
+        )
+        db.session.get(Task, job.get_id()).artifact = filename
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
         app.logger.error("Unhandled exception", exc_info=sys.exc_info())
     finally:
-        _set_task_progress(100)
+        progress.finish()
+
+
+def import_cli_results(researcher_id, output_dir):
+    """
+    Load a command line pipeline run found by the ETL watcher into the database
+    """
+
+    progress = ProgressReporter(get_current_job())
+    try:
+        progress.update(0)
+        import_cli_output(Path(output_dir), researcher_id)
+    except Exception:
+        db.session.rollback()
+        app.logger.error("Unhandled exception", exc_info=sys.exc_info())
+    finally:
+        progress.finish()
+
+
+def refresh_follow_suggestions(researcher_id):
+    """
+    Recompute a researcher's follow suggestions after their follows change
+    """
+
+    try:
+        suggestions.refresh_follow_suggestions(researcher_id)
+    except Exception:
+        db.session.rollback()
+        app.logger.error("Unhandled exception", exc_info=sys.exc_info())
@@ -0,0 +1,258 @@
+"""
+Fan-out-on-write timelines for the microblog.
+
+Researcher.following_posts() joins posts to their authors' followers and
+groups the result, which gets slower the more a researcher follows. Instead,
+each researcher's timeline is kept as a Redis sorted set of post ids scored by
+post time, holding the newest TIMELINE_LENGTH posts:
+
+- committing a new post adds it to the timelines of its author and followers
+- following or unfollowing someone adds or removes that researcher's posts
+- a missing timeline is built from following_posts() on first read, and
+  'flask build-timelines' builds them all
+
+Reading a page is then a ZREVRANGE plus a primary key lookup. Pages past the
+cached length, and every page while Redis is unavailable, fall back to SQL.
+"""
+
+from datetime import datetime, timezone
+import sqlalchemy as sa
+from flask import current_app
+from redis.exceptions import RedisError
+from src.app import db
+from src.app.cache import get_redis, mark_redis_down
+
+TIMELINE_KEY_PREFIX = "timeline:"
+# Member present in every stored timeline, so that an empty timeline is
+# distinguishable from one that was never built; post ids start at 1
+EMPTY_MARKER = 0
+
+
+def _timeline_key(researcher_id):
+    return f"{TIMELINE_KEY_PREFIX}{researcher_id}"
+
+
+def _score(timestamp):
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+class TimelinePage:
+    """
+    One page of a timeline, with the navigation attributes of a
+    Flask-SQLAlchemy Pagination object that the templates use.
+    """
+
+    def __init__(self, items, page, has_next):
+        self.items = items
+        self.page = page
+        self.has_next = has_next
+
+    @property
+    def has_prev(self):
+        return self.page > 1
+
+    @property
+    def next_num(self):
+        return self.page + 1 if self.has_next else None
+
+    @property
+    def prev_num(self):
+        return self.page - 1 if self.has_prev else None
+
+
+def build_timeline(researcher):
+    """
+    Store researcher's timeline, replacing any existing one
+
+    :params researcher: the Researcher whose timeline is built
+    :returns     count: the number of posts stored
+    """
+    redis = get_redis()
+    if redis is None:
+        return 0
+    subquery = researcher.following_posts().subquery()
+    rows = db.session.execute(
+        sa.select(subquery.c.id, subquery.c.timestamp)
+        .order_by(subquery.c.timestamp.desc())
+        .limit(current_app.config["TIMELINE_LENGTH"])
+    ).all()
+    key = _timeline_key(researcher.id)
+    try:
+        pipe = redis.pipeline()
+        pipe.delete(key)
+        pipe.zadd(key, {EMPTY_MARKER: 0})
+        if rows:
+            pipe.zadd(key, {post_id: _score(timestamp) for post_id, timestamp in rows})
+        pipe.expire(key, current_app.config["TIMELINE_TTL"])
+        pipe.execute()
+    except RedisError:
+        mark_redis_down()
+    return len(rows)
+
+
+def _add_to_timelines(researcher_ids, posts):
+    """ZADD posts to the timelines of researcher_ids that have been built"""
+    redis = get_redis()
+    if redis is None or not posts:
+        return
+    researcher_ids = list(researcher_ids)
+    try:
+        pipe = redis.pipeline()
+        for researcher_id in researcher_ids:
+            pipe.exists(_timeline_key(researcher_id))
+        built = pipe.execute()
+        length = current_app.config["TIMELINE_LENGTH"]
+        pipe = redis.pipeline()
+        for researcher_id, exists in zip(researcher_ids, built):
+            if not exists:
+                continue
+            key = _timeline_key(researcher_id)
+            pipe.zadd(key, {post_id: score for post_id, score in posts})
+            # Keep the newest posts plus the empty marker, which scores lowest
+            pipe.zremrangebyrank(key, 1, -(length + 1))
+        pipe.execute()
+    except RedisError:
+        mark_redis_down()
+
+
+def _fan_out_recipients(connection, author_ids):
+    """Map each author id to the ids of the researchers whose timelines show their posts"""
+    from src.app.models.researcher import followers
+
+    recipients = {author_id: [author_id] for author_id in author_ids}
+    for follower_id, followed_id in connection.execute(
+        sa.select(followers.c.follower_id, followers.c.followed_id).where(
+            followers.c.followed_id.in_(author_ids)
+        )
+    ):
+        recipients[followed_id].append(follower_id)
+    return recipients
+
+
+def followed(follower_id, followed_id):
+    """Add a newly followed researcher's recent posts to the follower's timeline"""
+    from src.app.models.researcher import Post
+
+    rows = db.session.execute(
+        sa.select(Post.id, Post.timestamp)
+        .where(Post.researcher_id == followed_id)
+        .order_by(Post.timestamp.desc())
+        .limit(current_app.config["TIMELINE_LENGTH"])
+    ).all()
+    _add_to_timelines(
+        [follower_id], [(post_id, _score(timestamp)) for post_id, timestamp in rows]
+    )
+
+
+def unfollowed(follower_id, followed_id):
+    """Remove an unfollowed researcher's posts from the follower's timeline"""
+    from src.app.models.researcher import Post
+
+    redis = get_redis()
+    if redis is None:
+        return
+    key = _timeline_key(follower_id)
+    try:
+        oldest = redis.zrange(key, 1, 1, withscores=True)
+        if not oldest:
+            return
+        post_ids = db.session.scalars(
+            sa.select(Post.id)
+            .where(Post.researcher_id == followed_id)
+            .where(Post.timestamp >= _naive_utc(oldest[0][1]))
+        ).all()
+        if post_ids:
+            redis.zrem(key, *post_ids)
+    except RedisError:
+        mark_redis_down()
+
+
+def _naive_utc(score):
+    return datetime.fromtimestamp(score, timezone.utc).replace(tzinfo=None)
+
+
+def timeline_page(researcher, page, per_page):
+    """
+    Return a page of the posts by researcher and the researchers they follow,
+    newest first
+
+    :params researcher: the Researcher reading their timeline
+    :params       page: page number, from 1
+    :params   per_page: posts per page
+    :returns  TimelinePage or Pagination: the page of posts
+    """
+    from src.app.models.researcher import Post
+
+    page = max(page, 1)
+    start = (page - 1) * per_page
+    redis = get_redis()
+    post_ids = None
+    if redis is not None and start + per_page < current_app.config["TIMELINE_LENGTH"]:
+        key = _timeline_key(researcher.id)
+        try:
+            if not redis.exists(key):
+                build_timeline(researcher)
+            # One extra id tells whether there is a next page
+            post_ids = [
+                int(post_id)
+                for post_id in redis.zrevrange(key, start, start + per_page)
+                if int(post_id) != EMPTY_MARKER
+            ]
+        except RedisError:
+            mark_redis_down()
+            post_ids = None
+    if post_ids is None:
+        return db.paginate(
+            researcher.following_posts(),
+            page=page,
+            per_page=per_page,
+            error_out=False,
+        )
+    posts = {
+        post.id: post
+        for post in db.session.scalars(
+            sa.select(Post).where(Post.id.in_(post_ids[:per_page]))
+        )
+    }
+    return TimelinePage(
+        [posts[post_id] for post_id in post_ids[:per_page] if post_id in posts],
+        page,
+        has_next=len(post_ids) > per_page,
+    )
+
+
+def _collect_new_posts(session, flush_context):
+    """
+    Record new posts and who should see them. Runs after each flush, while
+    the flush's transaction can still be queried.
+    """
+    from src.app.models.researcher import Post
+
+    new_posts = [obj for obj in session.new if isinstance(obj, Post)]
+    if not new_posts:
+        return
+    recipients = _fan_out_recipients(
+        session.connection(), {post.researcher_id for post in new_posts}
+    )
+    fan_out = session.info.setdefault("timeline_fan_out", [])
+    for post in new_posts:
+        fan_out.append(
+            (recipients[post.researcher_id], post.id, _score(post.timestamp))
+        )
+
+
+def _fan_out_committed_posts(session):
+    fan_out = session.info.pop("timeline_fan_out", None)
+    for researcher_ids, post_id, score in fan_out or []:
+        _add_to_timelines(researcher_ids, [(post_id, score)])
+
+
+def _discard_new_posts(session):
+    session.info.pop("timeline_fan_out", None)
+
+
+db.event.listen(db.session, "after_flush", _collect_new_posts)
+db.event.listen(db.session, "after_commit", _fan_out_committed_posts)
+db.event.listen(db.session, "after_rollback", _discard_new_posts)
@@ -0,0 +1,149 @@
+"""
+Cache of API tokens for token authentication.
+
+Every token-authenticated API request used to look its token up with a
+SELECT on researcher.token. Tokens are instead mapped to their researcher id
+and expiry time in an in-process LRU cache of TOKEN_CACHE_SIZE entries, shared
+between processes through Redis when it is reachable. Only tokens found in the
+database are cached, so unknown tokens cannot fill the cache. The cache
+replaces the scan of researcher.token only: the researcher is still loaded by
+primary key on every request.
+
+get_token() and revoke_token() invalidate a token in this process and in
+Redis once their change is committed; invalidating earlier would let a
+concurrent request cache the old expiry again before the commit. Entries in
+other processes' LRU caches live at most TOKEN_CACHE_TTL seconds, which bounds
+how long they can accept a revoked token.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from redis.exceptions import RedisError
+from src.app import db
+from src.app.cache import get_redis, mark_redis_down
+
+TOKEN_KEY_PREFIX = "api_token:"
+
+
+def _token_key(token):
+    # Tokens are credentials, so Redis only sees their digest
+    return TOKEN_KEY_PREFIX + hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    LRU cache of token -> (researcher id, expiry timestamp).
+
+    Attributes:
+        maxsize: maximum number of tokens cached in this process
+        ttl: seconds an entry is trusted by this process before Redis or the
+            database is consulted again
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, token):
+        """
+        Look up a token
+
+        :params   token: the API token
+        :returns  tuple: (researcher id, expiry timestamp), or None on a miss
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(token)
+            if entry is not None:
+                researcher_id, expires_at, cached_until = entry
+                if cached_until > now:
+                    self._entries.move_to_end(token)
+                    return researcher_id, expires_at
+                del self._entries[token]
+        redis = get_redis()
+        if redis is None:
+            return None
+        try:
+            value = redis.get(_token_key(token))
+        except RedisError:
+            mark_redis_down()
+            return None
+        if value is None:
+            return None
+        researcher_id, expires_at = value.decode().split(":")
+        researcher_id, expires_at = int(researcher_id), float(expires_at)
+        self._store(token, researcher_id, expires_at)
+        return researcher_id, expires_at
+
+    def _store(self, token, researcher_id, expires_at):
+        with self._lock:
+            self._entries[token] = (
+                researcher_id,
+                expires_at,
+                time.monotonic() + self.ttl,
+            )
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def put(self, token, researcher_id, expires_at):
+        """
+        Cache a token found in the database
+
+        :params         token: the API token
+        :params researcher_id: id of the researcher owning the token
+        :params    expires_at: the token's expiry as a POSIX timestamp
+        """
+        self._store(token, researcher_id, expires_at)
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            # Redis keeps the entry until the token expires
+            redis.set(
+                _token_key(token),
+                f"{researcher_id}:{expires_at}",
+                ex=max(int(expires_at - time.time()) + 1, 1),
+            )
+        except RedisError:
+            mark_redis_down()
+
+    def invalidate(self, token):
+        """Drop a token from this process and from Redis"""
+        with self._lock:
+            self._entries.pop(token, None)
+        redis = get_redis()
+        if redis is None:
+            return
+        try:
+            redis.delete(_token_key(token))
+        except RedisError:
+            mark_redis_down()
+
+
+def invalidate_on_commit(session, token):
+    """
+    Invalidate a token in current_app.token_cache once session commits
+
+    :params session: the session holding the change to the token
+    :params   token: the API token
+    """
+    session.info.setdefault("stale_tokens", set()).add(token)
+
+
+def _invalidate_committed_tokens(session):
+    for token in session.info.pop("stale_tokens", ()):
+        current_app.token_cache.invalidate(token)
+
+
+def _discard_stale_tokens(session):
+    session.info.pop("stale_tokens", None)
+
+
+db.event.listen(db.session, "after_commit", _invalidate_committed_tokens)
+db.event.listen(db.session, "after_rollback", _discard_stale_tokens)
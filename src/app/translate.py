@@ -1,3 +1,12 @@
+"""
+Text translation through the Azure Translator API.
+
+Requests go through the app's shared requests session (current_app.http),
+which keeps a pool of open connections so calls skip the TCP and TLS
+handshakes, and time out after TRANSLATOR_TIMEOUT seconds. A slow translator
+then cannot hold a worker thread indefinitely.
+"""
+
 import requests
 from flask import current_app
 from flask_babel import _
@@ -16,12 +25,17 @@ def translate(text, source_language, dest_language):
         "Content-Type": "application/json",
     }
     params = {"api-version": "3.0", "from": source_language, "to": dest_language}
-    r = requests.post(
-        endpoint,
-        headers=headers,
-        params=params,
-        json=[{"Text": text}],
-    )
+    try:
+        r = current_app.http.post(
+            endpoint,
+            headers=headers,
+            params=params,
+            json=[{"Text": text}],
+            timeout=current_app.config["TRANSLATOR_TIMEOUT"],
+        )
+    except requests.RequestException as e:
+        current_app.logger.warning(f"Translation request failed: {e}")
+        return _("Error: the translation service failed.")
     if r.status_code != 200:
         return _("Error: the translation service failed.")
     return r.json()[0]["translations"][0]["text"]
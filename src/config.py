@@ -14,14 +14,88 @@ class Config:
     )
     ELASTICSEARCH_URL = os.environ.get("ELASTICSEARCH_URL")
     REDIS_URL = os.environ.get("REDIS_URL") or "redis://"
+    REDIS_RETRY_INTERVAL = int(os.environ.get("REDIS_RETRY_INTERVAL") or 30)
     MAIL_SERVER = os.environ.get("MAIL_SERVER")
     MAIL_PORT = int(os.environ.get("MAIL_PORT") or 25)
     MAIL_USE_TLS = os.environ.get("MAIL_USE_TLS") is not None
     MAIL_USERNAME = os.environ.get("MAIL_USERNAME")
     MAIL_PASSWORD = os.environ.get("MAIL_PASSWORD")
     MS_TRANSLATOR_KEY = os.environ.get("MS_TRANSLATOR_KEY")
+    TRANSLATOR_TIMEOUT = float(os.environ.get("TRANSLATOR_TIMEOUT") or 10)
+    ELASTICSEARCH_TIMEOUT = float(os.environ.get("ELASTICSEARCH_TIMEOUT") or 5)
+    # Pooled connections per external host, at least one per worker thread
+    HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE") or 16)
     ADMINS = ["arthurvargasdev@gmail.com"]
     RUNS_PER_PAGE = 10
     GENES_PER_PAGE = 50
     POSTS_PER_PAGE = 10
+    GENE_LOOKUP_MAX_IDS = int(os.environ.get("GENE_LOOKUP_MAX_IDS") or 10000)
+    GENE_LOOKUP_CHUNK_SIZE = 500
+    EXPORT_BATCH_SIZE = 1000
+    # Where background table exports are written for download
+    EXPORT_DIR = os.environ.get("EXPORT_DIR") or str(basedir / "exports")
+    ETL_OUTPUT_DIR = os.environ.get("ETL_OUTPUT_DIR") or str(basedir / "src" / "etl")
+    # Seconds between checks of ETL_OUTPUT_DIR for new CLI runs; 0 disables
+    ETL_WATCH_INTERVAL = int(os.environ.get("ETL_WATCH_INTERVAL") or 10)
+    # Seconds between bulk writes of buffered researcher.last_seen times
+    LAST_SEEN_FLUSH_INTERVAL = int(os.environ.get("LAST_SEEN_FLUSH_INTERVAL") or 60)
+    LAST_SEEN_RESOLUTION = 60
+    FOLLOW_SUGGESTIONS_STORED = 20
+    FOLLOW_SUGGESTIONS_TTL = int(os.environ.get("FOLLOW_SUGGESTIONS_TTL") or 86400)
+    # Newest posts kept in each researcher's cached microblog timeline
+    TIMELINE_LENGTH = 500
+    TIMELINE_TTL = int(os.environ.get("TIMELINE_TTL") or 7 * 86400)
+    ACTIVITY_CACHE_TIMEOUT = int(os.environ.get("ACTIVITY_CACHE_TIMEOUT") or 300)
+    COUNT_CACHE_TIMEOUT = int(os.environ.get("COUNT_CACHE_TIMEOUT") or 3600)
+    FRAGMENT_CACHE_TIMEOUT = int(os.environ.get("FRAGMENT_CACHE_TIMEOUT") or 3600)
+    # API tokens cached per process, and seconds each process trusts an entry
+    TOKEN_CACHE_SIZE = 10000
+    TOKEN_CACHE_TTL = int(os.environ.get("TOKEN_CACHE_TTL") or 30)
+    # Seconds between keep-alive comments, and lifetime of a notification stream
+    NOTIFICATION_HEARTBEAT = int(os.environ.get("NOTIFICATION_HEARTBEAT") or 15)
+    NOTIFICATION_STREAM_DURATION = int(
+        os.environ.get("NOTIFICATION_STREAM_DURATION") or 300
+    )
+    # Notification streams one web process serves at once, at most a quarter of
+    # its threads (see notification_stream_limit); clients beyond it poll
+    NOTIFICATION_MAX_STREAMS = int(os.environ.get("NOTIFICATION_MAX_STREAMS") or 50)
+    # Threads per gunicorn worker; boot.sh reads the same variable
+    GUNICORN_THREADS = int(os.environ.get("GUNICORN_THREADS") or 16)
+    # Background task queues, highest priority first, and the queue of each
+    # task; tasks not listed run on the first queue
+    TASK_QUEUES = ["interactive", "pipeline", "bulk"]
+    TASK_ROUTES = {
+        "refresh_follow_suggestions": "interactive",
+        "import_cli_results": "pipeline",
+        "export_posts": "bulk",
+        "export_table": "bulk",
+    }
+    # Seconds a job may run before its worker stops it, by queue
+    TASK_QUEUE_TIMEOUTS = {"interactive": 300, "pipeline": 4 * 3600, "bulk": 2 * 3600}
+    # Worker processes started for each queue by `flask worker`
+    TASK_QUEUE_WORKERS = {
+        "interactive": int(os.environ.get("INTERACTIVE_WORKERS") or 2),
+        "pipeline": int(os.environ.get("PIPELINE_WORKERS") or 1),
+        "bulk": int(os.environ.get("BULK_WORKERS") or 1),
+    }
+    # Unfinished tasks a researcher may have on each queue
+    TASK_RESEARCHER_LIMITS = {"interactive": 5, "pipeline": 2, "bulk": 2}
+    # Background task progress is reported at most this often, in seconds and percent
+    TASK_PROGRESS_INTERVAL = float(os.environ.get("TASK_PROGRESS_INTERVAL") or 2)
+    TASK_PROGRESS_STEP = int(os.environ.get("TASK_PROGRESS_STEP") or 5)
+    # Seconds a researcher's task progress is kept after its last update
+    TASK_PROGRESS_TTL = int(os.environ.get("TASK_PROGRESS_TTL") or 86400)
+    # gzip or brotli response compression for clients that accept it
+    COMPRESSION_ENABLED = os.environ.get("DISABLE_COMPRESSION") is None
+    COMPRESSION_LEVEL = int(os.environ.get("COMPRESSION_LEVEL") or 6)
+    COMPRESSION_MIN_SIZE = int(os.environ.get("COMPRESSION_MIN_SIZE") or 1024)
+    COMPRESSION_MIMETYPES = [
+        "text/html",
+        "text/css",
+        "text/csv",
+        "text/plain",
+        "application/javascript",
+        "application/json",
+        "application/x-ndjson",
+    ]
     LANGUAGES = ["en", "es"]
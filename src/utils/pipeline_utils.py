@@ -197,6 +197,40 @@ def set_error_and_exit(error):
     sys.stderr.write(f"Error: {error} \n")
 
 
+def summarize_results(
+    final_results: pd.DataFrame,
+    gene_type_counts: pd.DataFrame = None,
+    excluded_tigrfam_count: int = None,
+) -> dict:
+    """
+    Compute the aggregate statistics stored with a pipeline run
+
+    :params           final_results: the final merged and filtered results
+    :params        gene_type_counts: gene_type/count frame as written to gene_type_count.csv;
+                                     counted from final_results when not given
+    :params  excluded_tigrfam_count: number of rows excluded on tigrfam_id, if known
+    :return                 summary: dict of result_count, hgnc_id_count, pid_suffix_count,
+                                     excluded_tigrfam_count and gene_type_counts
+    """
+    if gene_type_counts is None:
+        gene_type_counts = final_results[gene_type_col].value_counts().reset_index()
+        gene_type_counts.columns = [gene_type_col, count_col]
+    hgnc_ids = final_results[hgnc_id_col].replace("", pd.NA)
+    pid_suffixes = final_results[pid_suffix_col].replace("", pd.NA)
+    return {
+        "result_count": len(final_results),
+        "hgnc_id_count": int(hgnc_ids.notna().sum()),
+        "pid_suffix_count": int(pid_suffixes.nunique(dropna=True)),
+        "excluded_tigrfam_count": excluded_tigrfam_count,
+        "gene_type_counts": {
+            str(gene_type): int(count)
+            for gene_type, count in zip(
+                gene_type_counts[gene_type_col], gene_type_counts[count_col]
+            )
+        },
+    }
+
+
 class GeneReader:
     """
     Provides functions for:
@@ -314,15 +348,24 @@ class GeneReader:
             f"UNIQUE_RECORD_COUNT: {gene_annotations_file_name} - {len(self._gene_annotations)}"
         )
 
+    def gene_type_counts(self) -> pd.DataFrame:
+        """
+        Count genes per gene_type
+        :return gene_type_counts: frame with gene_type and count columns
+        """
+        gene_type_counts = self._genes[gene_type_col].value_counts().reset_index()
+        gene_type_counts.columns = [gene_type_col, count_col]
+        return gene_type_counts
+
     def write_gene_type_count(self, results_dir: Path) -> None:
         """
         Writes the gene_type count to an output file: gene_type_count.csv
         :params results_dir: the results output directory
         """
         pipeline_logger.info(f"{self.__class__.__name__} writing gene type count...")
-        gene_type_counts = self._genes[gene_type_col].value_counts().reset_index()
-        gene_type_counts.columns = [gene_type_col, count_col]
-        gene_type_counts.to_csv(results_dir / gene_type_count_out_file, index=False)
+        self.gene_type_counts().to_csv(
+            results_dir / gene_type_count_out_file, index=False
+        )
 
     def determine_if_hgnc_id_exists(self) -> None:
         """
@@ -358,6 +401,15 @@ class GeneReader:
             self._genes, self._gene_annotations, how="inner", on=[col_one, col_two]
         )
 
+    def _excluded_tigrfam_mask(self) -> pd.Series:
+        """
+        True for merged rows where the tigrfam_id is null or in ('TIGR00658', 'TIGR00936')
+        """
+        merged = self._merged_genes_and_annotation_data
+        return merged[tigrfam_id_col].isnull() | merged[tigrfam_id_col].isin(
+            excluded_tigrfam_vals
+        )
+
     def exclude_tigrfram_and_write(self, results_dir: Path) -> None:
         """
         Exclude rows where the tigrfram_id is null or in ('TIGR00658', 'TIGR00936') and
@@ -365,10 +417,7 @@ class GeneReader:
         :params results_dir: the results dir
         """
         excluded_tigrfam = self._merged_genes_and_annotation_data[
-            (self._merged_genes_and_annotation_data[tigrfam_id_col].isnull())
-            | self._merged_genes_and_annotation_data[tigrfam_id_col].isin(
-                excluded_tigrfam_vals
-            )
+            self._excluded_tigrfam_mask()
         ]
         excluded_tigrfam.to_csv(results_dir / excluded_tigrfam_file_name)
 
@@ -382,18 +431,25 @@ class GeneReader:
         """
         pipeline_logger.info(f"{self.__class__.__name__} logging final records...")
         final_result = self._merged_genes_and_annotation_data[
-            ~(
-                (self._merged_genes_and_annotation_data[tigrfam_id_col].isnull())
-                | (
-                    self._merged_genes_and_annotation_data[tigrfam_id_col].isin(
-                        excluded_tigrfam_vals
-                    )
-                )
-            )
+            ~self._excluded_tigrfam_mask()
         ]
         pipeline_logger.info(f"FINAL_RECORD_COUNT: {len(final_result)}")
+        self._results = final_result
         final_result.to_csv(results_dir / final_results_file_name)
 
+    def summarize(self) -> dict:
+        """
+        Summarize the run from the frames already in memory, so the summary is
+        computed once at load time rather than by scanning stored results.
+        Call after write_gene_and_annotations_final.
+        :return summary: see summarize_results
+        """
+        return summarize_results(
+            self._results,
+            gene_type_counts=self.gene_type_counts(),
+            excluded_tigrfam_count=int(self._excluded_tigrfam_mask().sum()),
+        )
+
     @property
     def input_dir(self) -> Path:
         """
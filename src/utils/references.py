@@ -30,5 +30,7 @@ excluded_tigrfam_file_name = "excluded_tigrfam_ids.csv"
 tigrfam_id_col = "tigrfam_id"
 excluded_tigrfam_vals = ["TIGR00658", "TIGR00936"]
 final_results_file_name = "final_results.csv"
+# Left in the output directories of runs started from the web app
+ui_run_marker_file_name = ".ui_run"
 
 summary_styles = ["json", "txt"]
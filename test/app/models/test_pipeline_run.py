@@ -1,14 +1,29 @@
+import io
+import json
 import unittest
+import fakeredis
+import tempfile
 import sqlalchemy as sa
+import pandas as pd
+from pathlib import Path
+from unittest.mock import patch
 from src.app import create_app, db
 from test.app.test_config import TestConfig
 from src.app.models.researcher import Researcher
 from src.app.models.pipeline_run import PipelineRun, PipelineResult
+from src.app.models.pipeline_run_service import (
+    load_pipeline_results_into_db,
+    stream_pipeline_results,
+    compare_pipeline_runs,
+    get_latest_pipeline_run,
+    import_cli_output,
+)
 
 
 class TestPipelineRunModel(unittest.TestCase):
     def setUp(self):
         self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
         self.app_context = self.app.app_context()
         self.app_context.push()
         db.create_all()
@@ -96,3 +111,192 @@ class TestPipelineRunModel(unittest.TestCase):
         ).all()
         self.assertEqual(len(researcher_runs), 1)
         self.assertEqual(researcher_runs[0].id, run.id)
+
+    def test_load_results_computes_summary(self):
+        """Test that loading a CLI results directory stores the run summary"""
+        with tempfile.TemporaryDirectory() as tmp:
+            results_dir = Path(tmp) / "output_042225T155738" / "results"
+            results_dir.mkdir(parents=True)
+            pd.DataFrame(
+                {
+                    "gene_stable_id": ["ENSG1", "ENSG2", "ENSG3"],
+                    "gene_type": ["protein_coding", "protein_coding", "lncRNA"],
+                    "gene_name": ["A", "B", "C"],
+                    "hgnc_name": ["A", "", "C"],
+                    "hgnc_id": ["HGNC:1", None, "HGNC:3"],
+                    "panther_id": ["P:SF1", "P:SF1", "P:SF2"],
+                    "tigrfam_id": ["TIGR00001", "TIGR00002", "TIGR00003"],
+                    "wikigene_name": ["A", "B", "C"],
+                    "gene_description": ["a", "b", "c"],
+                    "pid_suffix": ["SF1", "SF1", "SF2"],
+                }
+            ).to_csv(results_dir / "final_results.csv")
+            pd.DataFrame(
+                {"gene_type": ["protein_coding", "lncRNA"], "count": [5, 2]}
+            ).to_csv(results_dir / "gene_type_count.csv", index=False)
+
+            with patch(
+                "src.app.models.pipeline_run_service.current_user", self.researcher
+            ):
+                run = load_pipeline_results_into_db(results_dir / "final_results.csv")
+
+        summary = db.session.get(PipelineRun, run.id).summary
+        self.assertEqual(summary.result_count, 3)
+        self.assertEqual(summary.hgnc_id_count, 2)
+        self.assertEqual(summary.pid_suffix_count, 2)
+        self.assertIsNone(summary.excluded_tigrfam_count)
+        self.assertEqual(summary.gene_type_counts, {"protein_coding": 5, "lncRNA": 2})
+        self.assertAlmostEqual(summary.to_dict()["hgnc_coverage"], 2 / 3)
+
+    def test_stream_pipeline_results(self):
+        """Test exporting a run's results in batches as CSV and NDJSON"""
+        run = PipelineRun(
+            pipeline_name="Gene ETL Pipeline",
+            pipeline_type="TEST",
+            output_dir="/some/output/dir",
+            status="complete",
+            researcher=self.researcher,
+        )
+        db.session.add(run)
+        db.session.flush()
+        for i in (3, 1, 2, 0, 4):
+            db.session.add(
+                PipelineResult(
+                    run_id=run.id,
+                    gene_stable_id=f"ENSG{i}",
+                    gene_type="protein_coding",
+                    gene_name=f"GENE,{i}",
+                )
+            )
+        db.session.commit()
+
+        chunks = list(stream_pipeline_results(run.id, "csv", batch_size=2))
+        # Header, then one chunk per database batch
+        self.assertEqual(len(chunks), 4)
+        rows = pd.read_csv(io.StringIO("".join(chunks)))
+        self.assertEqual(list(rows["gene_stable_id"]), [f"ENSG{i}" for i in range(5)])
+        self.assertEqual(rows["gene_name"][0], "GENE,0")
+
+        lines = "".join(stream_pipeline_results(run.id, "ndjson")).splitlines()
+        self.assertEqual(len(lines), 5)
+        self.assertEqual(json.loads(lines[4])["gene_stable_id"], "ENSG4")
+        self.assertIsNone(json.loads(lines[0])["hgnc_id"])
+
+        with self.assertRaises(ValueError):
+            next(stream_pipeline_results(run.id, "xml"))
+
+    def _run_with_results(self, output_dir, rows):
+        run = PipelineRun(
+            pipeline_name="Gene ETL Pipeline",
+            pipeline_type="TEST",
+            output_dir=output_dir,
+            status="complete",
+            researcher=self.researcher,
+        )
+        db.session.add(run)
+        db.session.flush()
+        for gene_stable_id, gene_name, hgnc_id in rows:
+            db.session.add(
+                PipelineResult(
+                    run_id=run.id,
+                    gene_stable_id=gene_stable_id,
+                    gene_type="protein_coding",
+                    gene_name=gene_name,
+                    hgnc_id=hgnc_id,
+                )
+            )
+        db.session.commit()
+        return run
+
+    def test_compare_pipeline_runs(self):
+        """Test the added, removed and changed genes between two runs"""
+        base = self._run_with_results(
+            "/output/base",
+            [
+                ("ENSG1", "A", None),
+                ("ENSG2", "B", "HGNC:2"),
+                ("ENSG3", "C", "HGNC:3"),
+                ("ENSG3", "C", "HGNC:33"),
+                ("ENSG4", "D", None),
+            ],
+        )
+        other = self._run_with_results(
+            "/output/other",
+            [
+                # None and "" hash alike, so ENSG1 is unchanged
+                ("ENSG1", "A", ""),
+                ("ENSG2", "B2", "HGNC:2"),
+                ("ENSG3", "C", "HGNC:3"),
+                ("ENSG5", "E", None),
+                ("ENSG6", "F", None),
+            ],
+        )
+
+        diff = compare_pipeline_runs(base.id, other.id, limit=1)
+        self.assertEqual(diff["added"], {"count": 2, "gene_stable_ids": ["ENSG5"]})
+        self.assertEqual(diff["removed"], {"count": 1, "gene_stable_ids": ["ENSG4"]})
+        self.assertEqual(diff["changed"]["count"], 2)
+
+        diff = compare_pipeline_runs(other.id, base.id)
+        self.assertEqual(diff["added"]["gene_stable_ids"], ["ENSG4"])
+        self.assertEqual(diff["changed"]["gene_stable_ids"], ["ENSG2", "ENSG3"])
+
+    def test_compare_rows_without_hash(self):
+        """Test that rows loaded before row_hash existed compare by value"""
+        base = self._run_with_results(
+            "/output/base", [("ENSG1", "A", None), ("ENSG2", "B", "HGNC:2")]
+        )
+        other = self._run_with_results(
+            "/output/other", [("ENSG1", "A", ""), ("ENSG2", "B2", "HGNC:2")]
+        )
+        db.session.execute(
+            sa.update(PipelineResult)
+            .where(PipelineResult.run_id == base.id)
+            .values(row_hash=None)
+        )
+        db.session.commit()
+
+        diff = compare_pipeline_runs(base.id, other.id)
+        self.assertEqual(diff["changed"]["gene_stable_ids"], ["ENSG2"])
+        diff = compare_pipeline_runs(other.id, base.id)
+        self.assertEqual(diff["changed"]["gene_stable_ids"], ["ENSG2"])
+
+    def test_latest_pipeline_run_cache(self):
+        """Test that the cached latest run follows newly added runs"""
+        self.assertIsNone(get_latest_pipeline_run())
+        first = self._run_with_results("/output/first", [])
+        self.assertEqual(get_latest_pipeline_run(), first)
+        second = self._run_with_results("/output/second", [])
+        self.assertEqual(get_latest_pipeline_run(), second)
+        self.assertEqual(int(self.app.redis.get("latest_id:pipeline_run")), second.id)
+
+    def test_import_cli_output_is_idempotent(self):
+        """Test importing a CLI output directory twice loads it once"""
+        with tempfile.TemporaryDirectory() as tmp:
+            output_dir = Path(tmp) / "output_042225T155738"
+            (output_dir / "results").mkdir(parents=True)
+            pd.DataFrame(
+                {
+                    column: ["x"]
+                    for column in (
+                        "gene_stable_id",
+                        "gene_type",
+                        "gene_name",
+                        "hgnc_name",
+                        "hgnc_id",
+                        "panther_id",
+                        "tigrfam_id",
+                        "wikigene_name",
+                        "gene_description",
+                        "pid_suffix",
+                    )
+                }
+            ).to_csv(output_dir / "results" / "final_results.csv")
+
+            run = import_cli_output(output_dir, self.researcher.id)
+            again = import_cli_output(output_dir, self.researcher.id)
+
+        self.assertEqual(run.id, again.id)
+        self.assertEqual(run.pipeline_type, "CLI")
+        self.assertEqual(run.researcher, self.researcher)
+        self.assertEqual(db.session.scalar(sa.func.count(PipelineRun.id)), 1)
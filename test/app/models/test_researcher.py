@@ -5,6 +5,7 @@ from unittest.mock import patch, MagicMock
 from datetime import datetime, timezone, timedelta
 from test.app.test_config import TestConfig
 from src.app.models.researcher import Researcher, Post, Notification, Message
+from src.app.models.pipeline_run import PipelineRun
 from src.app import create_app, db
 from test.app.test_search import (
     MockElasticsearch,
@@ -125,6 +126,116 @@ class TestResearcherModel(unittest.TestCase):
         self.assertEqual(f3, [p3, p4])
         self.assertEqual(f4, [p4])
 
+    def test_counters(self):
+        r1 = Researcher(researcher_name="john", email="john@example.com")
+        r2 = Researcher(researcher_name="susan", email="susan@example.com")
+        db.session.add_all([r1, r2])
+        db.session.commit()
+
+        # Counters change in the same transaction as the rows they count
+        r1.follow(r2)
+        db.session.add_all([Post(body="one", author=r1), Post(body="two", author=r1)])
+        db.session.add(Message(author=r2, recipient=r1, body="hi"))
+        db.session.flush()
+        self.assertEqual(r1.following_count(), 1)
+        self.assertEqual(r2.followers_count(), 1)
+        self.assertEqual(r1.posts_count(), 2)
+        self.assertEqual(r1.unread_messages_count(), 1)
+        db.session.rollback()
+        self.assertEqual(r1.following_count(), 0)
+        self.assertEqual(r1.posts_count(), 0)
+
+        post = Post(body="one", author=r1)
+        db.session.add(post)
+        db.session.commit()
+        db.session.delete(post)
+        db.session.commit()
+        self.assertEqual(r1.posts_count(), 0)
+
+    def test_repair_counters(self):
+        from src.app.counters import repair_counters
+
+        r1 = Researcher(researcher_name="john", email="john@example.com")
+        r2 = Researcher(researcher_name="susan", email="susan@example.com")
+        db.session.add_all([r1, r2])
+        db.session.commit()
+        r1.follow(r2)
+        db.session.add(Post(body="one", author=r2))
+        db.session.add(Message(author=r2, recipient=r1, body="hi"))
+        db.session.commit()
+        self.assertEqual(repair_counters(), 0)
+
+        db.session.execute(
+            sa.update(Researcher).values(
+                followers_counter=7,
+                following_counter=7,
+                posts_counter=7,
+                unread_messages_counter=7,
+            )
+        )
+        db.session.commit()
+        self.assertEqual(repair_counters(), 2)
+        self.assertEqual(
+            (r1.following_count(), r1.followers_count(), r1.posts_count()), (1, 0, 0)
+        )
+        self.assertEqual(
+            (r2.following_count(), r2.followers_count(), r2.posts_count()), (0, 1, 1)
+        )
+        self.assertEqual(r1.unread_messages_count(), 1)
+        self.assertEqual(r2.unread_messages_count(), 0)
+
+    def test_following_pipeline_runs(self):
+        r1 = Researcher(researcher_name="john", email="john@example.com")
+        r2 = Researcher(researcher_name="susan", email="susan@example.com")
+        r3 = Researcher(researcher_name="mary", email="mary@example.com")
+        r4 = Researcher(researcher_name="david", email="david@example.com")
+        db.session.add_all([r1, r2, r3, r4])
+        db.session.commit()
+        r1.follow(r2)
+        r1.follow(r3)
+        db.session.commit()
+
+        old = datetime.now(timezone.utc) - timedelta(days=200)
+        for i, (researcher, name, timestamp) in enumerate(
+            [
+                (r1, "Gene ETL", None),
+                (r2, "Gene ETL", None),
+                (r3, "Gene ETL", None),
+                (r3, "Gene ETL", None),
+                (r3, "Annotation QC", None),
+                (r3, "Gene ETL", old),
+                (r4, "Gene ETL", None),
+            ]
+        ):
+            db.session.add(
+                PipelineRun(
+                    pipeline_name=name,
+                    pipeline_type="TEST",
+                    output_dir=f"/output/{i}",
+                    researcher=researcher,
+                    timestamp=timestamp or datetime.now(timezone.utc),
+                )
+            )
+        db.session.commit()
+
+        self.assertEqual(
+            r1.following_pipeline_runs(),
+            [
+                (r3.id, "mary", 3, ["Annotation QC", "Gene ETL"]),
+                (r2.id, "susan", 1, ["Gene ETL"]),
+            ],
+        )
+        self.assertEqual(r2.following_pipeline_runs(), [])
+        self.assertEqual(
+            r1.following_activity()[0],
+            {
+                "id": r3.id,
+                "researcher_name": "mary",
+                "total_runs": 3,
+                "pipelines": ["Annotation QC", "Gene ETL"],
+            },
+        )
+
     def test_add_notification(self):
         r1 = Researcher(researcher_name="john", email="john@example.com")
         db.session.add(r1)
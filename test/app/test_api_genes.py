@@ -0,0 +1,75 @@
+import unittest
+from src.app import create_app, db
+from src.app.models.gene import Gene, GeneAnnotation
+from src.app.models.researcher import Researcher
+from test.app.test_config import TestConfig
+
+
+class GeneLookupTestConfig(TestConfig):
+    GENE_LOOKUP_MAX_IDS = 10
+    GENE_LOOKUP_CHUNK_SIZE = 2
+
+
+class TestGeneLookup(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(GeneLookupTestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        researcher = Researcher(researcher_name="john", email="john@example.com")
+        db.session.add(researcher)
+        for i in range(3):
+            db.session.add(Gene(gene_stable_id=f"ENSG{i}", hgnc_id=f"HGNC:{i}"))
+            db.session.add(GeneAnnotation(gene_stable_id=f"ENSG{i}", panther_id="P"))
+        db.session.add(GeneAnnotation(gene_stable_id="ENSG9", hgnc_id="HGNC:9"))
+        db.session.commit()
+        self.headers = {"Authorization": f"Bearer {researcher.get_token()}"}
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _lookup(self, payload):
+        return self.client.post("/api/genes/lookup", json=payload, headers=self.headers)
+
+    def test_lookup_merges_genes_and_annotations(self):
+        response = self._lookup(
+            {
+                "gene_stable_ids": ["ENSG2", "ENSG0", "ENSG0", "ENSG7"],
+                "hgnc_ids": ["HGNC:1", "HGNC:9", "HGNC:8"],
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(
+            [r["gene_stable_id"] for r in data["items"]],
+            ["ENSG2", "ENSG0", "ENSG1", "ENSG9"],
+        )
+        self.assertEqual(len(data["items"][0]["genes"]), 1)
+        self.assertEqual(data["items"][0]["annotations"][0]["panther_id"], "P")
+        self.assertEqual(data["items"][3]["genes"], [])
+        self.assertEqual(data["hgnc_ids"], {"HGNC:1": ["ENSG1"], "HGNC:9": ["ENSG9"]})
+        self.assertEqual(data["not_found"], ["ENSG7", "HGNC:8"])
+
+    def test_blank_ids_are_ignored(self):
+        response = self._lookup(
+            {"gene_stable_ids": [" ENSG0 ", " ", "", None], "hgnc_ids": ["  "]}
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual([r["gene_stable_id"] for r in data["items"]], ["ENSG0"])
+        self.assertEqual(data["not_found"], [])
+
+    def test_lookup_validation(self):
+        self.assertEqual(self._lookup({}).status_code, 400)
+        self.assertEqual(self._lookup({"hgnc_ids": "HGNC:1"}).status_code, 400)
+        self.assertEqual(self._lookup(["ENSG0"]).status_code, 400)
+        too_many = [f"ENSG{i}" for i in range(11)]
+        self.assertEqual(self._lookup({"gene_stable_ids": too_many}).status_code, 400)
+        response = self.client.post(
+            "/api/genes/lookup", json={"gene_stable_ids": ["ENSG0"]}
+        )
+        self.assertEqual(response.status_code, 401)
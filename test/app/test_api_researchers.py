@@ -0,0 +1,144 @@
+import unittest
+import fakeredis
+import sqlalchemy as sa
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.models.researcher import Researcher, Post
+from src.app.models.pipeline_run import PipelineRun
+from test.app.test_config import TestConfig
+
+
+class TestFollowingActivityAPI(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        db.session.add(self.john)
+        for i in range(3):
+            other = Researcher(researcher_name=f"r{i}", email=f"r{i}@example.com")
+            db.session.add(other)
+            for j in range(i + 1):
+                db.session.add(
+                    PipelineRun(
+                        pipeline_name="Gene ETL",
+                        pipeline_type="TEST",
+                        output_dir=f"/output/{i}/{j}",
+                        researcher=other,
+                    )
+                )
+            self.john.follow(other)
+        db.session.commit()
+        self.headers = {"Authorization": f"Bearer {self.john.get_token()}"}
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_paginated_activity(self):
+        url = f"/api/researchers/{self.john.id}/following_activity?per_page=2"
+        first = self.client.get(url, headers=self.headers).get_json()
+        self.assertEqual([a["researcher_name"] for a in first["items"]], ["r2", "r1"])
+        self.assertEqual(first["_meta"]["total_items"], 3)
+        self.assertEqual(first["_meta"]["total_pages"], 2)
+        self.assertIsNone(first["_links"]["prev"])
+
+        second = self.client.get(first["_links"]["next"], headers=self.headers)
+        second = second.get_json()
+        self.assertEqual(second["items"][0]["total_runs"], 1)
+        self.assertIsNone(second["_links"]["next"])
+        self.assertTrue(self.app.redis.exists(f"following_activity:{self.john.id}"))
+
+    def test_per_page_is_clamped(self):
+        url = f"/api/researchers/{self.john.id}/following_activity"
+        for per_page in (0, -5):
+            response = self.client.get(
+                f"{url}?per_page={per_page}", headers=self.headers
+            )
+            self.assertEqual(response.status_code, 200)
+            data = response.get_json()
+            self.assertEqual(data["_meta"]["per_page"], 1)
+            self.assertEqual(data["_meta"]["total_pages"], 3)
+            self.assertEqual(len(data["items"]), 1)
+
+    def test_unknown_researcher(self):
+        response = self.client.get(
+            "/api/researchers/99/following_activity", headers=self.headers
+        )
+        self.assertEqual(response.status_code, 404)
+
+
+@patch("src.app.search.add_to_index", lambda *args, **kwargs: None)
+class TestResearcherCollectionQueries(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        researchers = [
+            Researcher(researcher_name=f"r{i}", email=f"r{i}@example.com")
+            for i in range(6)
+        ]
+        db.session.add_all(researchers)
+        db.session.commit()
+        for i, researcher in enumerate(researchers):
+            for other in researchers[:i]:
+                researcher.follow(other)
+            db.session.add(Post(body="hello", author=researcher))
+        db.session.commit()
+        self.researchers = researchers
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _collection(self, per_page, **kwargs):
+        statements = []
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        db.session.expire_all()
+        sa.event.listen(db.engine, "before_cursor_execute", count)
+        try:
+            with self.app.test_request_context():
+                data = Researcher.to_collection_dict(
+                    sa.select(Researcher), 1, per_page, "api.get_researchers", **kwargs
+                )
+        finally:
+            sa.event.remove(db.engine, "before_cursor_execute", count)
+        self.statements = statements
+        return data, len(statements)
+
+    def test_fixed_queries_per_page(self):
+        small, small_queries = self._collection(2)
+        large, large_queries = self._collection(6)
+        self.assertEqual(small_queries, large_queries)
+        by_name = {r["researcher_name"]: r for r in large["items"]}
+        self.assertEqual(by_name["r0"]["follower_count"], 5)
+        self.assertEqual(by_name["r0"]["following_count"], 0)
+        self.assertEqual(by_name["r5"]["following_count"], 5)
+        self.assertEqual(by_name["r5"]["post_count"], 1)
+        with self.app.test_request_context():
+            self.assertEqual(by_name["r3"], self.researchers[3].to_dict())
+
+    def test_sparse_fieldset(self):
+        fields = Researcher.parse_fields("id, follower_count")
+        data, unused_queries = self._collection(2, cursor="", fields=fields)
+        self.assertEqual(data["items"][0], {"id": 1, "follower_count": 5})
+        self.assertIn("fields=id,follower_count", data["_links"]["next"])
+        select = self.statements[-1]
+        self.assertIn("followers_counter", select)
+        self.assertNotIn("email", select)
+        self.assertNotIn("about_me", select)
+
+    def test_unknown_field(self):
+        with self.assertRaises(ValueError):
+            Researcher.parse_fields("id,password_hash")
+        self.assertIsNone(Researcher.parse_fields(""))
@@ -0,0 +1,114 @@
+import unittest
+import fakeredis
+import sqlalchemy as sa
+from unittest.mock import patch
+from redis.exceptions import ConnectionError
+from src.app import create_app, db
+from src.app.cache import cached_count, cached_fragment, invalidate_counts
+from src.app.models.gene import Gene
+from src.app.models.researcher import Researcher, Post
+from test.app.test_config import TestConfig
+
+
+class TestCountCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_count_is_cached(self):
+        db.session.add_all([Gene(gene_stable_id="ENSG1"), Gene(gene_stable_id="ENSG2")])
+        db.session.commit()
+        self.assertEqual(cached_count("gene", sa.select(Gene)), 2)
+
+        # A row written behind the ORM's back is not seen until invalidation
+        db.session.execute(sa.insert(Gene).values(gene_stable_id="ENSG3"))
+        db.session.commit()
+        self.assertEqual(cached_count("gene", sa.select(Gene)), 2)
+        invalidate_counts("gene")
+        self.assertEqual(cached_count("gene", sa.select(Gene)), 3)
+
+    def test_commit_invalidates_count(self):
+        self.assertEqual(cached_count("gene", sa.select(Gene)), 0)
+        db.session.add(Gene(gene_stable_id="ENSG1"))
+        db.session.flush()
+        db.session.commit()
+        self.assertEqual(cached_count("gene", sa.select(Gene)), 1)
+
+    @patch("src.app.search.add_to_index", lambda *args, **kwargs: None)
+    def test_scoped_count_invalidation(self):
+        r = Researcher(researcher_name="john", email="john@example.com")
+        db.session.add(r)
+        db.session.commit()
+        query = r.posts.select()
+        self.assertEqual(cached_count(f"posts:{r.id}", query), 0)
+        db.session.add(Post(body="hello", author=r))
+        db.session.commit()
+        self.assertEqual(cached_count(f"posts:{r.id}", query), 1)
+
+    def test_rollback_keeps_count(self):
+        self.assertEqual(cached_count("gene", sa.select(Gene)), 0)
+        db.session.add(Gene(gene_stable_id="ENSG1"))
+        db.session.flush()
+        db.session.rollback()
+        self.assertIsNotNone(self.app.redis.get("row_count:gene"))
+
+    def test_falls_back_without_redis(self):
+        db.session.add(Gene(gene_stable_id="ENSG1"))
+        db.session.commit()
+        with patch.object(self.app.redis, "get", side_effect=ConnectionError()):
+            with patch.object(self.app.redis, "set", side_effect=ConnectionError()):
+                self.assertEqual(cached_count("gene", sa.select(Gene)), 1)
+
+
+class TestFragmentCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.renders = 0
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _render(self):
+        self.renders += 1
+        count = db.session.scalar(sa.select(sa.func.count()).select_from(Gene))
+        return f"<p>{count} genes</p>"
+
+    def test_fragment_is_cached_until_data_changes(self):
+        self.assertEqual(
+            cached_fragment("genes", ["gene"], self._render), "<p>0 genes</p>"
+        )
+        self.assertEqual(
+            cached_fragment("genes", ["gene"], self._render), "<p>0 genes</p>"
+        )
+        self.assertEqual(self.renders, 1)
+
+        db.session.add(Gene(gene_stable_id="ENSG1"))
+        db.session.commit()
+        self.assertEqual(
+            cached_fragment("genes", ["gene"], self._render), "<p>1 genes</p>"
+        )
+        self.assertEqual(self.renders, 2)
+
+    def test_fragment_is_markup(self):
+        fragment = cached_fragment("genes", ["gene"], self._render)
+        self.assertEqual(fragment.__html__(), "<p>0 genes</p>")
+
+    def test_renders_without_redis(self):
+        with patch.object(self.app.redis, "pipeline", side_effect=ConnectionError()):
+            cached_fragment("genes", ["gene"], self._render)
+            cached_fragment("genes", ["gene"], self._render)
+        self.assertEqual(self.renders, 2)
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
+import tempfile
 import unittest
 import logging
 import sqlalchemy as sa
@@ -78,3 +79,67 @@ class TestCliLogging(unittest.TestCase):
 
         # Check the result is our mocked console logger
         self.assertEqual(result, mock_console_logger)
+
+
+class TestSummarizeRuns(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.output_dir = tempfile.TemporaryDirectory()
+        results_dir = Path(self.output_dir.name) / "results"
+        results_dir.mkdir()
+        (results_dir / "gene_type_count.csv").write_text(
+            "gene_type,count\nprotein_coding,10\nlncRNA,4\n"
+        )
+        (results_dir / "excluded_tigrfam_ids.csv").write_text(
+            ",tigrfam_id\n0,T1\n1,T2\n"
+        )
+        researcher = Researcher(researcher_name="john", email="john@example.com")
+        self.kept = PipelineRun(
+            pipeline_name="p",
+            pipeline_type="CLI",
+            output_dir=self.output_dir.name,
+            researcher=researcher,
+        )
+        self.gone = PipelineRun(
+            pipeline_name="p",
+            pipeline_type="CLI",
+            output_dir="/nonexistent/output",
+            researcher=researcher,
+        )
+        db.session.add_all([self.kept, self.gone])
+        db.session.flush()
+        for run in (self.kept, self.gone):
+            db.session.add(
+                PipelineResult(
+                    run_id=run.id,
+                    gene_stable_id="ENSG00000000001",
+                    gene_type="protein_coding",
+                    gene_name="gene",
+                    hgnc_id="HGNC:1",
+                )
+            )
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.output_dir.cleanup()
+
+    def test_summaries_match_load_time_summaries(self):
+        result = self.app.test_cli_runner().invoke(args=["summarize-runs"])
+        self.assertIn("Summarized 2 runs", result.output)
+
+        summary = db.session.get(PipelineRun, self.kept.id).summary
+        self.assertEqual(summary.result_count, 1)
+        self.assertEqual(summary.gene_type_counts, {"protein_coding": 10, "lncRNA": 4})
+        self.assertEqual(summary.excluded_tigrfam_count, 2)
+
+        # Without the results directory only the result-derived figures are known
+        summary = db.session.get(PipelineRun, self.gone.id).summary
+        self.assertEqual(summary.hgnc_id_count, 1)
+        self.assertEqual(summary.gene_type_counts, {})
+        self.assertIsNone(summary.excluded_tigrfam_count)
@@ -0,0 +1,62 @@
+import gzip
+import json
+import unittest
+from flask import Response
+from src.app import create_app
+from test.app.test_config import TestConfig
+
+
+class TestCompression(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.rows = [f"ENSG{i:011d},protein_coding\n" for i in range(200)]
+
+        @self.app.route("/test/large")
+        def large():
+            return {"items": self.rows}
+
+        @self.app.route("/test/small")
+        def small():
+            return {"items": self.rows[:1]}
+
+        @self.app.route("/test/stream")
+        def stream():
+            return Response((row for row in self.rows), mimetype="text/csv")
+
+        @self.app.route("/test/image")
+        def image():
+            return Response(b"\0" * 4096, mimetype="image/png")
+
+        self.client = self.app.test_client()
+        self.gzip = {"Accept-Encoding": "gzip"}
+
+    def test_large_response_is_compressed(self):
+        response = self.client.get("/test/large", headers=self.gzip)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        self.assertLess(int(response.headers["Content-Length"]), 4096)
+        body = json.loads(gzip.decompress(response.data))
+        self.assertEqual(body["items"], self.rows)
+
+    def test_not_compressed_unless_accepted(self):
+        response = self.client.get("/test/large")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_json()["items"], self.rows)
+
+    def test_small_response_is_not_compressed(self):
+        response = self.client.get("/test/small", headers=self.gzip)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_other_mimetypes_are_not_compressed(self):
+        response = self.client.get("/test/image", headers=self.gzip)
+        self.assertNotIn("Content-Encoding", response.headers)
+
+    def test_streamed_response_is_compressed(self):
+        response = self.client.get("/test/stream", headers=self.gzip)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.data).decode(), "".join(self.rows))
+
+    def test_disabled(self):
+        self.app.config["COMPRESSION_ENABLED"] = False
+        response = self.client.get("/test/large", headers=self.gzip)
+        self.assertNotIn("Content-Encoding", response.headers)
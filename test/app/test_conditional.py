@@ -0,0 +1,102 @@
+import unittest
+import fakeredis
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.cache import data_version, mark_redis_down, set_task_progress
+from src.app.models.researcher import Researcher, Task
+from test.app.test_config import TestConfig
+
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        self.susan = Researcher(researcher_name="susan", email="susan@example.com")
+        db.session.add_all([self.john, self.susan])
+        db.session.commit()
+        self.headers = {"Authorization": f"Bearer {self.john.get_token()}"}
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_data_version_changes_on_commit(self):
+        version, unused_modified = data_version("researcher")
+        self.susan.about_me = "Genomics"
+        db.session.commit()
+        self.assertEqual(data_version("researcher")[0], version + 1)
+
+        # Counter updates bypass the unit of work but still change the version
+        self.john.follow(self.susan)
+        db.session.commit()
+        self.assertEqual(data_version("researcher")[0], version + 2)
+
+    def test_not_modified(self):
+        response = self.client.get("/api/researchers", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        self.assertIn("Last-Modified", response.headers)
+
+        with patch("src.app.models.researcher.Researcher.to_collection_dict") as view:
+            response = self.client.get(
+                "/api/researchers", headers={**self.headers, "If-None-Match": etag}
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        view.assert_not_called()
+
+        # A different page is a different resource
+        response = self.client.get(
+            "/api/researchers?page=2", headers={**self.headers, "If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_modified_after_follow(self):
+        url = f"/api/researchers/{self.susan.id}/followers"
+        etag = self.client.get(url, headers=self.headers).headers["ETag"]
+        self.john.follow(self.susan)
+        db.session.commit()
+        response = self.client.get(url, headers={**self.headers, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["items"]), 1)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_page_follows_researcher_and_tasks(self):
+        self.john.set_password("cat")
+        db.session.commit()
+        self.client.post(
+            "/auth/login", data={"researcher_name": "john", "password": "cat"}
+        )
+
+        def etag():
+            response = self.client.get("/explore/genes")
+            self.assertEqual(response.status_code, 200)
+            return response.headers["ETag"]
+
+        first = etag()
+        self.assertEqual(etag(), first)
+        db.session.add(Task(id="job-1", name="export_table", researcher=self.john))
+        db.session.commit()
+        set_task_progress(self.john.id, "job-1", 10)
+        running = etag()
+        self.assertNotEqual(running, first)
+        set_task_progress(self.john.id, "job-1", 50)
+        self.assertNotEqual(etag(), running)
+
+        renamed = etag()
+        self.john.researcher_name = "johnny"
+        db.session.commit()
+        self.assertNotEqual(etag(), renamed)
+
+    def test_no_validators_without_redis(self):
+        mark_redis_down()
+        response = self.client.get("/api/researchers", headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)
@@ -17,6 +17,9 @@ class TestConfig(Config):
     # Translation service
     MS_TRANSLATOR_KEY = "dummy-key"
 
+    # Tests poll the ETL watcher explicitly
+    ETL_WATCH_INTERVAL = 0
+
     # Disable error emails during testing
     ADMINS = []
 
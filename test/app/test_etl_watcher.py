@@ -0,0 +1,117 @@
+import os
+import tempfile
+import unittest
+import fakeredis
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.etl_watcher import EtlOutputWatcher
+from src.app.models.pipeline_run import PipelineRun
+from src.app.models.researcher import Researcher
+from test.app.test_config import TestConfig
+
+
+class TestEtlOutputWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.etl_dir = Path(self.tmp.name)
+        self.watcher = EtlOutputWatcher(self.etl_dir, interval=0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _make_run(self, name, with_results=True):
+        results_dir = self.etl_dir / name / "results"
+        results_dir.mkdir(parents=True)
+        if with_results:
+            (results_dir / "final_results.csv").write_text("gene_stable_id\n")
+        # Make sure the directory mtime moves even on coarse filesystems
+        stat = self.etl_dir.stat()
+        os.utime(self.etl_dir, (stat.st_atime, stat.st_mtime + 1))
+        return self.etl_dir / name
+
+    def test_reports_newest_run_once(self):
+        self._make_run("output_042025T234434")
+        newest = self._make_run("output_061125T170450")
+        self.watcher.poll()
+        self.assertEqual(self.watcher.claim_pending(), newest)
+        self.watcher.poll()
+        self.assertIsNone(self.watcher.claim_pending())
+
+    def test_waits_for_final_results(self):
+        run_dir = self._make_run("output_061125T170450", with_results=False)
+        self.watcher.poll()
+        self.assertIsNone(self.watcher.claim_pending())
+        (run_dir / "results" / "final_results.csv").write_text("gene_stable_id\n")
+        self.watcher.poll()
+        self.assertEqual(self.watcher.claim_pending(), run_dir)
+
+    def test_release_reports_again(self):
+        run_dir = self._make_run("output_061125T170450")
+        self.watcher.poll()
+        self.watcher.release(self.watcher.claim_pending())
+        self.watcher.poll()
+        self.assertEqual(self.watcher.claim_pending(), run_dir)
+
+    def test_skips_ui_runs(self):
+        run_dir = self._make_run("output_061125T170450")
+        (run_dir / ".ui_run").touch()
+        self.watcher.poll()
+        self.assertIsNone(self.watcher.claim_pending())
+
+    def test_missing_directory(self):
+        watcher = EtlOutputWatcher(self.etl_dir / "missing", interval=0)
+        watcher.poll()
+        self.assertIsNone(watcher.claim_pending())
+
+
+class TestQueueCliImport(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.etl_dir = Path(self.tmp.name)
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app.etl_watcher = EtlOutputWatcher(self.etl_dir, interval=0)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        self.john.set_password("cat")
+        db.session.add(self.john)
+        db.session.add(
+            PipelineRun(
+                pipeline_name="p",
+                pipeline_type="UI",
+                output_dir="/tmp/output_061125T170450/results",
+                timestamp=datetime(2025, 6, 11, 17, 4, 50),
+                researcher=self.john,
+            )
+        )
+        db.session.commit()
+        self.client = self.app.test_client()
+        self.client.post(
+            "/auth/login", data={"researcher_name": "john", "password": "cat"}
+        )
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.tmp.cleanup()
+
+    def _import_queued(self, name):
+        (self.etl_dir / name / "results").mkdir(parents=True)
+        (self.etl_dir / name / "results" / "final_results.csv").touch()
+        self.app.etl_watcher.poll()
+        queue = self.app.task_queues["pipeline"]
+        with patch.object(queue, "enqueue") as enqueue:
+            enqueue.return_value.get_id.return_value = name
+            self.client.get("/index")
+        return enqueue.called
+
+    def test_runs_not_newer_than_latest_are_skipped(self):
+        self.assertFalse(self._import_queued("output_061125T170450"))
+
+    def test_newer_run_is_queued(self):
+        self.assertTrue(self._import_queued("output_061225T090000"))
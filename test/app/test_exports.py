@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timezone, timedelta
+from pathlib import Path
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.exports import write_posts_export, write_table_export, export_filename
+from src.app.models.gene import Gene
+from src.app.models.pipeline_run import PipelineRun, PipelineResult
+from src.app.models.researcher import Researcher, Post, Task
+from test.app.test_config import TestConfig
+
+
+class TestPostsExport(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        susan = Researcher(researcher_name="susan", email="susan@example.com")
+        now = datetime.now(timezone.utc)
+        posts = [
+            Post(body=f"post {i}", author=self.john, timestamp=now + timedelta(i))
+            for i in range(5)
+        ]
+        db.session.add_all([self.john, susan, *reversed(posts)])
+        db.session.add(Post(body="not john's", author=susan, timestamp=now))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_posts_written_in_batches(self):
+        export = io.StringIO()
+        percents = []
+        written = write_posts_export(
+            self.john.id, export, batch_size=2, progress=percents.append
+        )
+        self.assertEqual(written, 5)
+        posts = json.loads(export.getvalue())["posts"]
+        self.assertEqual(
+            [post["body"] for post in posts], [f"post {i}" for i in range(5)]
+        )
+        self.assertTrue(posts[0]["timestamp"].endswith("Z"))
+        # One report per batch; completion is left to the caller
+        self.assertEqual(percents, [40, 80, 99])
+
+    def test_no_posts(self):
+        researcher = Researcher(researcher_name="new", email="new@example.com")
+        db.session.add(researcher)
+        db.session.commit()
+        export = io.StringIO()
+        self.assertEqual(write_posts_export(researcher.id, export, batch_size=2), 0)
+        self.assertEqual(json.loads(export.getvalue()), {"posts": []})
+
+
+class TestTableExport(unittest.TestCase):
+    def setUp(self):
+        self.export_dir = tempfile.TemporaryDirectory()
+        self.app = create_app(TestConfig)
+        self.app.config["EXPORT_DIR"] = self.export_dir.name
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        self.john.set_password("cat")
+        db.session.add(self.john)
+        db.session.add_all(
+            Gene(gene_stable_id=f"ENSG{i:011d}", gene_type="protein_coding")
+            for i in range(5)
+        )
+        runs = [
+            PipelineRun(
+                pipeline_name="p",
+                pipeline_type="UI",
+                output_dir=f"/tmp/run{i}",
+                researcher=self.john,
+            )
+            for i in range(2)
+        ]
+        db.session.add_all(runs)
+        db.session.flush()
+        for run in runs:
+            db.session.add_all(
+                PipelineResult(
+                    run_id=run.id,
+                    gene_stable_id=f"ENSG{i:011d}",
+                    gene_type="protein_coding",
+                    gene_name=f"gene {i}",
+                )
+                for i in range(3)
+            )
+        db.session.commit()
+        self.run_id = runs[0].id
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        self.export_dir.cleanup()
+
+    def read_export(self, filename):
+        with open(Path(self.export_dir.name) / filename, newline="") as file:
+            return list(csv.reader(file))
+
+    def test_table_written_in_batches(self):
+        percents = []
+        written = write_table_export(
+            "gene", "csv", "genes.csv", batch_size=2, progress=percents.append
+        )
+        self.assertEqual(written, 5)
+        rows = self.read_export("genes.csv")
+        self.assertIn("gene_stable_id", rows[0])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(percents, [40, 80, 99])
+        self.assertEqual(os.listdir(self.export_dir.name), ["genes.csv"])
+
+    def test_run_results(self):
+        filename = export_filename("pipeline_result", "csv", "job-1", self.run_id)
+        write_table_export(
+            "pipeline_result", "csv", filename, batch_size=10, run_id=self.run_id
+        )
+        rows = self.read_export(filename)
+        self.assertEqual(rows[0][0], "gene_stable_id")
+        self.assertEqual(len(rows), 4)
+
+    def test_failed_export_leaves_no_file(self):
+        with patch("src.app.exports.csv.writer", side_effect=OSError):
+            with self.assertRaises(OSError):
+                write_table_export("gene", "csv", "genes.csv", batch_size=2)
+        self.assertEqual(os.listdir(self.export_dir.name), [])
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            write_table_export("gene", "xlsx", "genes.xlsx", batch_size=2)
+
+    def test_launch_and_download(self):
+        client = self.app.test_client()
+        client.post("/auth/login", data={"researcher_name": "john", "password": "cat"})
+        self.assertEqual(client.get("/export/researcher").status_code, 400)
+        self.assertEqual(client.get("/export/pipeline_result").status_code, 400)
+        with patch.object(self.app.task_queues["bulk"], "enqueue") as enqueue:
+            enqueue.return_value.get_id.return_value = "job-1"
+            response = client.get(f"/export/pipeline_result?run_id={self.run_id}")
+        self.assertEqual(response.status_code, 302)
+        enqueue.assert_called_once_with(
+            "src.app.tasks.export_table",
+            self.john.id,
+            "pipeline_result",
+            "csv",
+            self.run_id,
+        )
+        self.assertEqual(client.get("/exports/job-1").status_code, 404)
+
+        task = db.session.get(Task, "job-1")
+        task.artifact = export_filename("pipeline_result", "csv", "job-1", self.run_id)
+        task.complete = True
+        db.session.commit()
+        write_table_export(
+            "pipeline_result", "csv", task.artifact, batch_size=10, run_id=self.run_id
+        )
+        response = client.get("/exports/job-1")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"gene_stable_id", response.data)
+        response.close()
+        self.assertIn(b"/exports/job-1", client.get("/researcher/john").data)
+
+    def test_download_is_private(self):
+        susan = Researcher(researcher_name="susan", email="susan@example.com")
+        susan.set_password("dog")
+        db.session.add(susan)
+        db.session.add(
+            Task(
+                id="job-2",
+                name="export_table",
+                researcher=self.john,
+                complete=True,
+                artifact="genes.csv",
+            )
+        )
+        db.session.commit()
+        write_table_export("gene", "csv", "genes.csv", batch_size=10)
+        client = self.app.test_client()
+        client.post("/auth/login", data={"researcher_name": "susan", "password": "dog"})
+        self.assertEqual(client.get("/exports/job-2").status_code, 404)
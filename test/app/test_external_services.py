@@ -0,0 +1,41 @@
+import unittest
+import requests
+from unittest.mock import MagicMock, patch
+from elasticsearch import ConnectionTimeout
+from src.app import create_app
+from src.app.search import query_index
+from src.app.translate import translate
+from test.app.test_config import TestConfig
+
+
+class TestExternalServices(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_translate_uses_shared_session(self):
+        response = MagicMock(status_code=200)
+        response.json.return_value = [{"translations": [{"text": "hola"}]}]
+        with patch.object(self.app.http, "post", return_value=response) as post:
+            self.assertEqual(translate("hello", "en", "es"), "hola")
+            self.assertEqual(translate("hello", "en", "es"), "hola")
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(
+            post.call_args.kwargs["timeout"], self.app.config["TRANSLATOR_TIMEOUT"]
+        )
+
+    def test_translate_timeout(self):
+        with patch.object(self.app.http, "post", side_effect=requests.Timeout()):
+            self.assertEqual(
+                translate("hello", "en", "es"),
+                "Error: the translation service failed.",
+            )
+
+    def test_search_timeout(self):
+        self.app.elasticsearch = MagicMock()
+        self.app.elasticsearch.search.side_effect = ConnectionTimeout("timed out")
+        self.assertEqual(query_index("post", "gene", 1, 10), ([], 0))
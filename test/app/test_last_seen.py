@@ -0,0 +1,103 @@
+import unittest
+import fakeredis
+import sqlalchemy as sa
+from datetime import datetime, timezone, timedelta
+from unittest.mock import patch
+from redis.exceptions import ConnectionError
+from src.app import create_app, db
+from src.app.cache import data_version
+from src.app.last_seen import LastSeenBuffer, LAST_SEEN_KEY
+from src.app.models.researcher import Researcher
+from test.app.test_config import TestConfig
+
+
+class TestLastSeenBuffer(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        self.susan = Researcher(researcher_name="susan", email="susan@example.com")
+        db.session.add_all([self.john, self.susan])
+        db.session.commit()
+        self.buffer = LastSeenBuffer(flush_interval=60, resolution=60)
+        self.when = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def last_seen(self, researcher):
+        return db.session.scalar(
+            sa.select(Researcher.last_seen).where(Researcher.id == researcher.id)
+        )
+
+    def test_record_is_buffered_until_flush(self):
+        created = self.john.last_seen
+        self.buffer.record(self.john.id, self.when)
+        self.buffer.record(self.susan.id, self.when)
+        self.assertEqual(self.app.redis.hlen(LAST_SEEN_KEY), 2)
+        self.assertEqual(self.last_seen(self.john), created)
+        # Not due yet
+        self.assertEqual(self.buffer.flush_if_due(), 0)
+
+        self.assertEqual(self.buffer.flush(), 2)
+        self.assertEqual(
+            self.last_seen(self.john),
+            self.when.replace(tzinfo=None),
+        )
+        self.assertEqual(self.app.redis.hlen(LAST_SEEN_KEY), 0)
+
+    def test_repeat_requests_are_not_recorded(self):
+        self.buffer.record(self.john.id, self.when)
+        self.buffer.record(self.john.id, self.when + timedelta(seconds=5))
+        self.buffer.flush()
+        self.assertEqual(
+            self.last_seen(self.john),
+            self.when.replace(tzinfo=None),
+        )
+
+    def test_flush_lock_is_shared(self):
+        self.buffer.record(self.john.id, self.when)
+        other = LastSeenBuffer(flush_interval=60, resolution=60)
+        self.assertEqual(other.flush(), 1)
+        self.buffer.record(self.susan.id, self.when)
+        # The first process flushed within the interval, the hash waits
+        self.assertEqual(self.buffer.flush(), 0)
+        self.assertEqual(self.app.redis.hlen(LAST_SEEN_KEY), 1)
+
+    def test_buffers_in_memory_without_redis(self):
+        with patch.object(self.app.redis, "hset", side_effect=ConnectionError()):
+            self.buffer.record(self.john.id, self.when)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertEqual(
+            self.last_seen(self.john),
+            self.when.replace(tzinfo=None),
+        )
+
+    def test_flush_leaves_request_session_alone(self):
+        version = data_version("researcher")
+        john = db.session.get(Researcher, self.john.id)
+        john.about_me = "unsaved"
+        self.buffer.record(self.john.id, self.when)
+        self.assertEqual(self.buffer.flush(), 1)
+        self.assertIn(john, db.session.dirty)
+        self.assertEqual(john.about_me, "unsaved")
+        self.assertEqual(data_version("researcher")[0], version[0] + 1)
+
+    def test_flush_changes_researcher_etag(self):
+        headers = {"Authorization": f"Bearer {self.john.get_token()}"}
+        db.session.commit()
+        client = self.app.test_client()
+        url = f"/api/researcher/{self.john.id}"
+        etag = client.get(url, headers=headers).headers["ETag"]
+        self.buffer.record(self.john.id, self.when)
+        self.buffer.flush()
+        # Requests share the test's session, which still holds the old row
+        db.session.expire_all()
+        response = client.get(url, headers={**headers, "If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.get_json()["last_seen"].startswith("2026-01-02"))
@@ -0,0 +1,132 @@
+import json
+import unittest
+import threading
+import fakeredis
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.cache import mark_redis_down
+from src.app.models.researcher import Researcher
+from src.app.notifications import notification_events, notification_stream_limit
+from test.app.test_config import TestConfig
+
+
+class TestNotificationStream(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        self.john.set_password("cat")
+        db.session.add(self.john)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_published_on_commit(self):
+        pubsub = self.app.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(f"notifications:{self.john.id}")
+        self.john.add_notification("unread_message_count", 3)
+        self.assertIsNone(pubsub.get_message(timeout=0.1))
+        db.session.commit()
+        message = pubsub.get_message(timeout=1)
+        notification = json.loads(message["data"])
+        self.assertEqual(notification["name"], "unread_message_count")
+        self.assertEqual(notification["data"], 3)
+        pubsub.close()
+
+    def test_rolled_back_notification_is_not_published(self):
+        self.john.add_notification("unread_message_count", 3)
+        db.session.rollback()
+        db.session.commit()
+        self.assertEqual(
+            self.app.redis.hgetall(f"notifications_latest:{self.john.id}"), {}
+        )
+
+    def test_stream_replays_latest_then_relays(self):
+        self.john.add_notification("task_progress", {"task_id": "a", "progress": 10})
+        self.john.add_notification("unread_message_count", 1)
+        db.session.commit()
+        events = notification_events(
+            self.app.redis, self.john.id, since=0, heartbeat=0.1, duration=5
+        )
+        self.assertTrue(next(events).startswith("retry:"))
+        names = [json.loads(next(events).split("data: ")[1])["name"] for _ in range(2)]
+        self.assertEqual(names, ["task_progress", "unread_message_count"])
+
+        self.john.add_notification("unread_message_count", 2)
+        db.session.commit()
+        event = next(events)
+        while event.startswith(":"):
+            event = next(events)
+        self.assertEqual(json.loads(event.split("data: ")[1])["data"], 2)
+        events.close()
+
+    def test_stream_skips_seen_notifications(self):
+        notification = self.john.add_notification("unread_message_count", 1)
+        db.session.commit()
+        events = notification_events(
+            self.app.redis,
+            self.john.id,
+            since=notification.timestamp,
+            heartbeat=0.1,
+            duration=0.2,
+        )
+        self.assertEqual([event for event in events if event.startswith("id:")], [])
+
+    def test_stream_view(self):
+        client = self.app.test_client()
+        client.post("/auth/login", data={"researcher_name": "john", "password": "cat"})
+        with patch.dict(
+            self.app.config,
+            NOTIFICATION_HEARTBEAT=0.1,
+            NOTIFICATION_STREAM_DURATION=0.3,
+        ):
+            response = client.get("/notifications/stream")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "text/event-stream")
+            self.assertIn(b"retry:", response.get_data())
+
+        mark_redis_down()
+        response = client.get("/notifications/stream")
+        self.assertEqual(response.status_code, 204)
+
+    def test_stream_limit_leaves_threads_free(self):
+        self.assertLess(
+            notification_stream_limit(self.app.config),
+            self.app.config["GUNICORN_THREADS"],
+        )
+        for threads in (1, 3, 16, 64, 1000):
+            config = dict(self.app.config, GUNICORN_THREADS=threads)
+            self.assertLessEqual(notification_stream_limit(config), threads // 4)
+        config = dict(self.app.config, GUNICORN_THREADS=1000)
+        self.assertEqual(
+            notification_stream_limit(config),
+            self.app.config["NOTIFICATION_MAX_STREAMS"],
+        )
+        # Without threads to spare every client polls
+        self.app.config["GUNICORN_THREADS"] = 2
+        self.app.notification_streams = threading.BoundedSemaphore(
+            notification_stream_limit(self.app.config)
+        )
+        client = self.app.test_client()
+        client.post("/auth/login", data={"researcher_name": "john", "password": "cat"})
+        self.assertEqual(client.get("/notifications/stream").status_code, 204)
+
+    def test_stream_limit(self):
+        self.app.notification_streams = threading.BoundedSemaphore(1)
+        client = self.app.test_client()
+        client.post("/auth/login", data={"researcher_name": "john", "password": "cat"})
+        with patch.dict(self.app.config, NOTIFICATION_STREAM_DURATION=0.1):
+            stream = client.get("/notifications/stream")
+            self.assertEqual(stream.status_code, 200)
+            # Clients beyond the limit fall back to polling
+            self.assertEqual(client.get("/notifications/stream").status_code, 204)
+            stream.close()
+            response = client.get("/notifications/stream")
+            self.assertEqual(response.status_code, 200)
+            response.close()
@@ -0,0 +1,118 @@
+import unittest
+import sqlalchemy as sa
+from src.app import create_app, db
+from src.app.models.gene import Gene
+from src.app.models.researcher import Researcher
+from src.app.pagination import (
+    keyset_paginate,
+    encode_cursor,
+    decode_cursor,
+    NEXT,
+    PREV,
+)
+from test.app.test_config import TestConfig
+
+
+class TestKeysetPagination(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        # Two genes share each stable id so the id tie-breaker is exercised
+        for i in range(6):
+            for unused_copy in range(2):
+                db.session.add(
+                    Gene(gene_stable_id=f"ENSG{i:011d}", gene_type="protein_coding")
+                )
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _paginate(self, cursor):
+        return keyset_paginate(
+            sa.select(Gene),
+            order_by=(Gene.gene_stable_id, Gene.id),
+            cursor=cursor,
+            per_page=5,
+        )
+
+    def test_cursor_round_trip(self):
+        cursor = encode_cursor(["ENSG00000000001", 7], PREV)
+        self.assertEqual(decode_cursor(cursor), (["ENSG00000000001", 7], PREV))
+
+    def test_invalid_cursor_is_first_page(self):
+        self.assertEqual(decode_cursor("not-a-cursor!"), (None, NEXT))
+        self.assertEqual(decode_cursor(None), (None, NEXT))
+        page = self._paginate("garbage")
+        self.assertFalse(page.has_prev)
+        self.assertEqual(len(page.items), 5)
+
+    def test_forged_cursor_is_first_page(self):
+        for values in ([{"x": 1}, 1], [["ENSG"], 1]):
+            cursor = encode_cursor(values)
+            self.assertEqual(decode_cursor(cursor), (None, NEXT))
+            page = self._paginate(cursor)
+            self.assertFalse(page.has_prev)
+            self.assertEqual(len(page.items), 5)
+
+    def test_walk_forward_and_back(self):
+        expected = db.session.scalars(
+            sa.select(Gene).order_by(Gene.gene_stable_id, Gene.id)
+        ).all()
+
+        pages = [self._paginate(None)]
+        while pages[-1].has_next:
+            pages.append(self._paginate(pages[-1].next_cursor))
+        self.assertEqual([len(p.items) for p in pages], [5, 5, 2])
+        self.assertEqual([g for p in pages for g in p.items], expected)
+        self.assertFalse(pages[0].has_prev)
+        self.assertTrue(pages[-1].has_prev)
+
+        back = self._paginate(pages[-1].prev_cursor)
+        self.assertEqual(back.items, pages[1].items)
+        self.assertTrue(back.has_next)
+        first = self._paginate(back.prev_cursor)
+        self.assertEqual(first.items, pages[0].items)
+        self.assertFalse(first.has_prev)
+
+
+class TestCursorCollectionDict(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        for i in range(5):
+            db.session.add(
+                Researcher(researcher_name=f"r{i}", email=f"r{i}@example.com")
+            )
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_cursor_collection(self):
+        with self.app.test_request_context():
+            first = Researcher.to_collection_dict(
+                sa.select(Researcher), 1, 3, "api.get_researchers", cursor=""
+            )
+            self.assertEqual([r["id"] for r in first["items"]], [1, 2, 3])
+            self.assertNotIn("total_items", first["_meta"])
+            self.assertIsNone(first["_links"]["prev"])
+
+            second = Researcher.to_collection_dict(
+                sa.select(Researcher),
+                1,
+                3,
+                "api.get_researchers",
+                cursor=first["_meta"]["next_cursor"],
+            )
+            self.assertEqual([r["id"] for r in second["items"]], [4, 5])
+            self.assertIsNone(second["_links"]["next"])
+            self.assertIsNotNone(second["_links"]["prev"])
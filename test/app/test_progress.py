@@ -0,0 +1,132 @@
+import unittest
+import fakeredis
+from unittest.mock import MagicMock, patch
+from src.app import create_app, db
+from src.app.cache import set_task_progress
+from src.app.models.researcher import Researcher, Task, Notification
+from src.app.progress import ProgressReporter
+from test.app.test_config import TestConfig
+
+
+class TestProgressReporter(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        db.session.add(self.john)
+        db.session.add(Task(id="job-1", name="export_posts", researcher=self.john))
+        db.session.commit()
+        self.job = MagicMock(meta={})
+        self.job.get_id.return_value = "job-1"
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def notified_progress(self):
+        notification = db.session.scalar(
+            self.john.notifications.select().where(Notification.name == "task_progress")
+        )
+        return notification.get_data()["progress"]
+
+    def reported(self):
+        return patch("src.app.progress.set_task_progress", wraps=set_task_progress)
+
+    def test_small_steps_are_merged(self):
+        progress = ProgressReporter(self.job, min_interval=0, min_step=10)
+        with self.reported() as reported:
+            for percent in range(0, 40, 3):
+                progress.update(percent)
+        # 0, 12, 24 and 36 are reported
+        self.assertEqual(reported.call_count, 4)
+        self.assertEqual(db.session.get(Task, "job-1").get_progress(), 36)
+        self.assertEqual(self.notified_progress(), 36)
+
+    def test_frequent_updates_are_merged(self):
+        progress = ProgressReporter(self.job, min_interval=60, min_step=1)
+        with self.reported() as reported:
+            with patch("src.app.progress.time.monotonic", return_value=1000.0):
+                for percent in range(0, 100, 10):
+                    progress.update(percent)
+        self.assertEqual(reported.call_count, 1)
+        self.assertEqual(db.session.get(Task, "job-1").get_progress(), 0)
+
+    def test_finish_is_always_reported_once(self):
+        progress = ProgressReporter(self.job, min_interval=60, min_step=50)
+        with self.reported() as reported:
+            progress.update(0)
+            progress.update(99)
+            progress.finish()
+            progress.finish()
+        self.assertEqual(reported.call_count, 2)
+        self.assertEqual(self.notified_progress(), 100)
+        self.assertTrue(db.session.get(Task, "job-1").complete)
+        # Completed tasks leave the progress hash
+        self.assertEqual(self.app.redis.hlen(f"task_progress:{self.john.id}"), 0)
+
+    def test_without_job(self):
+        progress = ProgressReporter(None)
+        progress.update(50)
+        progress.finish()
+        self.assertFalse(db.session.get(Task, "job-1").complete)
+
+
+class TestTaskProgress(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        db.session.add(self.john)
+        self.tasks = [
+            Task(id=f"job-{i}", name="export_table", researcher=self.john)
+            for i in range(3)
+        ]
+        self.tasks[2].complete = True
+        db.session.add_all(self.tasks)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_progress_read_in_one_call(self):
+        set_task_progress(self.john.id, "job-0", 40)
+        set_task_progress(self.john.id, "job-1", 70)
+        with patch("src.app.models.researcher.Task.get_rq_job") as get_rq_job:
+            with patch.object(
+                self.app.redis, "hmget", wraps=self.app.redis.hmget
+            ) as hmget:
+                progress = self.john.get_tasks_progress(self.tasks)
+        self.assertEqual(progress, {"job-0": 40, "job-1": 70, "job-2": 100})
+        hmget.assert_called_once()
+        get_rq_job.assert_not_called()
+
+    def test_banner_shows_recorded_progress(self):
+        self.john.set_password("cat")
+        db.session.commit()
+        set_task_progress(self.john.id, "job-0", 40)
+        set_task_progress(self.john.id, "job-1", 70)
+        client = self.app.test_client()
+        client.post("/auth/login", data={"researcher_name": "john", "password": "cat"})
+        with patch("src.app.models.researcher.Task.get_rq_job") as get_rq_job:
+            response = client.get("/explore/genes")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'<span id="job-0-progress">40</span>%', response.data)
+        self.assertIn(b'<span id="job-1-progress">70</span>%', response.data)
+        self.assertNotIn(b"job-2-progress", response.data)
+        get_rq_job.assert_not_called()
+
+    def test_unrecorded_task_falls_back_to_rq(self):
+        with patch("src.app.models.researcher.Task.get_rq_job", return_value=None):
+            self.assertEqual(self.tasks[0].get_progress(), 100)
+        job = MagicMock(meta={"progress": 30})
+        with patch("src.app.models.researcher.Task.get_rq_job", return_value=job):
+            self.assertEqual(self.tasks[0].get_progress(), 30)
@@ -0,0 +1,78 @@
+import unittest
+import fakeredis
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.models.researcher import Researcher
+from src.app.suggestions import (
+    compute_follow_suggestions,
+    get_follow_suggestions,
+    follows_changed,
+)
+from test.app.test_config import TestConfig
+
+
+class TestFollowSuggestions(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.r = [
+            Researcher(researcher_name=f"r{i}", email=f"r{i}@example.com")
+            for i in range(7)
+        ]
+        db.session.add_all(self.r)
+        db.session.commit()
+        r = self.r
+        # r0 follows r1 and r2; both follow r3, only r2 follows r4
+        r[0].follow(r[1])
+        r[0].follow(r[2])
+        r[1].follow(r[3])
+        r[2].follow(r[3])
+        r[2].follow(r[4])
+        r[2].follow(r[0])
+        # r5 is popular but not a friend of a friend of r0
+        r[3].follow(r[5])
+        r[4].follow(r[5])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_friends_of_friends_ranked_first(self):
+        r = self.r
+        ranked = compute_follow_suggestions(r[0].id, limit=10)
+        self.assertEqual(ranked[:2], [(r[3].id, 2), (r[4].id, 1)])
+        # Then popular researchers, then the newest
+        self.assertEqual([c for c, unused in ranked[2:]], [r[5].id, r[6].id])
+
+    def test_suggestions_are_stored(self):
+        r = self.r
+        self.assertEqual(get_follow_suggestions(r[0].id, count=2), [r[3], r[4]])
+        with patch("src.app.suggestions.compute_follow_suggestions") as compute:
+            self.assertEqual(
+                get_follow_suggestions(r[0].id, count=3), [r[3], r[4], r[5]]
+            )
+            compute.assert_not_called()
+
+    def test_follow_removes_suggestion(self):
+        r = self.r
+        get_follow_suggestions(r[0].id)
+        r[0].follow(r[3])
+        db.session.commit()
+        with patch.object(self.app.task_queue, "enqueue") as enqueue:
+            follows_changed(r[0].id, r[3].id)
+        enqueue.assert_called_once_with(
+            "src.app.tasks.refresh_follow_suggestions", r[0].id
+        )
+        self.assertNotIn(r[3], get_follow_suggestions(r[0].id))
+
+    def test_no_candidates(self):
+        for researcher in self.r[:6]:
+            self.r[6].follow(researcher)
+        db.session.commit()
+        self.assertEqual(get_follow_suggestions(self.r[6].id), [])
+        self.assertTrue(self.app.redis.exists(f"follow_suggestions:{self.r[6].id}"))
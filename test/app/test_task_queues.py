@@ -0,0 +1,85 @@
+import unittest
+import fakeredis
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.models.researcher import Researcher, Task
+from src.app.task_queues import enqueue_task, worker_queues
+from test.app.test_config import TestConfig
+
+
+class TestTaskQueues(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        db.session.add(self.john)
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_queues_have_their_own_timeouts(self):
+        queues = self.app.task_queues
+        self.assertEqual(list(queues), ["interactive", "pipeline", "bulk"])
+        self.assertIs(self.app.task_queue, queues["interactive"])
+        self.assertEqual(queues["bulk"].name, "gene-annotator-bulk")
+        self.assertEqual(queues["bulk"]._default_timeout, 2 * 3600)
+
+    def test_tasks_are_routed(self):
+        with patch.object(self.app.task_queues["bulk"], "enqueue") as bulk:
+            enqueue_task("export_table", self.john.id, "gene", "csv")
+        bulk.assert_called_once_with(
+            "src.app.tasks.export_table", self.john.id, "gene", "csv"
+        )
+        with patch.object(self.app.task_queue, "enqueue") as interactive:
+            enqueue_task("unrouted_task")
+        interactive.assert_called_once_with("src.app.tasks.unrouted_task")
+
+    def test_worker_plan(self):
+        config = dict(
+            self.app.config,
+            TASK_QUEUE_WORKERS={"interactive": 2, "pipeline": 1, "bulk": 1},
+        )
+        self.assertEqual(
+            worker_queues(config),
+            [
+                ["interactive"],
+                ["interactive"],
+                ["interactive", "pipeline"],
+                ["interactive", "bulk"],
+            ],
+        )
+        self.assertEqual(worker_queues(config, ["bulk"]), [["interactive", "bulk"]])
+
+    def test_launched_task_progress_is_recorded(self):
+        with patch.object(self.app.task_queues["bulk"], "enqueue") as enqueue:
+            enqueue.return_value.get_id.return_value = "job-1"
+            task = self.john.launch_task("export_table", "Exporting", "gene", "csv")
+        db.session.commit()
+        with patch("src.app.models.researcher.Task.get_rq_job") as get_rq_job:
+            self.assertEqual(self.john.get_tasks_progress([task]), {"job-1": 0})
+        get_rq_job.assert_not_called()
+
+    def test_researcher_limit_per_queue(self):
+        self.app.config["TASK_RESEARCHER_LIMITS"] = {"bulk": 2, "pipeline": 1}
+        db.session.add_all(
+            [
+                Task(id="a", name="export_table", researcher=self.john),
+                Task(id="b", name="export_posts", researcher=self.john),
+                Task(id="c", name="export_table", researcher=self.john, complete=True),
+            ]
+        )
+        db.session.commit()
+        self.assertTrue(self.john.task_limit_reached("export_table"))
+        self.assertFalse(self.john.task_limit_reached("import_cli_results"))
+        # Queues without a limit
+        self.assertFalse(self.john.task_limit_reached("refresh_follow_suggestions"))
+
+        db.session.get(Task, "b").complete = True
+        db.session.commit()
+        self.assertFalse(self.john.task_limit_reached("export_posts"))
@@ -0,0 +1,105 @@
+import unittest
+import fakeredis
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app import timeline
+from src.app.models.researcher import Researcher, Post
+from test.app.test_config import TestConfig
+
+
+class TimelineTestConfig(TestConfig):
+    TIMELINE_LENGTH = 6
+
+
+@patch("src.app.search.add_to_index", lambda *args, **kwargs: None)
+class TestTimeline(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TimelineTestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        self.john = Researcher(researcher_name="john", email="john@example.com")
+        self.susan = Researcher(researcher_name="susan", email="susan@example.com")
+        self.mary = Researcher(researcher_name="mary", email="mary@example.com")
+        db.session.add_all([self.john, self.susan, self.mary])
+        db.session.commit()
+        self.john.follow(self.susan)
+        db.session.commit()
+        self.now = datetime.now(timezone.utc)
+        self.minutes = 0
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def _post(self, author):
+        self.minutes += 1
+        post = Post(
+            body=f"post {self.minutes}",
+            author=author,
+            timestamp=self.now + timedelta(minutes=self.minutes),
+        )
+        db.session.add(post)
+        db.session.commit()
+        return post
+
+    def _sql_page(self, researcher, page, per_page):
+        return db.paginate(
+            researcher.following_posts(), page=page, per_page=per_page
+        ).items
+
+    def test_matches_following_posts(self):
+        for author in [self.john, self.susan, self.mary, self.susan]:
+            self._post(author)
+        first = timeline.timeline_page(self.john, 1, 2)
+        self.assertIsInstance(first, timeline.TimelinePage)
+        self.assertEqual(first.items, self._sql_page(self.john, 1, 2))
+        self.assertTrue(first.has_next)
+        second = timeline.timeline_page(self.john, 2, 2)
+        self.assertEqual(second.items, self._sql_page(self.john, 2, 2))
+        self.assertFalse(second.has_next)
+
+    def test_new_posts_fan_out(self):
+        timeline.timeline_page(self.john, 1, 5)
+        post = self._post(self.susan)
+        self._post(self.mary)
+        with patch.object(timeline, "build_timeline") as build:
+            page = timeline.timeline_page(self.john, 1, 5)
+            build.assert_not_called()
+        self.assertEqual(page.items, [post])
+
+    def test_follow_and_unfollow(self):
+        mary_post = self._post(self.mary)
+        susan_post = self._post(self.susan)
+        timeline.timeline_page(self.john, 1, 5)
+
+        self.john.follow(self.mary)
+        db.session.commit()
+        timeline.followed(self.john.id, self.mary.id)
+        self.assertEqual(
+            timeline.timeline_page(self.john, 1, 5).items, [susan_post, mary_post]
+        )
+
+        self.john.unfollow(self.mary)
+        db.session.commit()
+        timeline.unfollowed(self.john.id, self.mary.id)
+        self.assertEqual(timeline.timeline_page(self.john, 1, 5).items, [susan_post])
+
+    def test_deep_pages_and_no_redis_use_sql(self):
+        for unused in range(8):
+            self._post(self.susan)
+        page = timeline.timeline_page(self.john, 3, 3)
+        self.assertNotIsInstance(page, timeline.TimelinePage)
+        self.assertEqual(page.items, self._sql_page(self.john, 3, 3))
+        # Only TIMELINE_LENGTH posts are kept
+        self.assertEqual(self.app.redis.zcard("timeline:1"), 0)
+        timeline.timeline_page(self.john, 1, 3)
+        self._post(self.susan)
+        self.assertEqual(self.app.redis.zcard("timeline:1"), 7)
+
+        with patch.object(timeline, "get_redis", return_value=None):
+            page = timeline.timeline_page(self.john, 1, 3)
+        self.assertEqual(page.items, self._sql_page(self.john, 1, 3))
@@ -0,0 +1,110 @@
+import unittest
+import fakeredis
+from base64 import b64encode
+from datetime import timezone
+from unittest.mock import patch
+from src.app import create_app, db
+from src.app.models.researcher import Researcher
+from src.app.token_cache import TokenCache
+from test.app.test_config import TestConfig
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_least_recently_used_is_evicted(self):
+        cache = TokenCache(maxsize=2, ttl=60)
+        cache.put("a", 1, 100.0)
+        cache.put("b", 2, 100.0)
+        cache.get("a")
+        cache.put("c", 3, 100.0)
+        self.app.redis.flushall()
+        self.assertEqual(cache.get("a"), (1, 100.0))
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), (3, 100.0))
+
+    def test_shared_through_redis(self):
+        cache = TokenCache(maxsize=10, ttl=60)
+        other = TokenCache(maxsize=10, ttl=60)
+        cache.put("a", 1, 2e9)
+        self.assertEqual(other.get("a"), (1, 2e9))
+        self.assertNotIn(b"api_token:a", self.app.redis.keys())
+
+        cache.invalidate("a")
+        self.assertIsNone(cache.get("a"))
+
+    def test_local_entries_expire(self):
+        cache = TokenCache(maxsize=10, ttl=0)
+        cache.put("a", 1, 2e9)
+        self.app.redis.flushall()
+        self.assertIsNone(cache.get("a"))
+
+
+class TestTokenAuthentication(unittest.TestCase):
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.app.redis = fakeredis.FakeRedis()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        john = Researcher(researcher_name="john", email="john@example.com")
+        john.set_password("cat")
+        db.session.add(john)
+        db.session.commit()
+        self.john_id = john.id
+        self.client = self.app.test_client()
+        credentials = b64encode(b"john:cat").decode()
+        response = self.client.post(
+            "/api/tokens", headers={"Authorization": f"Basic {credentials}"}
+        )
+        self.headers = {"Authorization": f"Bearer {response.get_json()['token']}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_token_is_looked_up_once(self):
+        url = f"/api/researcher/{self.john_id}"
+        cache = self.app.token_cache
+        with patch.object(cache, "put", wraps=cache.put) as put:
+            for _ in range(3):
+                response = self.client.get(url, headers=self.headers)
+                self.assertEqual(response.status_code, 200)
+        self.assertEqual(put.call_count, 1)
+
+    def test_revoked_token_is_rejected(self):
+        url = f"/api/researcher/{self.john_id}"
+        self.assertEqual(self.client.get(url, headers=self.headers).status_code, 200)
+        response = self.client.delete("/api/tokens", headers=self.headers)
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(self.client.get(url, headers=self.headers).status_code, 401)
+
+    def test_refill_before_commit_is_invalidated(self):
+        token = self.headers["Authorization"].split()[1]
+        john = db.session.get(Researcher, self.john_id)
+        expires_at = john.token_expiration.replace(tzinfo=timezone.utc).timestamp()
+        john.revoke_token()
+        # A concurrent request caches the token before the revocation commits
+        self.app.token_cache.put(token, self.john_id, expires_at)
+        db.session.commit()
+        self.assertIsNone(self.app.token_cache.get(token))
+        response = self.client.get(
+            f"/api/researcher/{self.john_id}", headers=self.headers
+        )
+        self.assertEqual(response.status_code, 401)
+
+    def test_unknown_token_is_not_cached(self):
+        response = self.client.get(
+            f"/api/researcher/{self.john_id}",
+            headers={"Authorization": "Bearer nope"},
+        )
+        self.assertEqual(response.status_code, 401)
+        self.assertIsNone(self.app.token_cache.get("nope"))
@@ -351,3 +351,31 @@ class TestGeneReader(unittest.TestCase):
             "002",
             None,
         ]
+
+    def test_summarize(self):
+        """
+        Test the run summary computed from the in-memory frames
+        """
+        self._gene_reader._genes = pd.DataFrame(
+            {"gene_type": ["protein_coding", "protein_coding", "lncRNA"]}
+        )
+        self._gene_reader._merged_genes_and_annotation_data = pd.DataFrame(
+            {
+                "gene_type": ["protein_coding", "protein_coding", "lncRNA"],
+                "hgnc_id": ["HGNC:1", None, "HGNC:3"],
+                "pid_suffix": ["SF1", "SF1", "SF2"],
+                "tigrfam_id": ["TIGR00001", "TIGR00658", None],
+            }
+        )
+        with patch("pandas.DataFrame.to_csv"):
+            self._gene_reader.write_gene_and_annotations_final(Path("/tmp"))
+
+        summary = self._gene_reader.summarize()
+
+        assert summary == {
+            "result_count": 1,
+            "hgnc_id_count": 1,
+            "pid_suffix_count": 1,
+            "excluded_tigrfam_count": 2,
+            "gene_type_counts": {"protein_coding": 2, "lncRNA": 1},
+        }